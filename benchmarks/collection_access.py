@@ -0,0 +1,112 @@
+"""Measure the time needed for accessing all claims of an item by position, ID and value (in
+milliseconds per pass over all claims), compared to flattening the claims on every access
+
+Usage: python benchmarks/collection_access.py [--sizes SIZES [SIZES ...]]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+# Import the package from this repository, even if it hasn't been installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_wikibase import PyWikibase  # noqa: E402
+
+
+def make_claims(claim_count, prop_count=10):
+    """Return the claims of an item with the specified number of string claims (spread over
+    ``prop_count`` properties) in the format used by the Wikibase API"""
+    claims = {}
+    for claim_number in range(claim_count):
+        prop_id = f"P{claim_number % prop_count + 1}"
+        claims.setdefault(prop_id, []).append(
+            {
+                "id": f"Q1${claim_number:08X}-0000-0000-0000-000000000000",
+                "type": "statement",
+                "rank": "normal",
+                "mainsnak": {
+                    "snaktype": "value",
+                    "property": prop_id,
+                    "datatype": "string",
+                    "datavalue": {"value": f"value {claim_number}", "type": "string"},
+                },
+            }
+        )
+    return claims
+
+
+def flatten(claims):
+    """Flatten the claims like the collections did before they were indexed"""
+    claim_list = []
+    [claim_list.extend(prop_claims) for prop_claims in claims.to_dict().values()]
+    return claim_list
+
+
+def access_by_position(claims):
+    for i in range(len(claims)):
+        claims[i]
+
+
+def access_by_position_flattened(claims):
+    for i in range(len(flatten(claims))):
+        flatten(claims)[i]
+
+
+def access_by_id(claims, claim_ids):
+    for claim_id in claim_ids:
+        claims.get_by_id(claim_id)
+
+
+def access_by_id_flattened(claims, claim_ids):
+    for claim_id in claim_ids:
+        next(claim for claim in flatten(claims) if claim.claim_id == claim_id)
+
+
+def access_by_value(claims, snaks):
+    for prop, value in snaks:
+        claims.find(prop, value)
+
+
+def access_by_value_flattened(claims, snaks):
+    for prop, value in snaks:
+        [
+            claim
+            for claim in flatten(claims)
+            if claim.property.entity_id == prop.entity_id
+            and claim.value.marshal() == value.marshal()
+        ]
+
+
+def measure(function, *args):
+    return min(timeit.repeat(lambda: function(*args), number=1, repeat=5)) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 5000], help="numbers of claims"
+    )
+    args = parser.parse_args()
+
+    py_wb = PyWikibase(cache=False)
+    print(f"{'claims':>8} {'access':10} {'indexed':>12} {'flattened':>12}")
+    for size in args.sizes:
+        claims = py_wb.Claims().unmarshal("Q1", make_claims(size))
+        claim_list = claims.to_list()
+        claim_ids = [claim.claim_id for claim in claim_list]
+        snaks = [(claim.property, claim.value) for claim in claim_list]
+        benchmarks = [
+            ("position", access_by_position, access_by_position_flattened, ()),
+            ("id", access_by_id, access_by_id_flattened, (claim_ids,)),
+            ("value", access_by_value, access_by_value_flattened, (snaks,)),
+        ]
+        for access, indexed, flattened, extra_args in benchmarks:
+            indexed = measure(indexed, claims, *extra_args)
+            flattened = measure(flattened, claims, *extra_args)
+            print(f"{size:8} {access:10} {indexed:9.2f} ms {flattened:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
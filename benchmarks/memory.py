@@ -0,0 +1,126 @@
+"""Measure the memory used by the unmarshalled claims of entities (in bytes per statement)
+
+Usage: python benchmarks/memory.py [--items ITEMS] [--claims CLAIMS]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+
+# Import the package from this repository, even if it hasn't been installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_wikibase import PyWikibase  # noqa: E402
+
+
+def make_item(item_number, claim_count):
+    """Return the data of an item with the specified number of claims (of different data types,
+    each with a qualifier and a reference) in the format used by the Wikibase API"""
+    item_id = f"Q{item_number}"
+    claims = {}
+    for claim_number in range(claim_count):
+        if claim_number % 3 == 0:
+            snak = {
+                "snaktype": "value",
+                "property": "P1",
+                "datatype": "string",
+                "datavalue": {"value": f"value {claim_number}", "type": "string"},
+            }
+        elif claim_number % 3 == 1:
+            snak = {
+                "snaktype": "value",
+                "property": "P2",
+                "datatype": "quantity",
+                "datavalue": {
+                    "value": {"amount": f"+{claim_number}", "unit": "1"},
+                    "type": "quantity",
+                },
+            }
+        else:
+            snak = {
+                "snaktype": "value",
+                "property": "P3",
+                "datatype": "globe-coordinate",
+                "datavalue": {
+                    "value": {
+                        "latitude": 52.5,
+                        "longitude": 13.4,
+                        "altitude": None,
+                        "precision": 0.0001,
+                        "globe": "http://www.wikidata.org/entity/Q2",
+                    },
+                    "type": "globecoordinate",
+                },
+            }
+        qualifier = {
+            "hash": f"{claim_number:040x}",
+            "snaktype": "value",
+            "property": "P4",
+            "datatype": "wikibase-item",
+            "datavalue": {
+                "value": {"entity-type": "item", "numeric-id": 5, "id": "Q5"},
+                "type": "wikibase-entityid",
+            },
+        }
+        reference_snak = dict(qualifier)
+        del reference_snak["hash"]
+        claims.setdefault(snak["property"], []).append(
+            {
+                "id": f"{item_id}${claim_number:08X}-0000-0000-0000-000000000000",
+                "type": "statement",
+                "rank": "normal",
+                "mainsnak": snak,
+                "qualifiers": {"P4": [qualifier]},
+                "references": [{"hash": f"{claim_number:040x}", "snaks": {"P4": [reference_snak]}}],
+            }
+        )
+    return {
+        "type": "item",
+        "id": item_id,
+        "labels": {"en": {"language": "en", "value": f"Item {item_number}"}},
+        "descriptions": {},
+        "aliases": {},
+        "claims": claims,
+    }
+
+
+def load_items(py_wb, items_data):
+    """Unmarshal the items and all of their claims, qualifiers and references"""
+    items = []
+    for item_data in items_data:
+        item = py_wb.Item().unmarshal(item_data)
+        for claim in item.claims:
+            claim.qualifiers.to_list()
+            claim.references.to_list()
+        items.append(item)
+    return items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000, help="number of items")
+    parser.add_argument("--claims", type=int, default=100, help="number of claims per item")
+    args = parser.parse_args()
+
+    py_wb = PyWikibase(cache=False)
+    items_data = [make_item(i, args.claims) for i in range(args.items)]
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    items = load_items(py_wb, items_data)
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    statement_count = args.items * args.claims
+    print(f"Statements: {statement_count}")
+    print(f"Memory: {(after - before) / 1024 / 1024:.1f} MiB")
+    print(f"Bytes per statement: {(after - before) / statement_count:.0f}")
+    return items
+
+
+if __name__ == "__main__":
+    main()
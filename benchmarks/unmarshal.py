@@ -0,0 +1,140 @@
+"""Measure the time needed for unmarshalling a snak of every data type (in microseconds per snak),
+compared to looking up the data type in a chain of if/elif statements
+
+Usage: python benchmarks/unmarshal.py [--number NUMBER]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+# Import the package from this repository, even if it hasn't been installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from python_wikibase import PyWikibase  # noqa: E402
+from python_wikibase.data_types.data_type import unmarshal_data_value  # noqa: E402
+
+# Data values of the snaks for every data type
+DATA_VALUES = {
+    "commonsMedia": {"value": "Berlin Brandenburger Tor.jpg", "type": "string"},
+    "external-id": {"value": "0000-0002-1825-0097", "type": "string"},
+    "geo-shape": {"value": "Data:Berlin.map", "type": "string"},
+    "globe-coordinate": {
+        "value": {
+            "latitude": 52.5,
+            "longitude": 13.4,
+            "altitude": None,
+            "precision": 0.0001,
+            "globe": "http://www.wikidata.org/entity/Q2",
+        },
+        "type": "globecoordinate",
+    },
+    "math": {"value": "E = mc^2", "type": "string"},
+    "monolingualtext": {"value": {"text": "Berlin", "language": "de"}, "type": "monolingualtext"},
+    "quantity": {"value": {"amount": "+3644826", "unit": "1"}, "type": "quantity"},
+    "string": {"value": "Berlin", "type": "string"},
+    "tabular-data": {"value": "Data:Berlin population.tab", "type": "string"},
+    "time": {
+        "value": {
+            "time": "+1237-01-01T00:00:00Z",
+            "timezone": 0,
+            "before": 0,
+            "after": 0,
+            "precision": 9,
+            "calendarmodel": "http://www.wikidata.org/entity/Q1985727",
+        },
+        "type": "time",
+    },
+    "url": {"value": "https://berlin.de", "type": "string"},
+    "wikibase-form": {"value": {"entity-type": "form", "id": "L1-F1"}, "type": "wikibase-entityid"},
+    "wikibase-item": {
+        "value": {"entity-type": "item", "numeric-id": 5, "id": "Q5"},
+        "type": "wikibase-entityid",
+    },
+    "wikibase-lexeme": {
+        "value": {"entity-type": "lexeme", "numeric-id": 1, "id": "L1"},
+        "type": "wikibase-entityid",
+    },
+    "wikibase-property": {
+        "value": {"entity-type": "property", "numeric-id": 31, "id": "P31"},
+        "type": "wikibase-entityid",
+    },
+    "wikibase-sense": {
+        "value": {"entity-type": "sense", "id": "L1-S1"},
+        "type": "wikibase-entityid",
+    },
+}
+
+
+def make_snak(data_type, data_value):
+    return {"snaktype": "value", "property": "P1", "datatype": data_type, "datavalue": data_value}
+
+
+def unmarshal_data_value_chained(py_wb, main_snak):
+    """Unmarshal the snak like before the registry of data type functions was added, by comparing
+    the data type with every supported data type in turn (in the original order)"""
+    if main_snak["snaktype"] != "value":
+        return None
+    data_type = main_snak.get("datatype", "string")
+    data_value = main_snak["datavalue"]
+    if data_type == "string":
+        return py_wb.StringValue().unmarshal(data_value)
+    elif data_type == "monolingualtext":
+        return py_wb.MonolingualText().unmarshal(data_value)
+    elif data_type == "commonsMedia":
+        return py_wb.CommonsMedia().unmarshal(data_value)
+    elif data_type == "external-id":
+        return py_wb.ExternalId().unmarshal(data_value)
+    elif data_type == "geo-shape":
+        return py_wb.GeoShape().unmarshal(data_value)
+    elif data_type == "globe-coordinate":
+        return py_wb.GeoLocation().unmarshal(data_value)
+    elif data_type == "math":
+        return py_wb.Math().unmarshal(data_value)
+    elif data_type == "quantity":
+        return py_wb.Quantity().unmarshal(data_value)
+    elif data_type == "tabular-data":
+        return py_wb.Table().unmarshal(data_value)
+    elif data_type == "time":
+        return py_wb.Time().unmarshal(data_value)
+    elif data_type == "url":
+        return py_wb.Url().unmarshal(data_value)
+    elif data_type == "wikibase-form":
+        return py_wb.Form().unmarshal(data_value)
+    elif data_type == "wikibase-lexeme":
+        return py_wb.Lexeme().unmarshal(data_value)
+    elif data_type == "wikibase-sense":
+        return py_wb.Sense().unmarshal(data_value)
+    elif data_type == "wikibase-item":
+        item = py_wb.Item()
+        item.entity_id = data_value["value"]["id"]
+        return item
+    elif data_type == "wikibase-property":
+        prop = py_wb.Property()
+        prop.entity_id = data_value["value"]["id"]
+        return prop
+    raise NotImplementedError(f'No unmarshalling function for data type "{data_type}" defined')
+
+
+def measure(function, py_wb, snak, number):
+    seconds = min(timeit.repeat(lambda: function(py_wb, snak), number=number, repeat=15))
+    return seconds / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20000, help="number of snaks per repetition")
+    args = parser.parse_args()
+
+    py_wb = PyWikibase(cache=False)
+    print(f"{'data type':20} {'registry':>11} {'if/elif':>11}")
+    for data_type, data_value in sorted(DATA_VALUES.items()):
+        snak = make_snak(data_type, data_value)
+        registry = measure(unmarshal_data_value, py_wb, snak, args.number)
+        chained = measure(unmarshal_data_value_chained, py_wb, snak, args.number)
+        print(f"{data_type:20} {registry:8.2f} µs {chained:8.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+from python_wikibase.aio.python_wikibase import AsyncPyWikibase
+
+__all__ = ["AsyncPyWikibase"]
@@ -0,0 +1,261 @@
+import json
+import time
+from urllib.parse import urlencode
+
+from oauthlib.oauth1 import Client as OAuthClient
+from wikibase_api import ApiError, AuthError
+from wikibase_api.models import Alias, Claim, Description, Entity, Label, Qualifier, Reference
+
+from python_wikibase.utils.instrumentation import record_request
+from python_wikibase.utils.retry import is_caller_retried, is_idempotent_write
+
+try:
+    import aiohttp
+    from yarl import URL
+except ImportError:
+    aiohttp = None
+
+
+class AsyncApi:
+    """Asynchronous counterpart of wikibase-api's ``Api`` class. Requests are made using a single
+    ``aiohttp`` session, which keeps a pool of connections to the Wikibase API"""
+
+    def __init__(self, config, max_connections=100):
+        """
+        :param config: Configuration options (see the ``PyWikibase`` class)
+        :type config: dict
+        :param max_connections: Maximum number of simultaneous connections to the Wikibase API
+        :type max_connections: int
+        """
+        if aiohttp is None:
+            raise ImportError(
+                'The "aiohttp" package is required for AsyncPyWikibase. You can install it with '
+                '"pip install python-wikibase[async]"'
+            )
+        self.session = None
+        self.oauth_client = None
+        self.edit_token = None
+        self.base_url = config["api_url"]
+        self.is_bot = config["is_bot"]
+        self.summary = config["summary"]
+        self.oauth_credentials = config["oauth_credentials"]
+        self.login_credentials = config["login_credentials"]
+        self.max_connections = max_connections
+        self.scheduler = None
+        self.retry_policy = None
+        self.instrumentation = None
+
+    async def open(self):
+        """Create the HTTP session and authenticate with Wikibase (if credentials were provided)"""
+        connector = aiohttp.TCPConnector(limit=self.max_connections)
+        self.session = aiohttp.ClientSession(connector=connector)
+
+        try:
+            if self.oauth_credentials:
+                # OAuth
+                oauth_config = self.oauth_credentials
+                self.oauth_client = OAuthClient(
+                    oauth_config["consumer_key"],
+                    client_secret=oauth_config["consumer_secret"],
+                    resource_owner_key=oauth_config["access_token"],
+                    resource_owner_secret=oauth_config["access_secret"],
+                )
+                self.edit_token = await self._get_token("csrf")  # Get edit token for POST requests
+            elif self.login_credentials:
+                # Bot login
+                login_config = self.login_credentials
+                login_token = await self._get_token("login")  # Get login token
+                await self._login(
+                    login_config["bot_username"], login_config["bot_password"], login_token
+                )
+                self.edit_token = await self._get_token("csrf")  # Get edit token for POST requests
+        except Exception:
+            await self.close()
+            raise
+
+    async def close(self):
+        """Close the HTTP session and all of its connections"""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    @staticmethod
+    def _check_err(res_json):
+        if "error" in res_json:
+            raise ApiError(json.dumps(res_json["error"]))
+
+    def _check_session(self):
+        if self.session is None:
+            raise RuntimeError(
+                "The HTTP session has not been opened yet. Use AsyncPyWikibase as an async context "
+                'manager ("async with AsyncPyWikibase() as py_wb:") or call its open() function'
+            )
+
+    async def _request(self, method, params):
+        """Make a request to the Wikibase API and return the parsed response
+
+        :param method: HTTP method (either "GET" or "POST")
+        :type method: str
+        :param params: Query parameters (GET) or form fields (POST)
+        :type params: dict
+        :return: Response object
+        :rtype: dict
+        """
+        self._check_session()
+        params = {"format": "json", **params}
+
+        if method == "GET":
+            url = f"{self.base_url}?{urlencode(params)}"
+            headers = {}
+            if self.oauth_client:
+                url, headers, _ = self.oauth_client.sign(url, http_method="GET")
+            request = self.session.get(URL(url, encoded=True), headers=headers)
+        else:
+            body = urlencode(params)
+            headers = {"Content-Type": "application/x-www-form-urlencoded"}
+            if self.oauth_client:
+                _, headers, body = self.oauth_client.sign(
+                    self.base_url, http_method="POST", body=body, headers=headers
+                )
+            request = self.session.post(self.base_url, data=body, headers=headers)
+
+        start_time = time.perf_counter()
+        try:
+            async with request as r:
+                r.raise_for_status()  # Raise exception if status code indicates error
+                res_body = await r.read()
+        except Exception:
+            record_request(params, time.perf_counter() - start_time, 0)
+            raise
+        record_request(params, time.perf_counter() - start_time, len(res_body))
+        res_json = json.loads(res_body)
+        self._check_err(res_json)
+        return res_json
+
+    async def get(self, params):
+        """Make a GET request to the Wikibase API
+
+        :param params: Query parameters to be encoded in the URL
+        :type params: dict
+        :return: Response object
+        :rtype: dict
+        """
+        return await self._observe("GET", params, self._retried_get)
+
+    async def _retried_get(self, params):
+        if self.retry_policy is not None:
+            return await self.retry_policy.run_async(self._get, params)
+        return await self._get(params)
+
+    async def _get(self, params):
+        return await self._request("GET", params)
+
+    async def post(self, body):
+        """Make a POST request to the Wikibase API
+
+        :param body: Query parameters to be sent in the POST body
+        :type body: dict
+        :return: Response object
+        :rtype: dict
+        """
+        if not self.edit_token:
+            raise AuthError("You need to be authenticated to be able to make edits on Wikibase")
+
+        data = {**body, "token": self.edit_token, "summary": self.summary}
+        if self.is_bot:
+            data["bot"] = True
+
+        return await self._observe("POST", data, self._retried_post)
+
+    async def _retried_post(self, data):
+        if self.retry_policy is not None and not is_caller_retried(data):
+            return await self.retry_policy.run_async(
+                self._scheduled_post, data, idempotent=is_idempotent_write(data)
+            )
+        return await self._scheduled_post(data)
+
+    async def _scheduled_post(self, data):
+        if self.scheduler is not None:
+            return await self.scheduler.run_async(self._post, data)
+        return await self._post(data)
+
+    async def _post(self, data):
+        return await self._request("POST", data)
+
+    async def _observe(self, method, params, call_api):
+        """Make the API call and report it to the observers of the instrumentation (see
+        ``python_wikibase.utils.instrumentation``)"""
+        if self.instrumentation is None:
+            return await call_api(params)
+        call = self.instrumentation.start_call(method, params)
+        try:
+            r = await call_api(params)
+        except Exception as e:
+            self.instrumentation.end_call(call, e)
+            raise
+        self.instrumentation.end_call(call)
+        return r
+
+    async def _get_token(self, token_type):
+        """Request edit (CSRF) or login token
+
+        :param token_type: Token type (either "csrf" or "login")
+        :type token_type: str
+        :return: token
+        :rtype: str
+        """
+        if token_type != "csrf" and token_type != "login":
+            raise ValueError('Token type must be either "csrf" or "login"')
+
+        params = {"action": "query", "meta": "tokens", "type": token_type}
+        data = await self.get(params)
+
+        if "query" not in data or "tokens" not in data["query"]:
+            raise ValueError(
+                f"Could not obtain {token_type} token due to authentication error: {data}"
+            )
+
+        return data["query"]["tokens"][token_type + "token"]
+
+    async def _login(self, bot_username, bot_password, token):
+        """Log in user with bot username and bot password (alternative to OAuth) to set auth cookies
+
+        :param bot_username: Bot username
+        :type bot_username: str
+        :param bot_password: Bot password
+        :type bot_password: str
+        :param token: Login token (see the :meth:`_get_token` function)
+        :type token: str
+        """
+        params = {
+            "action": "login",
+            "lgname": bot_username,
+            "lgpassword": bot_password,
+            "lgtoken": token,
+        }
+        data = await self._request("POST", params)
+
+        if "login" not in data:
+            raise ValueError("Login error: " + str(data))
+        if data["login"]["result"] != "Success":
+            raise ValueError("Login error: Incorrect username or password")
+
+
+class AsyncWikibaseApi:
+    """Asynchronous counterpart of wikibase-api's ``Wikibase`` class. wikibase-api's model classes
+    only build the request parameters and return the result of ``Api.get()``/``Api.post()``, so
+    they are reused here on top of ``AsyncApi``. All of their functions therefore return
+    coroutines"""
+
+    def __init__(self, api):
+        # Expose API functions to allow custom API calls
+        self.api = api
+
+        # API functions
+        self.alias = Alias(api)
+        self.claim = Claim(api)
+        self.description = Description(api)
+        self.entity = Entity(api)
+        self.label = Label(api)
+        self.qualifier = Qualifier(api)
+        self.reference = Reference(api)
@@ -0,0 +1,76 @@
+import asyncio
+from collections import deque
+
+
+async def map_concurrently(fn, items, max_workers, ordered=False):
+    """Asynchronous counterpart of :func:`python_wikibase.utils.concurrency.map_concurrently`. At
+    most ``max_workers`` calls of the coroutine function are running at the same time. Items are
+    submitted lazily, so at most ``2 * max_workers`` of them are being processed or waiting to be
+    yielded at any time
+
+    :param fn: Coroutine function to call with every item
+    :type fn: function
+    :param items: Items to pass to the function
+    :type items: iterable
+    :param max_workers: Maximum number of concurrent calls
+    :type max_workers: int
+    :param ordered: Whether results should be yielded in the order of the items (otherwise, they
+        are yielded as soon as they are available)
+    :type ordered: bool
+    :return: Asynchronous generator yielding the function's return values
+    :rtype: async_generator
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    items = iter(items)
+    pending = deque()
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def run(item):
+        async with semaphore:
+            return await fn(item)
+
+    def submit_items():
+        while len(pending) < 2 * max_workers:
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            pending.append(asyncio.ensure_future(run(item)))
+
+    try:
+        submit_items()
+        while pending:
+            if ordered:
+                future = pending.popleft()
+                await asyncio.wait([future])
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                future = next(f for f in pending if f in done)
+                pending.remove(future)
+            result = future.result()
+            submit_items()
+            yield result
+    finally:
+        # Don't start any new work if the generator is closed early or a call has failed
+        for future in pending:
+            future.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+
+async def gather_concurrently(fn, items, max_workers):
+    """Apply the coroutine function to all items like ``asyncio.gather``, but with at most
+    ``max_workers`` calls running at the same time (see :func:`map_concurrently`)
+
+    :param fn: Coroutine function to call with every item
+    :type fn: function
+    :param items: Items to pass to the function
+    :type items: iterable
+    :param max_workers: Maximum number of concurrent calls
+    :type max_workers: int
+    :return: The function's return values (in the order of the items)
+    :rtype: list
+    """
+    return [result async for result in map_concurrently(fn, items, max_workers, ordered=True)]
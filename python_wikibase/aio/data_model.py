@@ -0,0 +1,908 @@
+from wikibase_api import ApiError
+
+from python_wikibase.aio.concurrency import gather_concurrently, map_concurrently
+
+from python_wikibase.data_model import (
+    Aliases,
+    Claim,
+    Claims,
+    Description,
+    Item,
+    Label,
+    Property,
+    Qualifier,
+    Qualifiers,
+    Reference,
+    References,
+)
+from python_wikibase.data_model.claim import (
+    MAX_CLAIMS_PER_REQUEST,
+    check_claim_param,
+    get_claims_params,
+    get_set_claim_params,
+    group_claims,
+    new_statement,
+    split_claim_ids,
+)
+from python_wikibase.data_model.edit_session import get_claim_edit_session, get_edit_session
+from python_wikibase.data_model.entity import (
+    MAX_ENTITIES_PER_REQUEST,
+    cache_entity_data,
+    check_prop_param,
+    check_props,
+    find_changed_entities,
+    get_page_title,
+    is_complete,
+    lookup_cached_entities,
+    lookup_cached_revisions,
+    request_entities,
+    unpack_entity_data,
+    unpack_revision_ids,
+)
+from python_wikibase.data_model.property_types import (
+    all_pages_params,
+    namespaces_params,
+    set_data_type,
+    unpack_all_pages,
+    unpack_data_types,
+    unpack_property_namespace,
+)
+from python_wikibase.data_model.qualifier import check_qualifier_param
+from python_wikibase.data_model.reference import (
+    Snak,
+    check_reference_param,
+    get_set_reference_params,
+    new_snaks,
+    unique_claims,
+)
+from python_wikibase.data_model.terms import (
+    get_set_aliases_params,
+    get_terms_content,
+    raise_term_error,
+    unpack_aliases,
+    unpack_terms,
+)
+from python_wikibase.data_types.data_type import check_data_type
+from python_wikibase.utils.cache import invalidate_claim_entity, invalidate_entity
+from python_wikibase.utils.chunks import chunks, unique
+from python_wikibase.utils.exceptions import EditError, NotFoundError, SearchError
+from python_wikibase.utils.instrumentation import observe
+
+
+async def fetch_entity_data(api, entity_ids, cache=None, props=None, languages=None, max_workers=4):
+    """Asynchronous counterpart of :func:`python_wikibase.data_model.entity.fetch_entity_data`.
+    Up to ``max_workers`` batches of entities are requested concurrently
+
+    :param api: Asynchronous wikibase-api object to use for the requests
+    :type api: AsyncWikibaseApi
+    :param entity_ids: IDs of the entities on Wikibase (e.g. ``["Q1", "P1"]``)
+    :type entity_ids: list(str)
+    :param cache: Entity cache to look up the entities in before requesting them (the fetched
+        entities are saved in it if they are complete)
+    :type cache: EntityCache
+    :param props: Parts of the entities to fetch (some of ``ENTITY_PROPS``, default: all)
+    :type props: list(str)
+    :param languages: Languages to fetch labels, descriptions and aliases in (default: all)
+    :type languages: list(str)
+    :param max_workers: Maximum number of concurrent requests
+    :type max_workers: int
+    :return: List of tuples of the form ``(entity_id, entity_data)``. ``entity_data`` is ``None``
+        if no entity with the ID exists
+    :rtype: list(tuple)
+    """
+
+    cache_fetched = cache if is_complete(props, languages) else None
+
+    async def fetch_chunk(entity_id_chunk):
+        try:
+            r = await request_entities(api, entity_id_chunk, props, languages)
+        except ApiError as e:
+            raise SearchError(f"Could not get entities: {e}") from None
+        return cache_entity_data(cache_fetched, unpack_entity_data(entity_id_chunk, r))
+
+    cached, missing_ids = lookup_cached_entities(cache, unique(entity_ids))
+    entity_id_chunks = chunks(missing_ids, MAX_ENTITIES_PER_REQUEST)
+    chunk_data = await gather_concurrently(fetch_chunk, entity_id_chunks, max_workers)
+    return list(cached.items()) + [entity for chunk in chunk_data for entity in chunk]
+
+
+async def refresh_entities(py_wb, entities, max_workers=4):
+    """Asynchronous counterpart of :func:`python_wikibase.data_model.entity.refresh_entities`. Up
+    to ``max_workers`` batches of revision IDs and entities are requested concurrently
+
+    :param py_wb: AsyncPyWikibase API wrapper object
+    :type py_wb: AsyncPyWikibase
+    :param entities: Entities to refresh (must have been fetched before)
+    :type entities: iterable(Entity)
+    :param max_workers: Maximum number of concurrent requests
+    :type max_workers: int
+    :return: Dict mapping the IDs of all entities which have changed to the updated entity (or to
+        ``None`` if the entity has been deleted)
+    :rtype: dict
+    """
+
+    async def fetch_chunk(entity_id_chunk):
+        try:
+            r = await py_wb.api.entity.get(entity_id_chunk, attributes=["info"])
+        except ApiError as e:
+            raise SearchError(f"Could not get revision IDs: {e}") from None
+        return unpack_revision_ids(entity_id_chunk, r)
+
+    entities_by_id = {entity._check_entity_id(None): entity for entity in entities}
+    entity_id_chunks = chunks(list(entities_by_id), MAX_ENTITIES_PER_REQUEST)
+    chunk_data = await gather_concurrently(fetch_chunk, entity_id_chunks, max_workers)
+    changed, deleted_ids = find_changed_entities(
+        entities_by_id, [revision for chunk in chunk_data for revision in chunk]
+    )
+    refreshed = {entity_id: None for entity_id in deleted_ids}
+
+    # Fetch full data of edited entities
+    cached, missing_ids = lookup_cached_revisions(py_wb.cache, changed)
+    if missing_ids:
+        cached.update(
+            await fetch_entity_data(py_wb.api, missing_ids, None, max_workers=max_workers)
+        )
+        cache_entity_data(py_wb.cache, [(i, cached[i]) for i in missing_ids])
+    for entity_id, entity in cached.items():
+        if entity is None:
+            refreshed[entity_id] = None
+        else:
+            refreshed_entity = entities_by_id[entity_id]
+            refreshed[entity_id] = refreshed_entity.unmarshal(
+                entity, refreshed_entity.loaded_props, refreshed_entity.loaded_languages
+            )
+    return refreshed
+
+
+async def load_property_types(py_wb, prop_ids=None, max_workers=4):
+    """Asynchronous counterpart of
+    :func:`python_wikibase.data_model.property_types.load_property_types`. Up to ``max_workers``
+    batches of properties are requested concurrently
+
+    :param py_wb: AsyncPyWikibase API wrapper object
+    :type py_wb: AsyncPyWikibase
+    :param prop_ids: IDs of the properties (default: all properties on the Wikibase instance)
+    :type prop_ids: list(str)
+    :param max_workers: Maximum number of concurrent requests
+    :type max_workers: int
+    :return: Number of properties in the registry
+    :rtype: int
+    """
+    try:
+        if prop_ids is None:
+            r = await py_wb.api.api.get(namespaces_params())
+            namespace = unpack_property_namespace(r)
+            prop_ids = []
+            continue_params = None
+            while True:
+                r = await py_wb.api.api.get(all_pages_params(namespace, continue_params))
+                page_ids, continue_params = unpack_all_pages(r)
+                prop_ids += page_ids
+                if not continue_params:
+                    break
+
+        async def request_chunk(prop_id_chunk):
+            return await request_entities(py_wb.api, prop_id_chunk, props=[])
+
+        responses = await gather_concurrently(
+            request_chunk, chunks(unique(prop_ids), MAX_ENTITIES_PER_REQUEST), max_workers
+        )
+    except ApiError as e:
+        raise SearchError(f"Could not load property data types: {e}") from None
+    data_types = {}
+    for r in responses:
+        data_types.update(unpack_data_types(r))
+    py_wb.property_types.update(data_types)
+    return len(py_wb.property_types)
+
+
+async def resolve_data_type(py_wb, prop):
+    """Asynchronous counterpart of
+    :func:`python_wikibase.data_model.property_types.resolve_data_type`
+
+    :param py_wb: AsyncPyWikibase API wrapper object
+    :type py_wb: AsyncPyWikibase
+    :param prop: Property whose data type shall be set
+    :type prop: Property
+    """
+    if prop.data_type is not None or prop.entity_id is None:
+        return
+    if prop.entity_id not in py_wb.property_types:
+        await load_property_types(py_wb, [prop.entity_id])
+    set_data_type(py_wb, prop)
+
+
+# Entities
+
+
+class AsyncEntity:
+    """Coroutine versions of the ``Entity`` functions which make API calls"""
+
+    __slots__ = ()
+
+    async def _create(self, content):
+        with observe(self.py_wb) as observation:
+            try:
+                r = await self.api.entity.add(self.entity_type, content)
+            except ApiError as e:
+                raise EditError(f"Could not create {self.entity_type}: {e}") from None
+            with observation.unmarshalling():
+                return self._unmarshal_created(r["entity"])
+
+    async def _resolve_data_types(self, claims):
+        """Look up the data types of the properties of the claims for a new entity before they are
+        marshalled"""
+        for prop, _ in claims or []:
+            check_prop_param(prop)
+            await resolve_data_type(self.py_wb, prop)
+
+    async def get(self, entity_id=None, props=None, languages=None):
+        entity_id = self._check_entity_id(entity_id)
+        check_props(props)
+        if self._unmarshal_cached(entity_id, props, languages):
+            return self
+        with observe(self.py_wb) as observation:
+            try:
+                r = await request_entities(self.api, [entity_id], props, languages)
+            except ApiError as e:
+                raise SearchError(f"Could not get {self.entity_type}: {e}") from None
+            with observation.unmarshalling():
+                return self._unmarshal_response(entity_id, r, props, languages)
+
+    async def refresh(self):
+        entity_id = self._check_entity_id(None)
+        refreshed = await refresh_entities(self.py_wb, [self])
+        if entity_id in refreshed and refreshed[entity_id] is None:
+            raise NotFoundError(f'No {self.entity_type} found with the entity_id "{entity_id}"')
+        return self
+
+    async def get_many(self, entity_ids, props=None, languages=None):
+        check_props(props)
+        with observe(self.py_wb) as observation:
+            entity_data = await fetch_entity_data(
+                self.api, entity_ids, self.py_wb.cache, props, languages
+            )
+            with observation.unmarshalling():
+                return self._unmarshal_many(entity_data, props, languages)
+
+    async def save(self):
+        session = self._get_edit_session()
+        try:
+            content = session.marshal()
+            if content:
+                try:
+                    r = await self.api.entity.update(self.entity_id, content)
+                except ApiError as e:
+                    raise EditError(f"Could not save {self.entity_type}: {e}") from None
+                invalidate_entity(self.py_wb, self.entity_id)
+                session.unmarshal(r["entity"])
+        finally:
+            del self.py_wb.edit_sessions[self.entity_id]
+        return self
+
+    async def set_terms(self, labels=None, descriptions=None, aliases=None):
+        if self._record_terms(labels, descriptions, aliases):
+            return self
+        current_aliases = self.aliases.aliases if self.aliases is not None else {}
+        content = get_terms_content(labels, descriptions, aliases, current_aliases)
+        if not content:
+            return self
+
+        try:
+            r = await self.api.entity.update(self.entity_id, content)
+        except ApiError as e:
+            raise_term_error(e, f"Could not update terms of {self.entity_type}")
+        invalidate_entity(self.py_wb, self.entity_id)
+        return self._unmarshal_terms(r["entity"], labels, descriptions, aliases)
+
+    async def delete(self):
+        try:
+            await self.api.entity.remove(get_page_title(self.entity_type, self.entity_id))
+        except ApiError as e:
+            raise EditError(f"Could not delete {self.entity_type}: {e}") from None
+        invalidate_entity(self.py_wb, self.entity_id)
+
+
+class AsyncItem(AsyncEntity, Item):
+    __slots__ = ()
+
+    async def create(self, label, description=None, aliases=None, claims=None):
+        await self._resolve_data_types(claims)
+        return await self._create(self._marshal_new(label, description, aliases, claims))
+
+
+class AsyncProperty(AsyncEntity, Property):
+    __slots__ = ()
+
+    async def create(
+        self, label, data_type="StringValue", description=None, aliases=None, claims=None
+    ):
+        await self._resolve_data_types(claims)
+        return await self._create(self._marshal_new(label, data_type, description, aliases, claims))
+
+
+# Labels, descriptions and aliases
+
+
+class AsyncLabel(Label):
+    __slots__ = ()
+
+    async def set(self, label, language=None):
+        if not language:
+            language = self.language
+        if self._record_set(label, language):
+            return
+
+        try:
+            r = await self.api.label.set(self.item_id, label, language)
+        except ApiError as e:
+            raise_term_error(e, "Could not set label")
+        unpack_terms(self.labels, r["entity"].get("labels") or {}, [language])
+        invalidate_entity(self.py_wb, self.item_id)
+
+    async def set_many(self, labels):
+        if not labels or self._record_set_many(labels):
+            return
+
+        try:
+            r = await self.api.entity.update(self.item_id, get_terms_content(labels=labels))
+        except ApiError as e:
+            raise_term_error(e, "Could not update labels")
+        unpack_terms(self.labels, r["entity"].get("labels") or {}, labels)
+        invalidate_entity(self.py_wb, self.item_id)
+
+
+class AsyncDescription(Description):
+    __slots__ = ()
+
+    async def set(self, description, language=None):
+        if not language:
+            language = self.language
+        if self._record_set(description, language):
+            return
+
+        try:
+            r = await self.api.description.set(self.item_id, description, language)
+        except ApiError as e:
+            raise_term_error(e, "Could not update description")
+        unpack_terms(self.descriptions, r["entity"].get("descriptions") or {}, [language])
+        invalidate_entity(self.py_wb, self.item_id)
+
+    async def set_many(self, descriptions):
+        if not descriptions or self._record_set_many(descriptions):
+            return
+
+        try:
+            r = await self.api.entity.update(
+                self.item_id, get_terms_content(descriptions=descriptions)
+            )
+        except ApiError as e:
+            raise_term_error(e, "Could not update descriptions")
+        unpack_terms(self.descriptions, r["entity"].get("descriptions") or {}, descriptions)
+        invalidate_entity(self.py_wb, self.item_id)
+
+
+class AsyncAliases(Aliases):
+    __slots__ = ()
+
+    async def add(self, alias, language=None):
+        if not language:
+            language = self.language
+        if self._record_add(alias, language):
+            return
+
+        try:
+            r = await self.api.alias.add(self.item_id, alias, language)
+        except ApiError as e:
+            raise EditError(f"Could not add alias: {e}") from None
+        aliases_data = r["entity"].get("aliases") or {}
+        unpack_aliases(self.aliases, aliases_data, aliases_data)
+        invalidate_entity(self.py_wb, self.item_id)
+
+    async def remove(self, alias, language=None):
+        if not language:
+            language = self.language
+        if self._record_remove(alias, language):
+            return
+
+        try:
+            await self.api.alias.remove(self.item_id, alias, language)
+            self.aliases[language].remove(alias)
+        except ApiError as e:
+            raise EditError(f"Could not remove alias: {e}") from None
+        invalidate_entity(self.py_wb, self.item_id)
+
+    async def update(self, add=None, remove=None, language=None):
+        if not language:
+            language = self.language
+        add = list(add or [])
+        remove = list(remove or [])
+        if not add and not remove or self._record_update(add, remove, language):
+            return
+
+        try:
+            r = await self.api.api.post(get_set_aliases_params(self.item_id, language, add, remove))
+        except ApiError as e:
+            raise EditError(f"Could not update aliases: {e}") from None
+        unpack_aliases(self.aliases, r["entity"].get("aliases") or {}, [language])
+        invalidate_entity(self.py_wb, self.item_id)
+
+
+# Claims
+
+
+class AsyncClaims(Claims):
+    __slots__ = ()
+
+    async def _create(self, prop, value, snak_type):
+        new_claim = self._record_create(prop, value, snak_type)
+        if new_claim:
+            return new_claim
+
+        value_marshalled = value.marshal() if value else None
+        with observe(self.py_wb) as observation:
+            try:
+                r = await self._add_claim(prop, value_marshalled, snak_type)
+            except ApiError as e:
+                raise EditError(f"Could not create claim: {e}") from None
+            invalidate_entity(self.py_wb, self.item_id)
+            with observation.unmarshalling():
+                return self._unmarshal_created(r)
+
+    async def _add_claim(self, prop, value_marshalled, snak_type):
+        async def add(value_marshalled):
+            return await self.api.claim.add(
+                self.item_id, prop.entity_id, value_marshalled, snak_type=snak_type
+            )
+
+        async def find_created():
+            r = await self.api.api.get(get_claims_params(self.item_id, prop.entity_id))
+            return self._find_created(r, prop, value_marshalled, snak_type)
+
+        policy = self.py_wb.retry_policy
+        if policy is None:
+            return await add(value_marshalled)
+        return await policy.run_async(
+            add, value_marshalled, idempotent=False, find_written=find_created
+        )
+
+    async def add(self, prop, value):
+        check_prop_param(prop)
+        await resolve_data_type(self.py_wb, prop)
+        check_data_type(value, prop)
+        return await self._create(prop, value, "value")
+
+    async def add_no_value(self, prop):
+        check_prop_param(prop)
+        return await self._create(prop, None, "novalue")
+
+    async def add_some_value(self, prop):
+        check_prop_param(prop)
+        return await self._create(prop, None, "somevalue")
+
+    async def add_statement(self, prop, value, qualifiers=None, references=None, rank="normal"):
+        await resolve_statement_data_types(self.py_wb, prop, value, qualifiers, references)
+        claim = new_statement(self.py_wb, self.item_id, prop, value, qualifiers, references, rank)
+
+        session = get_edit_session(self.py_wb, self.item_id)
+        if session:
+            self._add_locally(claim)
+            session.claim_created(claim)
+            return claim
+
+        await set_statement(self.py_wb, self.api, claim)
+        self._add_locally(claim)
+        return claim
+
+    async def add_statements(self, specs, max_workers=4):
+        """Create multiple claims (see :meth:`Claims.add_statements`). Up to ``max_workers``
+        statements are saved concurrently"""
+        specs = list(specs)
+        for spec in specs:
+            await resolve_statement_data_types(self.py_wb, **spec)
+        claims = [new_statement(self.py_wb, self.item_id, **spec) for spec in specs]
+
+        session = get_edit_session(self.py_wb, self.item_id)
+        if session:
+            for claim in claims:
+                self._add_locally(claim)
+                session.claim_created(claim)
+            return claims
+
+        async def set_claim(claim):
+            return await set_statement(self.py_wb, self.api, claim)
+
+        await gather_concurrently(set_claim, claims, max_workers)
+        for claim in claims:
+            self._add_locally(claim)
+        return claims
+
+    async def remove(self, claim):
+        check_claim_param(claim)
+
+        session = get_edit_session(self.py_wb, self.item_id)
+        if session:
+            self._remove_locally(claim)
+            session.claim_removed(claim.claim_id)
+            return self
+
+        try:
+            await self.api.claim.remove(claim.claim_id)
+        except ApiError as e:
+            raise EditError(f"Could not remove claim: {e}") from None
+        invalidate_entity(self.py_wb, self.item_id)
+
+        self._remove_locally(claim)
+        return self
+
+    async def remove_many(self, claims):
+        claims = self._check_claims(claims)
+
+        session = get_edit_session(self.py_wb, self.item_id)
+        if session:
+            self._remove_many_locally(claims)
+            for claim in claims:
+                session.claim_removed(claim.claim_id)
+            return {}
+
+        claim_ids = unique(claim.claim_id for claim in claims)
+        failures = await remove_entity_claims(self.py_wb, self.api, self.item_id, claim_ids)
+        self._remove_many_locally([claim for claim in claims if claim.claim_id not in failures])
+        return failures
+
+
+async def resolve_statement_data_types(
+    py_wb, prop, value=None, qualifiers=None, references=None, **kwargs
+):
+    """Look up the data types of the properties of a new statement before it is created using
+    :func:`python_wikibase.data_model.claim.new_statement`"""
+    await resolve_snak_data_types(py_wb, [(prop, value)] + list(qualifiers or []))
+    for reference in references or []:
+        await resolve_snak_data_types(
+            py_wb, reference if isinstance(reference, list) else [reference]
+        )
+
+
+async def resolve_snak_data_types(py_wb, snaks):
+    """Look up the data types of the properties of ``(prop, value)`` tuples before the snaks are
+    created using the synchronous functions"""
+    for prop, _ in snaks:
+        check_prop_param(prop)
+        await resolve_data_type(py_wb, prop)
+
+
+async def set_statement(py_wb, api, claim):
+    """Asynchronous counterpart of :func:`python_wikibase.data_model.claim.set_statement`"""
+    with observe(py_wb) as observation:
+        try:
+            r = await api.api.post(get_set_claim_params(claim))
+        except ApiError as e:
+            raise EditError(f"Could not create claim: {e}") from None
+        invalidate_entity(py_wb, claim.item_id)
+        with observation.unmarshalling():
+            claim.unmarshal_ids(r["claim"])
+    return claim
+
+
+async def add_statements(py_wb, specs, max_workers=4):
+    """Asynchronous counterpart of :func:`python_wikibase.data_model.claim.add_statements`. Up to
+    ``max_workers`` statements are saved concurrently
+
+    :param py_wb: AsyncPyWikibase API wrapper object
+    :type py_wb: AsyncPyWikibase
+    :param specs: Data of the new claims (see :meth:`PyWikibase.add_statements`)
+    :type specs: iterable(dict)
+    :param max_workers: Maximum number of concurrent requests
+    :type max_workers: int
+    :return: List of tuples of the form ``(spec, claim)`` (in the order of ``specs``)
+    :rtype: list(tuple)
+    """
+    specs = list(specs)
+    for spec in specs:
+        await resolve_statement_data_types(py_wb, **spec)
+    claims = [new_statement(py_wb, **spec) for spec in specs]
+
+    async def set_claim(claim):
+        return await set_statement(py_wb, py_wb.api, claim)
+
+    await gather_concurrently(set_claim, claims, max_workers)
+    return list(zip(specs, claims))
+
+
+async def remove_claim_ids(api, claim_ids):
+    """Asynchronous counterpart of :func:`python_wikibase.data_model.claim.remove_claim_ids`"""
+    try:
+        await api.claim.remove(claim_ids)
+    except ApiError as e:
+        if len(claim_ids) == 1:
+            return {claim_ids[0]: EditError(f"Could not remove claim: {e}")}
+        failures = {}
+        for half in split_claim_ids(claim_ids):
+            failures.update(await remove_claim_ids(api, half))
+        return failures
+    return {}
+
+
+async def remove_entity_claims(py_wb, api, entity_id, claim_ids):
+    """Asynchronous counterpart of :func:`python_wikibase.data_model.claim.remove_entity_claims`.
+    The requests are made one after another (concurrent edits of an entity would conflict)"""
+    failures = {}
+    for claim_id_chunk in chunks(claim_ids, MAX_CLAIMS_PER_REQUEST):
+        failures.update(await remove_claim_ids(api, claim_id_chunk))
+    if len(failures) < len(claim_ids):
+        invalidate_entity(py_wb, entity_id)
+    return failures
+
+
+async def remove_claims(py_wb, claims, max_workers=4):
+    """Asynchronous counterpart of :func:`python_wikibase.data_model.claim.remove_claims`. The
+    claims of up to ``max_workers`` entities are removed concurrently
+
+    :param py_wb: AsyncPyWikibase API wrapper object
+    :type py_wb: AsyncPyWikibase
+    :param claims: Claims to remove
+    :type claims: iterable(Claim)
+    :param max_workers: Maximum number of concurrent requests
+    :type max_workers: int
+    :return: Dict mapping the IDs of the claims which couldn't be removed to an ``EditError``
+    :rtype: dict
+    """
+    failures = {}
+    pending = []
+    for entity_id, entity_claims in group_claims(claims).items():
+        session = get_edit_session(py_wb, entity_id)
+        if session:
+            failures.update(await session.entity.claims.remove_many(entity_claims))
+        else:
+            pending.append((entity_id, [claim.claim_id for claim in entity_claims]))
+
+    async def remove_entity(entity_id_claim_ids):
+        entity_id, claim_ids = entity_id_claim_ids
+        return await remove_entity_claims(py_wb, py_wb.api, entity_id, claim_ids)
+
+    for entity_failures in await gather_concurrently(remove_entity, pending, max_workers):
+        failures.update(entity_failures)
+    return failures
+
+
+class AsyncClaim(Claim):
+    __slots__ = ()
+
+    async def set_value(self, value):
+        await resolve_data_type(self.py_wb, self.property)
+        check_data_type(value, self.property)
+        await self._update(value, "value")
+
+    async def set_no_value(self):
+        await self._update(None, "novalue")
+
+    async def set_some_value(self):
+        await self._update(None, "somevalue")
+
+    async def _update(self, value, snak_type):
+        if self._record_update(value, snak_type):
+            return
+        try:
+            await self.api.claim.update(
+                self.claim_id, value.marshal() if value else None, snak_type=snak_type
+            )
+        except ApiError as e:
+            raise EditError(f"Could not update claim value: {e}") from None
+        invalidate_claim_entity(self.py_wb, self.claim_id)
+
+
+# Qualifiers
+
+
+class AsyncQualifiers(Qualifiers):
+    __slots__ = ()
+
+    async def _create(self, prop, value, snak_type):
+        new_qualifier = self._record_create(prop, value, snak_type)
+        if new_qualifier:
+            return new_qualifier
+
+        with observe(self.py_wb) as observation:
+            try:
+                r = await self.api.qualifier.add(
+                    self.claim_id,
+                    prop.entity_id,
+                    value.marshal() if value else None,
+                    snak_type=snak_type,
+                )
+            except ApiError as e:
+                raise EditError(f"Could not create qualifier: {e}") from None
+            invalidate_claim_entity(self.py_wb, self.claim_id)
+            with observation.unmarshalling():
+                return self._unmarshal_created(prop, r)
+
+    async def add(self, prop, value):
+        check_prop_param(prop)
+        await resolve_data_type(self.py_wb, prop)
+        check_data_type(value, prop)
+        return await self._create(prop, value, "value")
+
+    async def add_no_value(self, prop):
+        check_prop_param(prop)
+        return await self._create(prop, None, "novalue")
+
+    async def add_some_value(self, prop):
+        check_prop_param(prop)
+        return await self._create(prop, None, "somevalue")
+
+    async def remove(self, qualifier):
+        check_qualifier_param(qualifier)
+
+        session = get_claim_edit_session(self.py_wb, self.claim_id)
+        if session:
+            session.claim_changed(self.claim_id, self)
+            self._remove_locally(qualifier)
+            return self
+
+        try:
+            await self.api.qualifier.remove(qualifier.claim_id, qualifier.qualifier_id)
+        except ApiError as e:
+            raise EditError(f"Could not remove qualifier: {e}") from None
+        invalidate_claim_entity(self.py_wb, self.claim_id)
+
+        self._remove_locally(qualifier)
+        return self
+
+
+class AsyncQualifier(Qualifier):
+    __slots__ = ()
+
+    async def set_value(self, value):
+        await resolve_data_type(self.py_wb, self.property)
+        check_data_type(value, self.property)
+        await self._update(value, "value")
+
+    async def set_no_value(self):
+        await self._update(None, "novalue")
+
+    async def set_some_value(self):
+        await self._update(None, "somevalue")
+
+    async def _update(self, value, snak_type):
+        if self._record_update(value, snak_type):
+            return
+        try:
+            await self.api.qualifier.update(
+                self.claim_id,
+                self.qualifier_id,
+                self.property.entity_id,
+                value.marshal() if value else None,
+                snak_type=snak_type,
+            )
+        except ApiError as e:
+            raise EditError(f"Could not update qualifier value: {e}") from None
+        invalidate_claim_entity(self.py_wb, self.claim_id)
+
+
+# References
+
+
+class AsyncReferences(References):
+    __slots__ = ()
+
+    async def _create(self, snaks):
+        new_reference = self._record_create(snaks)
+        if new_reference:
+            return new_reference
+
+        with observe(self.py_wb) as observation:
+            try:
+                r = await self.api.api.post(get_set_reference_params(self.claim_id, snaks))
+            except ApiError as e:
+                raise EditError(f"Could not create reference: {e}") from None
+            invalidate_claim_entity(self.py_wb, self.claim_id)
+            with observation.unmarshalling():
+                return self._unmarshal_created(r)
+
+    async def add(self, prop, value):
+        return await self.add_snaks([(prop, value)])
+
+    async def add_no_value(self, prop):
+        check_prop_param(prop)
+        return await self._create([Snak(prop, None, "novalue")])
+
+    async def add_some_value(self, prop):
+        check_prop_param(prop)
+        return await self._create([Snak(prop, None, "somevalue")])
+
+    async def add_snaks(self, snaks):
+        snaks = list(snaks)
+        await resolve_snak_data_types(self.py_wb, snaks)
+        return await self._create(new_snaks(self.py_wb, snaks))
+
+    async def remove(self, reference):
+        check_reference_param(reference)
+
+        session = get_claim_edit_session(self.py_wb, self.claim_id)
+        if session:
+            session.claim_changed(self.claim_id, self)
+            self._remove_locally(reference)
+            return self
+
+        try:
+            await self.api.reference.remove(reference.claim_id, reference.reference_id)
+        except ApiError as e:
+            raise EditError(f"Could not remove reference: {e}") from None
+        invalidate_claim_entity(self.py_wb, self.claim_id)
+
+        self._remove_locally(reference)
+        return self
+
+
+async def add_references(py_wb, claims, snaks, max_workers=4):
+    """Asynchronous counterpart of :func:`python_wikibase.data_model.reference.add_references`. Up
+    to ``max_workers`` references are created concurrently
+
+    :param py_wb: AsyncPyWikibase API wrapper object
+    :type py_wb: AsyncPyWikibase
+    :param claims: Claims to add the reference to
+    :type claims: iterable(Claim)
+    :param snaks: Snaks of the reference as a list of ``(prop, value)`` tuples
+    :type snaks: list(tuple(Property, Value))
+    :param max_workers: Maximum number of concurrent requests
+    :type max_workers: int
+    :return: New references (in the order of ``claims``)
+    :rtype: list(Reference)
+    """
+    snaks = list(snaks)
+    await resolve_snak_data_types(py_wb, snaks)
+    snaks = new_snaks(py_wb, snaks)
+    claims = list(claims)
+    new_references = {}
+    pending = []
+    for claim in unique_claims(claims):
+        if get_claim_edit_session(py_wb, claim.claim_id):
+            new_references[claim.claim_id] = claim.references._record_create(list(snaks))
+        else:
+            pending.append(claim)
+
+    async def create_reference(claim):
+        return await claim.references._create(list(snaks))
+
+    references = [
+        reference
+        async for reference in map_concurrently(
+            create_reference, pending, max_workers, ordered=True
+        )
+    ]
+    for claim, reference in zip(pending, references):
+        new_references[claim.claim_id] = reference
+    return [new_references[claim.claim_id] for claim in claims]
+
+
+class AsyncReference(Reference):
+    __slots__ = ()
+
+    async def set_snaks(self, snaks):
+        snaks = list(snaks)
+        await resolve_snak_data_types(self.py_wb, snaks)
+        await self._update(new_snaks(self.py_wb, snaks))
+
+    async def set_value(self, value, index=0):
+        prop = self._get_snak(index).property
+        await resolve_data_type(self.py_wb, prop)
+        check_data_type(value, prop)
+        await self._update(self._replace_snak(index, value, "value"))
+
+    async def set_no_value(self, index=0):
+        await self._update(self._replace_snak(index, None, "novalue"))
+
+    async def set_some_value(self, index=0):
+        await self._update(self._replace_snak(index, None, "somevalue"))
+
+    async def _update(self, snaks):
+        if self._record_update(snaks):
+            return
+        try:
+            r = await self.api.api.post(
+                get_set_reference_params(self.claim_id, snaks, self.reference_id)
+            )
+        except ApiError as e:
+            raise EditError(f"Could not update reference value: {e}") from None
+        invalidate_claim_entity(self.py_wb, self.claim_id)
+        self.unmarshal_update(snaks, r)
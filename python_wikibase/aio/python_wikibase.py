@@ -0,0 +1,464 @@
+import copy
+
+from wikibase_api.utils.config import load_config_file, verify_api_url, verify_auth_info
+
+from python_wikibase.aio.api import AsyncApi, AsyncWikibaseApi
+from python_wikibase.aio.concurrency import map_concurrently
+from python_wikibase.aio.data_model import (
+    AsyncAliases,
+    AsyncClaim,
+    AsyncClaims,
+    AsyncDescription,
+    AsyncItem,
+    AsyncLabel,
+    AsyncProperty,
+    AsyncQualifier,
+    AsyncQualifiers,
+    AsyncReference,
+    AsyncReferences,
+    add_references,
+    add_statements,
+    fetch_entity_data,
+    load_property_types,
+    refresh_entities,
+    remove_claims,
+)
+from python_wikibase.data_model.entity import (
+    MAX_ENTITIES_PER_REQUEST,
+    check_props,
+    unmarshal_entities,
+)
+from python_wikibase.data_model.property_types import create_property_types
+from python_wikibase.data_types import (
+    CommonsMedia,
+    ExternalId,
+    Form,
+    GeoLocation,
+    GeoShape,
+    Lexeme,
+    Math,
+    MonolingualText,
+    Quantity,
+    Sense,
+    StringValue,
+    Table,
+    Time,
+    UnknownValue,
+    Url,
+)
+from python_wikibase.data_types.data_type import check_unknown_data_types
+from python_wikibase.dump import map_dump, map_reduce_dump, read_dump
+from python_wikibase.python_wikibase import DEFAULT_CONFIG
+from python_wikibase.utils.cache import create_cache
+from python_wikibase.utils.chunks import chunks, unique
+from python_wikibase.utils.instrumentation import Instrumentation
+
+
+class AsyncPyWikibase:
+    """Asynchronous counterpart of the ``PyWikibase`` class. All functions which make API calls are
+    coroutines. Requests share a pool of connections, so many of them can be in flight at the same
+    time
+
+    The HTTP session is opened and authenticated when entering the ``async with`` block (or when
+    calling :meth:`open`)::
+
+        async with AsyncPyWikibase(config_path="config.json") as py_wb:
+            item = await py_wb.Item().get(entity_id="Q1")
+    """
+
+    def __init__(
+        self,
+        # wikibase-api params
+        api_url=DEFAULT_CONFIG["api_url"],
+        oauth_credentials=DEFAULT_CONFIG["oauth_credentials"],
+        login_credentials=DEFAULT_CONFIG["login_credentials"],
+        is_bot=DEFAULT_CONFIG["is_bot"],
+        summary=DEFAULT_CONFIG["summary"],
+        config_path=None,
+        # Other params
+        language="en",
+        max_connections=100,
+        cache=False,
+        unknown_data_types="raise",
+        property_types=None,
+        edit_scheduler=None,
+        retry_policy=None,
+        observers=None,
+    ):
+        # Load configuration from parameters or file
+        if config_path:
+            config = load_config_file(config_path, copy.deepcopy(DEFAULT_CONFIG))
+        else:
+            config = {
+                "api_url": api_url,
+                "oauth_credentials": oauth_credentials,
+                "login_credentials": login_credentials,
+                "is_bot": is_bot,
+                "summary": summary,
+            }
+
+        # Verify configuration parameters
+        if config["oauth_credentials"] or config["login_credentials"]:
+            verify_auth_info(config["oauth_credentials"], config["login_credentials"])
+            verify_api_url(config["api_url"])
+
+        self.api = AsyncWikibaseApi(AsyncApi(config, max_connections=max_connections))
+        self.language = language
+
+        # Cache for the data of fetched entities (``None`` if caching is disabled, which is the
+        # default)
+        self.cache = create_cache(cache)
+
+        # Handling of values of data types without unmarshalling function: "raise" (raise a
+        # ``NotImplementedError``) or "raw" (return ``UnknownValue`` objects holding the raw data)
+        check_unknown_data_types(unknown_data_types)
+        self.unknown_data_types = unknown_data_types
+
+        # Registry of the data types of properties, which are used for validating new claims,
+        # qualifiers and references. Can be set to the path of a JSON file to persist the registry
+        self.property_types = create_property_types(property_types)
+
+        # Scheduler pacing the edits (``None`` if edits are made without delay)
+        self.edit_scheduler = edit_scheduler
+        self.api.api.scheduler = edit_scheduler
+
+        # Policy for retrying requests which have failed with a transient error (``None`` if
+        # errors are raised immediately)
+        self.retry_policy = retry_policy
+        self.api.api.retry_policy = retry_policy
+
+        # Observers which are called with an ``ApiCallEvent`` after every API call
+        self.instrumentation = Instrumentation(observers)
+        self.api.api.instrumentation = self.instrumentation
+
+        # Active edit sessions (entity ID -> EditSession)
+        self.edit_sessions = {}
+
+        # Context shared by the data model objects (see base.Context)
+        self.context = None
+
+    async def open(self):
+        """Open the HTTP session and authenticate with Wikibase
+
+        :return: self
+        :rtype: AsyncPyWikibase
+        """
+        await self.api.api.open()
+        return self
+
+    async def close(self):
+        """Close the HTTP session"""
+        await self.api.api.close()
+
+    async def __aenter__(self):
+        return await self.open()
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    # Data model
+
+    def Aliases(self):
+        return AsyncAliases(self, self.api, self.language)
+
+    def Claim(self):
+        return AsyncClaim(self, self.api, self.language)
+
+    def Claims(self):
+        return AsyncClaims(self, self.api, self.language)
+
+    def Description(self):
+        return AsyncDescription(self, self.api, self.language)
+
+    def Item(self):
+        return AsyncItem(self, self.api, self.language)
+
+    def Label(self):
+        return AsyncLabel(self, self.api, self.language)
+
+    def Property(self):
+        return AsyncProperty(self, self.api, self.language)
+
+    def Qualifier(self):
+        return AsyncQualifier(self, self.api, self.language)
+
+    def Qualifiers(self):
+        return AsyncQualifiers(self, self.api, self.language)
+
+    def Reference(self):
+        return AsyncReference(self, self.api, self.language)
+
+    def References(self):
+        return AsyncReferences(self, self.api, self.language)
+
+    # Data types
+
+    def CommonsMedia(self):
+        return CommonsMedia(self, self.api, self.language)
+
+    def ExternalId(self):
+        return ExternalId(self, self.api, self.language)
+
+    def Form(self):
+        return Form(self, self.api, self.language)
+
+    def GeoLocation(self):
+        return GeoLocation(self, self.api, self.language)
+
+    def GeoShape(self):
+        return GeoShape(self, self.api, self.language)
+
+    def Lexeme(self):
+        return Lexeme(self, self.api, self.language)
+
+    def Math(self):
+        return Math(self, self.api, self.language)
+
+    def MonolingualText(self):
+        return MonolingualText(self, self.api, self.language)
+
+    def Quantity(self):
+        return Quantity(self, self.api, self.language)
+
+    def Sense(self):
+        return Sense(self, self.api, self.language)
+
+    def StringValue(self):
+        return StringValue(self, self.api, self.language)
+
+    def Table(self):
+        return Table(self, self.api, self.language)
+
+    def Time(self):
+        return Time(self, self.api, self.language)
+
+    def UnknownValue(self):
+        return UnknownValue(self, self.api, self.language)
+
+    def Url(self):
+        return Url(self, self.api, self.language)
+
+    # Properties
+
+    async def load_property_types(self, prop_ids=None):
+        """Fetch the data types of properties (in batches) and save them in the property registry,
+        so they don't need to be requested when adding claims, qualifiers or references. If the
+        registry is persisted, the data types are only requested once across processes
+
+        :param prop_ids: IDs of the properties (default: all properties on the Wikibase instance)
+        :type prop_ids: list(str)
+        :return: Number of properties in the registry
+        :rtype: int
+        """
+        return await load_property_types(self, prop_ids)
+
+    # Batch operations
+
+    async def get_entities(self, entity_ids, props=None, languages=None):
+        """Fetch information about multiple entities (items and/or properties) from Wikibase. The
+        batches of entity IDs are requested concurrently
+
+        :param entity_ids: IDs of the entities on Wikibase (e.g. ``["Q1", "P1"]``)
+        :type entity_ids: list(str)
+        :param props: Parts of the entities to fetch (some of ``ENTITY_PROPS``, default: all)
+        :type props: list(str)
+        :param languages: Languages to fetch labels, descriptions and aliases in (default: all)
+        :type languages: list(str)
+        :return: Dict mapping every entity ID to the fetched ``Item`` or ``Property`` (or to
+            ``None`` if no entity with the ID exists)
+        :rtype: dict
+        """
+        check_props(props)
+        entity_data = await fetch_entity_data(self.api, entity_ids, self.cache, props, languages)
+        return unmarshal_entities(self, entity_data, props, languages)
+
+    async def refresh_entities(self, entities):
+        """Update multiple entities with their current data on Wikibase. Only the IDs of the
+        entities' latest revisions are requested first, the full data is then only fetched for the
+        entities which have been edited since they were fetched
+
+        :param entities: Entities to refresh (must have been fetched before)
+        :type entities: iterable(Entity)
+        :return: Dict mapping the IDs of all entities which have changed to the updated ``Item`` or
+            ``Property`` (or to ``None`` if the entity has been deleted)
+        :rtype: dict
+        """
+        return await refresh_entities(self, entities)
+
+    async def fetch_concurrently(
+        self, entity_ids, max_workers=4, ordered=False, props=None, languages=None
+    ):
+        """Fetch information about multiple entities (items and/or properties) from Wikibase. The
+        entity IDs are split up into batches, up to ``max_workers`` of which are requested
+        concurrently. Unlike :meth:`get_entities`, the entities are yielded as soon as their batch
+        has been fetched::
+
+            async for entity_id, entity in py_wb.fetch_concurrently(entity_ids):
+                ...
+
+        :param entity_ids: IDs of the entities on Wikibase (e.g. ``["Q1", "P1"]``)
+        :type entity_ids: iterable(str)
+        :param max_workers: Maximum number of concurrent requests
+        :type max_workers: int
+        :param ordered: Whether entities should be yielded in the order of ``entity_ids``
+            (otherwise, they are yielded as soon as their batch has been fetched)
+        :type ordered: bool
+        :param props: Parts of the entities to fetch (some of ``ENTITY_PROPS``, default: all)
+        :type props: list(str)
+        :param languages: Languages to fetch labels, descriptions and aliases in (default: all)
+        :type languages: list(str)
+        :return: Asynchronous generator yielding tuples of the form ``(entity_id, entity)``.
+            ``entity`` is an ``Item`` or ``Property`` (or ``None`` if no entity with the ID exists)
+        :rtype: async_generator(tuple)
+        """
+        check_props(props)
+
+        async def fetch_chunk(entity_id_chunk):
+            return await fetch_entity_data(self.api, entity_id_chunk, self.cache, props, languages)
+
+        entity_id_chunks = chunks(unique(entity_ids), MAX_ENTITIES_PER_REQUEST)
+        async for chunk_data in map_concurrently(
+            fetch_chunk, entity_id_chunks, max_workers, ordered
+        ):
+            for entity in unmarshal_entities(self, chunk_data, props, languages).items():
+                yield entity
+
+    async def create_items(self, specs, max_workers=4, ordered=False):
+        """Create multiple items, up to ``max_workers`` of them concurrently. Every item is created
+        with a single API request containing all of its data::
+
+            async for spec, item in py_wb.create_items(specs):
+                ...
+
+        :param specs: Data of the new items. Every spec is a dict with the parameters of
+            :meth:`Item.create` (e.g. ``{"label": "Item", "claims": [(prop, value)]}``)
+        :type specs: iterable(dict)
+        :param max_workers: Maximum number of concurrent requests
+        :type max_workers: int
+        :param ordered: Whether items should be yielded in the order of ``specs`` (otherwise, they
+            are yielded as soon as they have been created)
+        :type ordered: bool
+        :return: Asynchronous generator yielding tuples of the form ``(spec, item)``
+        :rtype: async_generator(tuple)
+        """
+
+        async def create_item(spec):
+            return spec, await self.Item().create(**spec)
+
+        async for result in map_concurrently(create_item, specs, max_workers, ordered):
+            yield result
+
+    async def add_statements(self, specs, max_workers=4):
+        """Create claims (together with their qualifiers and references) on multiple entities. The
+        claim IDs are generated locally, so every statement is saved with a single "wbsetclaim"
+        request and up to ``max_workers`` statements are saved concurrently
+
+        :param specs: Data of the new claims. Every spec is a dict with the ID of the entity and
+            the parameters of :meth:`Claims.add_statement` (e.g. ``{"entity_id": "Q1", "prop":
+            prop, "value": value, "references": [(prop, value)]}``)
+        :type specs: iterable(dict)
+        :param max_workers: Maximum number of concurrent requests
+        :type max_workers: int
+        :return: List of tuples of the form ``(spec, claim)`` (in the order of ``specs``)
+        :rtype: list(tuple)
+        """
+        return await add_statements(self, specs, max_workers)
+
+    async def add_references(self, claims, snaks, max_workers=4):
+        """Add the same reference to multiple claims (see :meth:`PyWikibase.add_references`). Up to
+        ``max_workers`` references are created concurrently
+
+        :param claims: Claims to add the reference to
+        :type claims: iterable(Claim)
+        :param snaks: Snaks of the reference as a list of ``(prop, value)`` tuples
+        :type snaks: list(tuple(Property, Value))
+        :param max_workers: Maximum number of concurrent requests
+        :type max_workers: int
+        :return: New references (in the order of ``claims``)
+        :rtype: list(Reference)
+        """
+        return await add_references(self, claims, snaks, max_workers)
+
+    async def remove_claims(self, claims, max_workers=4):
+        """Delete claims of multiple entities. The claims are grouped by entity and deleted using
+        one "wbremoveclaims" request for every ``MAX_CLAIMS_PER_REQUEST`` claims, the claims of
+        up to ``max_workers`` entities are deleted concurrently. If a request fails, its claims are
+        split up to find the ones which can't be deleted, the others are deleted nevertheless
+
+        :param claims: Claims to delete
+        :type claims: iterable(Claim)
+        :param max_workers: Maximum number of concurrent requests
+        :type max_workers: int
+        :return: Dict mapping the IDs of the claims which couldn't be deleted to an ``EditError``
+            (empty if all claims have been deleted)
+        :rtype: dict
+        """
+        return await remove_claims(self, claims, max_workers)
+
+    # Dumps (no API calls are made, so these functions aren't coroutines)
+
+    def read_dump(self, path, entity_types=None):
+        """Read a Wikibase JSON dump (see :meth:`PyWikibase.read_dump`)
+
+        :param path: Path of the dump file
+        :type path: str
+        :param entity_types: Types of entities to read (default: ``["item", "property"]``)
+        :type entity_types: list(str)
+        :return: Generator yielding an ``Item`` or ``Property`` for every entity in the dump
+        :rtype: generator(Entity)
+        """
+        return read_dump(self, path, entity_types)
+
+    def map_dump(self, path, map_fn, processes=None, entity_types=None):
+        """Apply the function to all entities of a Wikibase JSON dump using a pool of worker
+        processes (see :meth:`PyWikibase.map_dump`). The worker processes use the synchronous
+        ``PyWikibase`` class
+
+        :param path: Path of the dump file
+        :type path: str
+        :param map_fn: Picklable function which is called with every entity and returns the value
+            to yield (or ``None`` to skip the entity)
+        :type map_fn: function
+        :param processes: Number of worker processes (default: number of CPUs)
+        :type processes: int
+        :param entity_types: Types of entities to process (default: ``["item", "property"]``)
+        :type entity_types: list(str)
+        :return: Generator yielding the return values of ``map_fn`` (unordered)
+        :rtype: generator
+        """
+        return map_dump(self, path, map_fn, processes=processes, entity_types=entity_types)
+
+    def map_reduce_dump(
+        self, path, map_fn, reduce_fn, initial=None, processes=None, entity_types=None
+    ):
+        """Apply the map function to all entities of a Wikibase JSON dump using a pool of worker
+        processes and combine the results using the reduce function (see
+        :meth:`PyWikibase.map_reduce_dump`). The worker processes use the synchronous
+        ``PyWikibase`` class
+
+        :param path: Path of the dump file
+        :type path: str
+        :param map_fn: Picklable function which is called with every entity and returns the value
+            to reduce (or ``None`` to skip the entity)
+        :type map_fn: function
+        :param reduce_fn: Picklable, associative and commutative function which combines two
+            values into one
+        :type reduce_fn: function
+        :param initial: Value to combine the first result with
+        :type initial: any
+        :param processes: Number of worker processes (default: number of CPUs)
+        :type processes: int
+        :param entity_types: Types of entities to process (default: ``["item", "property"]``)
+        :type entity_types: list(str)
+        :return: Reduced value
+        :rtype: any
+        """
+        return map_reduce_dump(
+            self,
+            path,
+            map_fn,
+            reduce_fn,
+            initial=initial,
+            processes=processes,
+            entity_types=entity_types,
+        )
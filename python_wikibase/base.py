@@ -1,8 +1,57 @@
 from abc import ABC
 
 
-class Base(ABC):
+class Context:
+    """API wrapper, API and language shared by the data model objects. Instead of storing their own
+    references to these objects, all data model objects created by the same ``PyWikibase`` object
+    point to one shared context"""
+
+    __slots__ = ("py_wb", "api", "language")
+
     def __init__(self, py_wb, api, language):
         self.py_wb = py_wb
         self.api = api
         self.language = language
+
+
+def get_context(py_wb, api, language):
+    """Return the context shared by the objects created by ``py_wb``. A new context is only
+    created if the API or language differ from the ones of the previously used context
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param api: wikibase-api object
+    :type api: Wikibase
+    :param language: Language for searches and edits on Wikibase
+    :type language: str
+    :return: Shared context
+    :rtype: Context
+    """
+    context = getattr(py_wb, "context", None)
+    if context is None or context.api is not api or context.language != language:
+        context = Context(py_wb, api, language)
+        if py_wb is not None:
+            py_wb.context = context
+    return context
+
+
+class Base(ABC):
+    # Data model objects are created in large numbers (e.g. one Claim, Property and value per
+    # statement), so they use slots instead of instance dicts. Subclasses need to declare their
+    # attributes in ``__slots__`` as well
+    __slots__ = ("context",)
+
+    def __init__(self, py_wb, api, language):
+        self.context = get_context(py_wb, api, language)
+
+    @property
+    def py_wb(self):
+        return self.context.py_wb
+
+    @property
+    def api(self):
+        return self.context.api
+
+    @property
+    def language(self):
+        return self.context.language
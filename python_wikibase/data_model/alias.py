@@ -1,10 +1,15 @@
 from wikibase_api import ApiError
 
 from python_wikibase.base import Base
+from python_wikibase.data_model.edit_session import get_edit_session
+from python_wikibase.data_model.terms import get_set_aliases_params, unpack_aliases
+from python_wikibase.utils.cache import invalidate_entity
 from python_wikibase.utils.exceptions import EditError
 
 
 class Aliases(Base):
+    __slots__ = ("aliases", "item_id")
+
     def __init__(self, py_wb, api, language):
         super().__init__(py_wb, api, language)
         self.aliases = {}
@@ -49,14 +54,16 @@ class Aliases(Base):
         """
         if not language:
             language = self.language
+        if self._record_add(alias, language):
+            return
 
         try:
             r = self.api.alias.add(self.item_id, alias, language)
-            aliases = r["entity"]["aliases"]
-            for lang, alias_list in aliases.items():
-                self.aliases[lang] = [alias_item["value"] for alias_item in alias_list]
         except ApiError as e:
             raise EditError(f"Could not add alias: {e}") from None
+        aliases_data = r["entity"].get("aliases") or {}
+        unpack_aliases(self.aliases, aliases_data, aliases_data)
+        invalidate_entity(self.py_wb, self.item_id)
 
     def remove(self, alias, language=None):
         """Remove the provided alias in the specified language (or the entity's default)
@@ -68,9 +75,78 @@ class Aliases(Base):
         """
         if not language:
             language = self.language
+        if self._record_remove(alias, language):
+            return
 
         try:
             self.api.alias.remove(self.item_id, alias, language)
             self.aliases[language].remove(alias)
         except ApiError as e:
             raise EditError(f"Could not remove alias: {e}") from None
+        invalidate_entity(self.py_wb, self.item_id)
+
+    def update(self, add=None, remove=None, language=None):
+        """Add and remove multiple aliases in the specified language (or the entity's default)
+        using a single API request
+
+        :param add: Aliases to add
+        :type add: list(str)
+        :param remove: Aliases to remove
+        :type remove: list(str)
+        :param language: Language of the aliases
+        :type language: str
+        """
+        if not language:
+            language = self.language
+        add = list(add or [])
+        remove = list(remove or [])
+        if not add and not remove or self._record_update(add, remove, language):
+            return
+
+        try:
+            r = self.api.api.post(get_set_aliases_params(self.item_id, language, add, remove))
+        except ApiError as e:
+            raise EditError(f"Could not update aliases: {e}") from None
+        unpack_aliases(self.aliases, r["entity"].get("aliases") or {}, [language])
+        invalidate_entity(self.py_wb, self.item_id)
+
+    def _record_add(self, alias, language):
+        """Add the alias only locally if an edit session is active for the entity
+
+        :return: Whether the change has been recorded in an edit session
+        :rtype: bool
+        """
+        session = get_edit_session(self.py_wb, self.item_id)
+        if not session:
+            return False
+        self.aliases.setdefault(language, []).append(alias)
+        session.alias_added(alias, language)
+        return True
+
+    def _record_remove(self, alias, language):
+        """Remove the alias only locally if an edit session is active for the entity
+
+        :return: Whether the change has been recorded in an edit session
+        :rtype: bool
+        """
+        session = get_edit_session(self.py_wb, self.item_id)
+        if not session:
+            return False
+        self.aliases[language].remove(alias)
+        session.alias_removed(alias, language)
+        return True
+
+    def _record_update(self, add, remove, language):
+        """Add and remove the aliases only locally if an edit session is active for the entity
+
+        :return: Whether the changes have been recorded in an edit session
+        :rtype: bool
+        """
+        session = get_edit_session(self.py_wb, self.item_id)
+        if not session:
+            return False
+        for alias in remove:
+            self._record_remove(alias, language)
+        for alias in add:
+            self._record_add(alias, language)
+        return True
@@ -1,37 +1,45 @@
+import json
+
 from wikibase_api import ApiError
 
 from python_wikibase.base import Base
+from python_wikibase.data_model.collection import Collection, changing
+from python_wikibase.data_model.edit_session import get_claim_edit_session, get_edit_session
 from python_wikibase.data_model.entity import check_prop_param
-from python_wikibase.data_types.data_type import check_data_type, unmarshal_data_value
+from python_wikibase.data_model.property_types import resolve_data_type
+from python_wikibase.data_model.reference import new_snaks
+from python_wikibase.data_types.data_type import (
+    check_data_type,
+    marshal_snak,
+    unmarshal_data_value,
+)
+from python_wikibase.utils.cache import invalidate_claim_entity, invalidate_entity
+from python_wikibase.utils.chunks import chunks, unique
+from python_wikibase.utils.claim_ids import new_claim_id
+from python_wikibase.utils.concurrency import ThreadLocalApi, map_concurrently
 from python_wikibase.utils.exceptions import EditError
+from python_wikibase.utils.instrumentation import observe
+from python_wikibase.utils.lazy_dict import LazyDict
 
+# Maximum number of claims which can be removed with one "wbremoveclaims" request (limit of the
+# Wikibase API for users without the "apihighlimits" right). All claims removed by a request must
+# belong to the same entity
+MAX_CLAIMS_PER_REQUEST = 50
 
-class Claims(Base):
-    def __init__(self, py_wb, api, language):
-        super().__init__(py_wb, api, language)
-        self.item_id = None
-        self.claims = {}
-
-    def __getitem__(self, index):
-        return self.to_list()[index]
+# Ranks of statements
+RANKS = ["preferred", "normal", "deprecated"]
 
-    def __iter__(self):
-        return iter(self.to_list())
 
-    def __len__(self):
-        return len(self.to_list())
+class Claims(Collection):
+    __slots__ = ("item_id", "claims")
 
-    def _add_locally(self, claim):
-        """Save a newly created claim in the local collection
+    groups_attribute = "claims"
+    id_attribute = "claim_id"
 
-        :param claim: Claim to add locally
-        :type claim: Claim
-        """
-        prop_id = claim.property.entity_id
-        if prop_id in self.claims:
-            self.claims[prop_id].append(claim)
-        else:
-            self.claims[prop_id] = [claim]
+    def __init__(self, py_wb, api, language):
+        super().__init__(py_wb, api, language)
+        self.item_id = None
+        self.claims = LazyDict(self._unmarshal_claims)
 
     def _create(self, prop, value, snak_type):
         """Create the claim using the Wikibase API and save it in the local collection
@@ -45,22 +53,95 @@ class Claims(Base):
         :return: New claim
         :rtype: Claim
         """
-        # Create claim using API
-        try:
-            if value:
-                r = self.api.claim.add(
-                    self.item_id, prop.entity_id, value.marshal(), snak_type=snak_type
-                )
-            else:
-                r = self.api.claim.add(self.item_id, prop.entity_id, None, snak_type=snak_type)
-        except ApiError as e:
-            raise EditError(f"Could not create claim: {e}") from None
+        # Only create claim locally if an edit session is active
+        new_claim = self._record_create(prop, value, snak_type)
+        if new_claim:
+            return new_claim
 
-        # Save claim in local collection
+        # Create claim using API
+        value_marshalled = value.marshal() if value else None
+        with observe(self.py_wb) as observation:
+            try:
+                r = self._add_claim(prop, value_marshalled, snak_type)
+            except ApiError as e:
+                raise EditError(f"Could not create claim: {e}") from None
+            invalidate_entity(self.py_wb, self.item_id)
+
+            # Save claim in local collection
+            with observation.unmarshalling():
+                return self._unmarshal_created(r)
+
+    def _unmarshal_created(self, r):
+        """Save the claim returned by a "wbcreateclaim" request in the local collection
+
+        :param r: Response object
+        :type r: dict
+        :return: New claim
+        :rtype: Claim
+        """
         new_claim = self.py_wb.Claim().unmarshal(self.item_id, r["claim"])
         self._add_locally(new_claim)
         return new_claim
 
+    def _add_claim(self, prop, value_marshalled, snak_type):
+        """Make the API request creating the claim. If a retry policy is set and the request fails
+        with a transient error, the claim is only created again if it can't be found on the entity
+
+        :return: Response object
+        :rtype: dict
+        """
+
+        def add(value_marshalled):
+            return self.api.claim.add(
+                self.item_id, prop.entity_id, value_marshalled, snak_type=snak_type
+            )
+
+        def find_created():
+            r = self.api.api.get(get_claims_params(self.item_id, prop.entity_id))
+            return self._find_created(r, prop, value_marshalled, snak_type)
+
+        policy = self.py_wb.retry_policy
+        if policy is None:
+            return add(value_marshalled)
+        return policy.run(add, value_marshalled, idempotent=False, find_written=find_created)
+
+    def _find_created(self, r, prop, value_marshalled, snak_type):
+        """Look for a claim which has been created by a failed request in a "wbgetclaims" response,
+        i.e. a claim with the same property and value which isn't in the local collection
+
+        :param r: Response
+        :type r: dict
+        :return: Response object of the request which has created the claim (``None`` if no such
+            claim exists)
+        :rtype: dict
+        """
+        known_claim_ids = {claim.claim_id for claim in self.claims.get(prop.entity_id, [])}
+        for claim_dict in r["claims"].get(prop.entity_id, []):
+            main_snak = claim_dict["mainsnak"]
+            if claim_dict["id"] in known_claim_ids or main_snak["snaktype"] != snak_type:
+                continue
+            if (
+                snak_type == "value"
+                and unmarshal_data_value(self.py_wb, main_snak).marshal() != value_marshalled
+            ):
+                continue
+            return {"claim": claim_dict}
+        return None
+
+    def _record_create(self, prop, value, snak_type):
+        """Create the claim only locally if an edit session is active for the entity
+
+        :return: New claim (``None`` if no edit session is active)
+        :rtype: Claim
+        """
+        session = get_edit_session(self.py_wb, self.item_id)
+        if not session:
+            return None
+        new_claim = self.py_wb.Claim()._create_locally(self.item_id, prop, value, snak_type)
+        self._add_locally(new_claim)
+        session.claim_created(new_claim)
+        return new_claim
+
     def unmarshal(self, item_id, claims):
         """Parse API response and fill object with the provided information
 
@@ -75,14 +156,28 @@ class Claims(Base):
         self.item_id = item_id
 
         # Wikibase API returns claims as dict with properties as keys and lists of claims as values
-        # Loop over those properties and claim lists and add create a Claim object for each of them,
-        # then add them to the local collection
+        # The Claim objects for a property are only created when its claims are accessed for the
+        # first time (see _unmarshal_claims)
         for prop_id, claim_dicts in claims.items():
-            for claim_dict in claim_dicts:
-                claim = self.py_wb.Claim().unmarshal(self.item_id, claim_dict)
-                self._add_locally(claim)
+            if prop_id in self.claims:
+                self.claims[prop_id].extend(self._unmarshal_claims(claim_dicts))
+            else:
+                self.claims.set_raw(prop_id, claim_dicts)
+        self._reset_indexes()
         return self
 
+    def _unmarshal_claims(self, claim_dicts):
+        """Create Claim objects for the claims of a property
+
+        :param claim_dicts: List of claims provided by the Wikibase API
+        :type claim_dicts: list(dict)
+        :return: List of claims
+        :rtype: list(Claim)
+        """
+        return self._adopt(
+            [self.py_wb.Claim().unmarshal(self.item_id, claim_dict) for claim_dict in claim_dicts]
+        )
+
     def add(self, prop, value):
         """Create a new claim with the specified prop and value
 
@@ -94,6 +189,7 @@ class Claims(Base):
         :rtype: Claim
         """
         check_prop_param(prop)
+        resolve_data_type(self.py_wb, prop)
         check_data_type(value, prop)
         return self._create(prop, value, "value")
 
@@ -119,6 +215,71 @@ class Claims(Base):
         check_prop_param(prop)
         return self._create(prop, None, "somevalue")
 
+    def add_statement(self, prop, value, qualifiers=None, references=None, rank="normal"):
+        """Create a new claim with the specified prop and value together with its qualifiers and
+        references. The claim ID is generated locally, so the complete statement is saved with a
+        single "wbsetclaim" request (instead of one request for the claim and one for every
+        qualifier and reference)
+
+        :param prop: Property of the new claim
+        :type prop: Property
+        :param value: Value of the new claim
+        :type value: Value
+        :param qualifiers: Qualifiers of the new claim as a list of ``(prop, value)`` tuples
+        :type qualifiers: list(tuple(Property, Value))
+        :param references: References of the new claim. Every reference is either a
+            ``(prop, value)`` tuple or a list of ``(prop, value)`` tuples
+        :type references: list(tuple(Property, Value) or list(tuple(Property, Value)))
+        :param rank: Rank of the new claim (one of ``RANKS``)
+        :type rank: str
+        :return: New claim
+        :rtype: Claim
+        """
+        claim = new_statement(self.py_wb, self.item_id, prop, value, qualifiers, references, rank)
+
+        # Only create claim locally if an edit session is active
+        session = get_edit_session(self.py_wb, self.item_id)
+        if session:
+            self._add_locally(claim)
+            session.claim_created(claim)
+            return claim
+
+        set_statement(self.py_wb, self.api, claim)
+        self._add_locally(claim)
+        return claim
+
+    def add_statements(self, specs, max_workers=4):
+        """Create multiple claims (see :meth:`add_statement`). Because the claim IDs are generated
+        locally, the statements don't depend on each other and are saved using a pool of threads
+
+        :param specs: Data of the new claims. Every spec is a dict with the parameters of
+            :meth:`add_statement` (e.g. ``{"prop": prop, "value": value, "qualifiers": [(prop,
+            value)]}``)
+        :type specs: iterable(dict)
+        :param max_workers: Maximum number of concurrent requests
+        :type max_workers: int
+        :return: New claims (in the order of ``specs``)
+        :rtype: list(Claim)
+        """
+        claims = [new_statement(self.py_wb, self.item_id, **spec) for spec in specs]
+
+        # Only create claims locally if an edit session is active
+        session = get_edit_session(self.py_wb, self.item_id)
+        if session:
+            for claim in claims:
+                self._add_locally(claim)
+                session.claim_created(claim)
+            return claims
+
+        worker_apis = ThreadLocalApi(self.api)
+
+        def set_claim(claim):
+            return set_statement(self.py_wb, worker_apis.get(), claim)
+
+        for claim in map_concurrently(set_claim, claims, max_workers, ordered=True):
+            self._add_locally(claim)
+        return claims
+
     def remove(self, claim):
         """Delete the provided claim
 
@@ -129,43 +290,94 @@ class Claims(Base):
         """
         check_claim_param(claim)
 
+        # Only remove claim locally if an edit session is active
+        session = get_edit_session(self.py_wb, self.item_id)
+        if session:
+            self._remove_locally(claim)
+            session.claim_removed(claim.claim_id)
+            return self
+
         # Delete claim using API
         try:
             self.api.claim.remove(claim.claim_id)
         except ApiError as e:
             raise EditError(f"Could not remove claim: {e}") from None
+        invalidate_entity(self.py_wb, self.item_id)
 
         # Remove claim from local collection
-        prop_id = claim.property.entity_id
-        self.claims[prop_id] = [c for c in self.claims[prop_id] if not c.claim_id == claim.claim_id]
-        if len(self.claims[prop_id]) == 0:
-            del self.claims[prop_id]
-
+        self._remove_locally(claim)
         return self
 
-    def to_dict(self):
-        """Return the collection of claims as a dict
+    def remove_many(self, claims):
+        """Delete the provided claims, using one "wbremoveclaims" request for every
+        ``MAX_CLAIMS_PER_REQUEST`` claims. If a request fails, its claims are split up to find the
+        ones which can't be deleted, the others are deleted nevertheless
 
-        :return: Dict of claims
+        :param claims: Claims to delete (must belong to this entity)
+        :type claims: iterable(Claim)
+        :return: Dict mapping the IDs of the claims which couldn't be deleted to an ``EditError``
+            (empty if all claims have been deleted)
         :rtype: dict
         """
-        return self.claims
+        claims = self._check_claims(claims)
+
+        # Only remove claims locally if an edit session is active
+        session = get_edit_session(self.py_wb, self.item_id)
+        if session:
+            self._remove_many_locally(claims)
+            for claim in claims:
+                session.claim_removed(claim.claim_id)
+            return {}
+
+        # Delete claims using API
+        claim_ids = unique(claim.claim_id for claim in claims)
+        failures = remove_entity_claims(self.py_wb, self.api, self.item_id, claim_ids)
+
+        # Remove deleted claims from local collection
+        self._remove_many_locally([claim for claim in claims if claim.claim_id not in failures])
+        return failures
+
+    def _check_claims(self, claims):
+        """Check that the claims belong to this entity
+
+        :param claims: Claims to check
+        :type claims: iterable(Claim)
+        :return: List of claims
+        :rtype: list(Claim)
+        """
+        claims = list(claims)
+        for claim in claims:
+            check_claim_param(claim)
+            if claim.item_id != self.item_id:
+                raise ValueError(f"Claim {claim.claim_id} doesn't belong to {self.item_id}")
+        return claims
 
-    def to_list(self):
-        """Return the collection of claims as a list
+    def marshal(self):
+        """Return the collection of claims in the format used by the Wikibase API
 
         :return: List of claims
-        :rtype: list
+        :rtype: list(dict)
         """
-        claim_list = []
-        [claim_list.extend(claims) for prop, claims in self.claims.items()]
-        return claim_list
+        return [claim.marshal() for claim in self.to_list()]
 
 
 class Claim(Base):
+    __slots__ = (
+        "claim_id",
+        "collection",
+        "item_id",
+        "property",
+        "qualifiers",
+        "rank",
+        "references",
+        "snak_type",
+        "value",
+    )
+
     def __init__(self, py_wb, api, language):
         super().__init__(py_wb, api, language)
         self.claim_id = None
+        self.collection = None  # Claims collection holding the claim
         self.item_id = None
         self.property = None
         self.qualifiers = None
@@ -213,26 +425,333 @@ class Claim(Base):
 
         return self
 
+    def _create_locally(self, item_id, prop, value, snak_type):
+        """Fill object with the information about a new claim which hasn't been saved on Wikibase
+        yet. The claim ID is generated locally
+
+        :param item_id: ID of the item holding the claim
+        :type item_id: str
+        :param prop: Property of the new claim
+        :type prop: Property
+        :param value: Value of the new claim
+        :type value: Value
+        :param snak_type: Value type (one of ``["value", "novalue", "somevalue"]``)
+        :type snak_type: str
+        :return: self
+        :rtype: Claim
+        """
+        self.claim_id = new_claim_id(item_id)
+        self.item_id = item_id
+        self.property = self.py_wb.Property()
+        self.property.entity_id = prop.entity_id
+        self.property.data_type = prop.data_type
+        self.rank = "normal"
+        self.qualifiers = self.py_wb.Qualifiers().unmarshal(self.claim_id, {})
+        self.references = self.py_wb.References().unmarshal(self.claim_id, {})
+        self.snak_type = snak_type
+        self.value = value
+        return self
+
+    def unmarshal_ids(self, claim_data):
+        """Update the IDs of the claim and the hashes of its qualifiers and references with the
+        data returned by the Wikibase API after saving the claim
+
+        :param claim_data: Data about the claim provided by the Wikibase API
+        :type claim_data: dict
+        """
+        with changing(self):
+            self.claim_id = claim_data["id"]
+        qualifiers = self.qualifiers.to_dict()
+        for prop_id, qualifier_dicts in claim_data.get("qualifiers", {}).items():
+            for qualifier, qualifier_dict in zip(qualifiers.get(prop_id, []), qualifier_dicts):
+                with changing(qualifier):
+                    qualifier.qualifier_id = qualifier_dict["hash"]
+        references = self.references.to_list()
+        for reference, reference_dict in zip(references, claim_data.get("references", [])):
+            with changing(reference):
+                reference.reference_id = reference_dict["hash"]
+
+    def marshal(self):
+        """Return the claim in the format used by the Wikibase API
+
+        :return: Claim
+        :rtype: dict
+        """
+        claim_data = {
+            "id": self.claim_id,
+            "type": "statement",
+            "rank": self.rank,
+            "mainsnak": marshal_snak(self.property, self.value, self.snak_type),
+            "qualifiers": self.qualifiers.marshal(),
+            "references": self.references.marshal(),
+        }
+        if not self.claim_id:
+            del claim_data["id"]
+        return claim_data
+
+    def _record_update(self, value, snak_type):
+        """Update the claim only locally if an edit session is active for the entity
+
+        :return: Whether the change has been recorded in an edit session
+        :rtype: bool
+        """
+        session = get_claim_edit_session(self.py_wb, self.claim_id)
+        if not session:
+            return False
+        session.claim_changed(self.claim_id, self)
+        with changing(self):
+            self.value = value
+            self.snak_type = snak_type
+        return True
+
     def set_value(self, value):
+        resolve_data_type(self.py_wb, self.property)
         check_data_type(value, self.property)
-        try:
-            self.api.claim.update(self.claim_id, value.marshal(), snak_type="value")
-        except ApiError as e:
-            raise EditError(f"Could not update claim value: {e}") from None
+        self._update(value, "value")
 
     def set_no_value(self):
-        try:
-            self.api.claim.update(self.claim_id, None, snak_type="novalue")
-        except ApiError as e:
-            raise EditError(f"Could not update claim value: {e}") from None
+        self._update(None, "novalue")
 
     def set_some_value(self):
+        self._update(None, "somevalue")
+
+    def _update(self, value, snak_type):
+        """Replace the claim's value using the Wikibase API (or only locally if an edit session is
+        active for the entity)
+
+        :param value: New value
+        :type value: Value
+        :param snak_type: Value type (one of ``["value", "novalue", "somevalue"]``)
+        :type snak_type: str
+        """
+        if self._record_update(value, snak_type):
+            return
         try:
-            self.api.claim.update(self.claim_id, None, snak_type="somevalue")
+            self.api.claim.update(
+                self.claim_id, value.marshal() if value else None, snak_type=snak_type
+            )
         except ApiError as e:
             raise EditError(f"Could not update claim value: {e}") from None
+        invalidate_claim_entity(self.py_wb, self.claim_id)
 
 
 def check_claim_param(prop, param_name="claim"):
     if not isinstance(prop, Claim):
         raise ValueError(f"{param_name} parameter must be instance of Claim class")
+
+
+def get_claims_params(entity_id, prop_id):
+    return {"action": "wbgetclaims", "entity": entity_id, "property": prop_id}
+
+
+def new_statement(py_wb, entity_id, prop, value, qualifiers=None, references=None, rank="normal"):
+    """Create a claim with a locally generated ID together with its qualifiers and references,
+    without saving it on Wikibase
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param entity_id: ID of the entity holding the claim
+    :type entity_id: str
+    :param prop: Property of the claim
+    :type prop: Property
+    :param value: Value of the claim
+    :type value: Value
+    :param qualifiers: Qualifiers of the claim as a list of ``(prop, value)`` tuples
+    :type qualifiers: list(tuple(Property, Value))
+    :param references: References of the claim. Every reference is either a ``(prop, value)``
+        tuple or a list of ``(prop, value)`` tuples (for references with multiple snaks)
+    :type references: list(tuple(Property, Value) or list(tuple(Property, Value)))
+    :param rank: Rank of the claim (one of ``RANKS``)
+    :type rank: str
+    :return: New claim
+    :rtype: Claim
+    """
+    if rank not in RANKS:
+        raise ValueError(f"rank must be one of {RANKS}")
+    for snak_prop, snak_value in [(prop, value)] + list(qualifiers or []):
+        check_prop_param(snak_prop)
+        resolve_data_type(py_wb, snak_prop)
+        check_data_type(snak_value, snak_prop)
+    reference_snaks = [
+        new_snaks(py_wb, reference if isinstance(reference, list) else [reference])
+        for reference in references or []
+    ]
+
+    claim = py_wb.Claim()._create_locally(entity_id, prop, value, "value")
+    claim.rank = rank
+    for qualifier_prop, qualifier_value in qualifiers or []:
+        claim.qualifiers._add_locally(
+            py_wb.Qualifier()._create_locally(
+                claim.claim_id, qualifier_prop, qualifier_value, "value"
+            )
+        )
+    for snaks in reference_snaks:
+        claim.references._add_locally(py_wb.Reference()._create_locally(claim.claim_id, snaks))
+    return claim
+
+
+def set_statement(py_wb, api, claim):
+    """Save a complete claim (including its qualifiers and references) with a "wbsetclaim" request
+    and update the hashes of its qualifiers and references
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param api: wikibase-api object to use for the request
+    :type api: Wikibase
+    :param claim: Claim to save (with its ID set)
+    :type claim: Claim
+    :return: The saved claim
+    :rtype: Claim
+    """
+    with observe(py_wb) as observation:
+        try:
+            r = api.api.post(get_set_claim_params(claim))
+        except ApiError as e:
+            raise EditError(f"Could not create claim: {e}") from None
+        invalidate_entity(py_wb, claim.item_id)
+        with observation.unmarshalling():
+            claim.unmarshal_ids(r["claim"])
+    return claim
+
+
+def add_statements(py_wb, specs, max_workers=4, ordered=False):
+    """Create claims of multiple entities using a pool of threads (see :func:`set_statement`). The
+    claims aren't added to the local claim collections of the entities and edit sessions aren't
+    taken into account
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param specs: Data of the new claims. Every spec is a dict with the parameters of
+        :meth:`Claims.add_statement` and the ID of the entity (e.g. ``{"entity_id": "Q1",
+        "prop": prop, "value": value}``)
+    :type specs: iterable(dict)
+    :param max_workers: Maximum number of concurrent requests
+    :type max_workers: int
+    :param ordered: Whether claims should be yielded in the order of ``specs``
+    :type ordered: bool
+    :return: Generator yielding tuples of the form ``(spec, claim)``
+    :rtype: generator(tuple)
+    """
+    worker_apis = ThreadLocalApi(py_wb.api)
+
+    def set_claim(spec_claim):
+        spec, claim = spec_claim
+        return spec, set_statement(py_wb, worker_apis.get(), claim)
+
+    # The statements are created (and their properties' data types resolved) in the calling thread
+    spec_claims = ((spec, new_statement(py_wb, **spec)) for spec in specs)
+    yield from map_concurrently(set_claim, spec_claims, max_workers, ordered)
+
+
+def get_set_claim_params(claim):
+    return {"action": "wbsetclaim", "claim": json.dumps(claim.marshal())}
+
+
+def group_claims(claims):
+    """Group the claims by the entities holding them
+
+    :param claims: Claims to group
+    :type claims: iterable(Claim)
+    :return: Dict mapping entity IDs to lists of claims (without duplicate claim IDs)
+    :rtype: dict
+    """
+    grouped = {}
+    for claim in claims:
+        check_claim_param(claim)
+        grouped.setdefault(claim.item_id, {}).setdefault(claim.claim_id, claim)
+    return {entity_id: list(entity_claims.values()) for entity_id, entity_claims in grouped.items()}
+
+
+def split_claim_ids(claim_ids):
+    """Split the IDs of claims which couldn't be removed with one request into two halves
+
+    :param claim_ids: IDs of the claims
+    :type claim_ids: list(str)
+    :return: Tuple of two lists of claim IDs
+    :rtype: tuple
+    """
+    middle = len(claim_ids) // 2
+    return claim_ids[:middle], claim_ids[middle:]
+
+
+def remove_claim_ids(api, claim_ids):
+    """Remove claims of an entity with one "wbremoveclaims" request. Wikibase doesn't remove any of
+    the claims if one of them can't be removed, so the IDs are split up until the failing claims
+    are found
+
+    :param api: wikibase-api object to use for the requests
+    :type api: Wikibase
+    :param claim_ids: IDs of the claims (at most ``MAX_CLAIMS_PER_REQUEST``)
+    :type claim_ids: list(str)
+    :return: Dict mapping the IDs of the claims which couldn't be removed to an ``EditError``
+    :rtype: dict
+    """
+    try:
+        api.claim.remove(claim_ids)
+    except ApiError as e:
+        if len(claim_ids) == 1:
+            return {claim_ids[0]: EditError(f"Could not remove claim: {e}")}
+        failures = {}
+        for half in split_claim_ids(claim_ids):
+            failures.update(remove_claim_ids(api, half))
+        return failures
+    return {}
+
+
+def remove_entity_claims(py_wb, api, entity_id, claim_ids):
+    """Remove claims of an entity, using one "wbremoveclaims" request for every
+    ``MAX_CLAIMS_PER_REQUEST`` claims
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param api: wikibase-api object to use for the requests
+    :type api: Wikibase
+    :param entity_id: ID of the entity holding the claims
+    :type entity_id: str
+    :param claim_ids: IDs of the claims
+    :type claim_ids: list(str)
+    :return: Dict mapping the IDs of the claims which couldn't be removed to an ``EditError``
+    :rtype: dict
+    """
+    failures = {}
+    for claim_id_chunk in chunks(claim_ids, MAX_CLAIMS_PER_REQUEST):
+        failures.update(remove_claim_ids(api, claim_id_chunk))
+    if len(failures) < len(claim_ids):
+        invalidate_entity(py_wb, entity_id)
+    return failures
+
+
+def remove_claims(py_wb, claims, max_workers=4):
+    """Remove claims of multiple entities. The claims of different entities are removed using a
+    pool of threads (see :func:`remove_entity_claims`)
+
+    Claims of entities with an active edit session are only removed from the session's entity,
+    other entities' local claim collections aren't updated
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param claims: Claims to remove
+    :type claims: iterable(Claim)
+    :param max_workers: Maximum number of concurrent requests
+    :type max_workers: int
+    :return: Dict mapping the IDs of the claims which couldn't be removed to an ``EditError``
+    :rtype: dict
+    """
+    failures = {}
+    pending = []
+    for entity_id, entity_claims in group_claims(claims).items():
+        session = get_edit_session(py_wb, entity_id)
+        if session:
+            failures.update(session.entity.claims.remove_many(entity_claims))
+        else:
+            pending.append((entity_id, [claim.claim_id for claim in entity_claims]))
+
+    worker_apis = ThreadLocalApi(py_wb.api)
+
+    def remove_entity(entity_claim_ids):
+        entity_id, claim_ids = entity_claim_ids
+        return remove_entity_claims(py_wb, worker_apis.get(), entity_id, claim_ids)
+
+    for entity_failures in map_concurrently(remove_entity, pending, max_workers):
+        failures.update(entity_failures)
+    return failures
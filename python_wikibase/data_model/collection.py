@@ -0,0 +1,268 @@
+import json
+from contextlib import contextmanager
+
+from python_wikibase.base import Base
+
+
+@contextmanager
+def changing(obj):
+    """Context manager for changing the ID or value of a claim, qualifier or reference locally (e.g.
+    in an edit session). Only this object is re-indexed in the collection holding it
+
+    :param obj: Claim, qualifier or reference which is changed
+    :type obj: Claim or Qualifier or Reference
+    """
+    collection = obj.collection
+    if collection is None or collection.by_id is None:
+        yield
+        return
+    collection._unindex(obj)
+    try:
+        yield
+    finally:
+        collection._index(obj, reindex=True)
+
+
+def get_fingerprint(prop_id, value, snak_type="value"):
+    """Return a hashable representation of a snak, which is equal for snaks with equal values
+
+    :param prop_id: ID of the snak's property
+    :type prop_id: str
+    :param value: Value of the snak
+    :type value: Value
+    :param snak_type: Value type (one of ``["value", "novalue", "somevalue"]``)
+    :type snak_type: str
+    :return: Fingerprint
+    :rtype: tuple
+    """
+    if snak_type != "value":
+        return prop_id, snak_type, None
+    return prop_id, snak_type, json.dumps(value.marshal(), sort_keys=True)
+
+
+class Collection(Base):
+    """Base class of the collections of claims, qualifiers and references. The objects are stored
+    grouped by property (in the dict named ``groups_attribute``)
+
+    A flat list of the objects and indexes by ID and by value are built when they are needed for
+    the first time. Objects added, removed or changed locally update the indexes instead of
+    invalidating them, so positional access, ``len()`` and lookups by ID or value don't need to go
+    through all objects again. Every object references the collection holding it (in its
+    ``collection`` attribute), so changes to it can be re-indexed (see ``changing``)"""
+
+    __slots__ = ("flat", "by_id", "by_value")
+
+    # Name of the dict mapping property IDs to lists of objects
+    groups_attribute = None
+
+    # Name of the objects' ID attribute
+    id_attribute = None
+
+    def __init__(self, py_wb, api, language):
+        super().__init__(py_wb, api, language)
+        self._reset_indexes()
+
+    def __getitem__(self, index):
+        return self._get_flat()[index]
+
+    def __iter__(self):
+        # Iterate over a copy so objects can be removed while iterating
+        return iter(list(self._get_flat()))
+
+    def __len__(self):
+        return len(self._get_flat())
+
+    @property
+    def groups(self):
+        return getattr(self, self.groups_attribute)
+
+    def _reset_indexes(self):
+        self.flat = None
+        self.by_id = None
+        self.by_value = None
+
+    def _get_flat(self):
+        """Return the list of all objects (ordered by property)
+
+        :return: List of objects
+        :rtype: list
+        """
+        if self.flat is None:
+            self.flat = [obj for objs in self.groups.values() for obj in objs]
+        return self.flat
+
+    def _adopt(self, objs):
+        """Mark the objects as held by this collection
+
+        :param objs: Objects of the collection
+        :type objs: list
+        :return: Objects
+        :rtype: list
+        """
+        for obj in objs:
+            obj.collection = self
+        return objs
+
+    def _build_indexes(self):
+        """Build the indexes by ID and by value if they don't exist"""
+        if self.by_id is not None:
+            return
+        self.by_id = {}
+        self.by_value = {}
+        for obj in self._get_flat():
+            self._index(obj, in_order=True)
+
+    def _get_fingerprints(self, obj):
+        """Return the fingerprints the object is indexed by value with
+
+        :param obj: Object of the collection
+        :type obj: Base
+        :return: Fingerprints (see ``get_fingerprint``)
+        :rtype: list(tuple)
+        """
+        return [get_fingerprint(obj.property.entity_id, obj.value, obj.snak_type)]
+
+    def _index(self, obj, reindex=False, in_order=False):
+        # Objects created in edit sessions don't have an ID until the session is saved
+        obj_id = getattr(obj, self.id_attribute)
+        if obj_id is not None:
+            self.by_id[obj_id] = obj
+        prop_id = obj.property.entity_id
+        positions = None
+        for fingerprint in self._get_fingerprints(obj):
+            same_value = self.by_value.setdefault(fingerprint, [])
+            same_value.append(obj)
+
+            # New objects are always the last ones of their property, so they are appended in the
+            # order of the collection if they are indexed by that property. A changed object (or an
+            # object indexed by another property) needs to be moved to its position
+            if in_order or len(same_value) < 2 or not reindex and fingerprint[0] == prop_id:
+                continue
+            if positions is None:
+                positions = {id(o): i for i, o in enumerate(self._get_flat())}
+            same_value.sort(key=lambda o: positions[id(o)])
+
+    def _unindex(self, obj):
+        obj_id = getattr(obj, self.id_attribute)
+        if self.by_id.get(obj_id) is obj:
+            del self.by_id[obj_id]
+        for fingerprint in self._get_fingerprints(obj):
+            same_value = [o for o in self.by_value.get(fingerprint, []) if o is not obj]
+            if same_value:
+                self.by_value[fingerprint] = same_value
+            else:
+                self.by_value.pop(fingerprint, None)
+
+    def _add_locally(self, obj):
+        """Save a newly created object in the local collection
+
+        :param obj: Object to add locally
+        :type obj: Base
+        """
+        obj.collection = self
+        prop_id = obj.property.entity_id
+        groups = self.groups
+
+        # The object is appended to the flat list if its group is the last one (otherwise, the list
+        # is rebuilt when it is needed). New groups are added at the end, the last existing group
+        # is the one of the flat list's last object
+        if self.flat is not None:
+            if prop_id not in groups or (self.flat and self.flat[-1].property.entity_id == prop_id):
+                self.flat.append(obj)
+            else:
+                self.flat = None
+        if prop_id in groups:
+            groups[prop_id].append(obj)
+        else:
+            groups[prop_id] = [obj]
+        if self.by_id is not None:
+            self._index(obj)
+
+    def _remove_locally(self, obj):
+        """Remove the object from the local collection
+
+        :param obj: Object to remove locally
+        :type obj: Base
+        """
+        self._remove_many_locally([obj])
+
+    def _remove_many_locally(self, objs):
+        """Remove the objects from the local collection (in a single pass over every affected
+        property)
+
+        :param objs: Objects to remove locally
+        :type objs: list
+        """
+        # Objects are matched by identity, or by ID if they have one (so a claim fetched again can
+        # be used to remove it). Objects created in edit sessions don't have an ID yet
+        objs_by_prop = {}
+        for obj in objs:
+            obj_ids, obj_identities = objs_by_prop.setdefault(
+                obj.property.entity_id, (set(), set())
+            )
+            obj_identities.add(id(obj))
+            obj_id = getattr(obj, self.id_attribute)
+            if obj_id is not None:
+                obj_ids.add(obj_id)
+        groups = self.groups
+        removed = []
+        for prop_id, (obj_ids, obj_identities) in objs_by_prop.items():
+            remaining = []
+            for obj in groups.get(prop_id, []):
+                obj_id = getattr(obj, self.id_attribute)
+                if id(obj) in obj_identities or (obj_id is not None and obj_id in obj_ids):
+                    removed.append(obj)
+                else:
+                    remaining.append(obj)
+            if remaining:
+                groups[prop_id] = remaining
+            elif prop_id in groups:
+                del groups[prop_id]
+
+        # The flat list is rebuilt when it is needed, the indexes are updated
+        self.flat = None
+        for obj in removed:
+            obj.collection = None
+            if self.by_id is not None:
+                self._unindex(obj)
+
+    def get_by_id(self, obj_id):
+        """Return the object with the specified ID
+
+        :param obj_id: ID of the object (claim ID or hash of the qualifier/reference)
+        :type obj_id: str
+        :return: Object (``None`` if the collection doesn't contain an object with the ID)
+        """
+        self._build_indexes()
+        return self.by_id.get(obj_id)
+
+    def find(self, prop, value=None):
+        """Return the objects with the specified property (and value)
+
+        :param prop: Property of the objects
+        :type prop: Property
+        :param value: Value of the objects (default: all objects with the property)
+        :type value: Value
+        :return: List of objects
+        :rtype: list
+        """
+        if value is None:
+            return list(self.groups.get(prop.entity_id, []))
+        self._build_indexes()
+        return list(self.by_value.get(get_fingerprint(prop.entity_id, value), []))
+
+    def to_dict(self):
+        """Return the collection as a dict mapping property IDs to lists of objects
+
+        :return: Dict of objects
+        :rtype: dict
+        """
+        return self.groups
+
+    def to_list(self):
+        """Return the collection as a list
+
+        :return: List of objects
+        :rtype: list
+        """
+        return list(self._get_flat())
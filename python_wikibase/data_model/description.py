@@ -1,12 +1,14 @@
-import json
-
 from wikibase_api import ApiError
 
 from python_wikibase.base import Base
-from python_wikibase.utils.exceptions import DuplicateError, EditError
+from python_wikibase.data_model.edit_session import get_edit_session
+from python_wikibase.data_model.terms import get_terms_content, raise_term_error, unpack_terms
+from python_wikibase.utils.cache import invalidate_entity
 
 
 class Description(Base):
+    __slots__ = ("item_id", "descriptions")
+
     def __init__(self, py_wb, api, language):
         super().__init__(py_wb, api, language)
         self.descriptions = {}
@@ -45,19 +47,58 @@ class Description(Base):
         """
         if not language:
             language = self.language
+        if self._record_set(description, language):
+            return
 
         try:
             r = self.api.description.set(self.item_id, description, language)
-            self.descriptions[language] = r["entity"]["descriptions"][language]["value"]
         except ApiError as e:
-            r_dict = json.loads(str(e))
-            if (
-                "messages" in r_dict
-                and r_dict["messages"][0]["name"]
-                == "wikibase-validator-label-with-description-conflict"
-            ):
-                raise DuplicateError(
-                    "Another entity with the same label and description already exists"
-                ) from None
-            else:
-                raise EditError(f"Could not update description: {e}") from None
+            raise_term_error(e, "Could not update description")
+        unpack_terms(self.descriptions, r["entity"].get("descriptions") or {}, [language])
+        invalidate_entity(self.py_wb, self.item_id)
+
+    def set_many(self, descriptions):
+        """Update the entity's descriptions in multiple languages using a single API request
+
+        :param descriptions: Dict mapping languages to descriptions (``None`` removes the
+            description in the language)
+        :type descriptions: dict
+        """
+        if not descriptions or self._record_set_many(descriptions):
+            return
+
+        try:
+            r = self.api.entity.update(self.item_id, get_terms_content(descriptions=descriptions))
+        except ApiError as e:
+            raise_term_error(e, "Could not update descriptions")
+        unpack_terms(self.descriptions, r["entity"].get("descriptions") or {}, descriptions)
+        invalidate_entity(self.py_wb, self.item_id)
+
+    def _record_set(self, description, language):
+        """Update the description only locally if an edit session is active for the entity
+
+        :return: Whether the change has been recorded in an edit session
+        :rtype: bool
+        """
+        session = get_edit_session(self.py_wb, self.item_id)
+        if not session:
+            return False
+        if description is None:
+            self.descriptions.pop(language, None)
+        else:
+            self.descriptions[language] = description
+        session.description_changed(language, description)
+        return True
+
+    def _record_set_many(self, descriptions):
+        """Update the descriptions only locally if an edit session is active for the entity
+
+        :return: Whether the changes have been recorded in an edit session
+        :rtype: bool
+        """
+        session = get_edit_session(self.py_wb, self.item_id)
+        if not session:
+            return False
+        for language, description in descriptions.items():
+            self._record_set(description, language)
+        return True
@@ -0,0 +1,222 @@
+import inspect
+
+from python_wikibase.data_model.terms import marshal_aliases, marshal_terms
+from python_wikibase.utils.claim_ids import claim_id_to_entity_id
+
+
+def get_edit_session(py_wb, entity_id):
+    """Return the active edit session of the specified entity (or ``None`` if there is none)
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param entity_id: ID of the entity (e.g. "Q1")
+    :type entity_id: str
+    :return: Edit session
+    :rtype: EditSession
+    """
+    if entity_id is None:
+        return None
+    return py_wb.edit_sessions.get(entity_id)
+
+
+def get_claim_edit_session(py_wb, claim_id):
+    """Return the active edit session of the entity holding the specified claim (or ``None`` if
+    there is none)
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param claim_id: ID of the claim (e.g. ``"Q1$8C67587E-79D5-4E8C-972C-A3C5F7ED06B3"``)
+    :type claim_id: str
+    :return: Edit session
+    :rtype: EditSession
+    """
+    if claim_id is None:
+        return None
+    return get_edit_session(py_wb, claim_id_to_entity_id(claim_id))
+
+
+def claim_contains(claim, obj):
+    """Return whether the object is the claim, its qualifier or reference collection, or one of
+    its qualifiers or references
+
+    :param claim: Claim
+    :type claim: Claim
+    :param obj: Object to look for
+    :type obj: Claim or Qualifiers or References or Qualifier or Reference
+    :return: Whether the claim contains the object
+    :rtype: bool
+    """
+    if obj is claim or obj is claim.qualifiers or obj is claim.references:
+        return True
+    return any(item is obj for item in claim.qualifiers) or any(
+        item is obj for item in claim.references
+    )
+
+
+class EditSession:
+    """Collection of the changes made to an entity while its edit session is active (see
+    :meth:`Entity.edit_session`). Can be used as a context manager, which saves the changes when
+    the ``with`` block is left without an exception. Sessions of ``AsyncPyWikibase`` entities must
+    be used with ``async with``"""
+
+    def __init__(self, entity):
+        self.entity = entity
+        self.labels = {}  # Language -> new label (``None`` removes the label)
+        self.descriptions = {}  # Language -> new description (``None`` removes the description)
+        self.aliases_added = {}
+        self.aliases_removed = {}
+        self.aliases_replaced = {}  # Only used if the entity's aliases haven't been fetched
+        self.claims = {}
+        self.new_claim_ids = set()
+        self.removed_claim_ids = []
+
+    def __enter__(self):
+        if self._is_async():
+            raise TypeError("Use `async with` for the edit sessions of asynchronous entities")
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.entity.save()
+        else:
+            self.entity.discard()
+
+    async def __aenter__(self):
+        if not self._is_async():
+            raise TypeError("Use `with` for the edit sessions of synchronous entities")
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            await self.entity.save()
+        else:
+            self.entity.discard()
+
+    def _is_async(self):
+        """Return whether the session's entity belongs to an ``AsyncPyWikibase`` object (whose
+        ``save`` function is a coroutine)"""
+        return inspect.iscoroutinefunction(self.entity.save)
+
+    # Recording of changes
+
+    def label_changed(self, language, label):
+        self.labels[language] = label
+
+    def description_changed(self, language, description):
+        self.descriptions[language] = description
+
+    def aliases_replaced_with(self, alias_list, language):
+        """Replace all aliases in the language. Used if the entity's aliases haven't been fetched,
+        so the aliases to add and remove can't be determined"""
+        self.aliases_replaced[language] = alias_list
+
+    def alias_added(self, alias, language):
+        removed = self.aliases_removed.get(language, [])
+        if alias in removed:
+            removed.remove(alias)
+        else:
+            self.aliases_added.setdefault(language, []).append(alias)
+
+    def alias_removed(self, alias, language):
+        added = self.aliases_added.get(language, [])
+        if alias in added:
+            added.remove(alias)
+        else:
+            self.aliases_removed.setdefault(language, []).append(alias)
+
+    def claim_created(self, claim):
+        self.claims[claim.claim_id] = claim
+        self.new_claim_ids.add(claim.claim_id)
+
+    def claim_changed(self, claim_id, changed):
+        """Mark the claim as changed (e.g. because its value, qualifiers or references have been
+        modified), so it is sent to Wikibase when the session is saved. Must be called before the
+        change is made locally
+
+        The session saves the claims of its entity object. Changes to objects which don't belong to
+        it (e.g. to a claim of another object fetched for the same entity) would be lost, so they
+        raise an error
+
+        :param claim_id: ID of the changed claim
+        :type claim_id: str
+        :param changed: Changed object (the claim, its qualifier or reference collection, or one of
+            its qualifiers or references)
+        :type changed: Claim or Qualifiers or References or Qualifier or Reference
+        """
+        entity_id = self.entity.entity_id
+        if self.entity.claims is None:
+            raise ValueError(
+                f"The claims of {entity_id} haven't been fetched, so changes to them can't be "
+                f"recorded in its edit session"
+            )
+        claim = self.claims.get(claim_id) or self.entity.claims.get_by_id(claim_id)
+        if claim is None or not claim_contains(claim, changed):
+            raise ValueError(
+                f"The changed claim {claim_id} doesn't belong to the {self.entity.entity_type} "
+                f"object of the edit session of {entity_id}. Make the change on the object the "
+                f"session has been started for"
+            )
+        self.claims[claim_id] = claim
+
+    def claim_removed(self, claim_id):
+        self.claims.pop(claim_id, None)
+        if claim_id in self.new_claim_ids:
+            self.new_claim_ids.remove(claim_id)
+        else:
+            self.removed_claim_ids.append(claim_id)
+
+    # Serialization
+
+    def marshal(self):
+        """Return all recorded changes as content for a "wbeditentity" request
+
+        :return: Content of the edit (empty if nothing has been changed)
+        :rtype: dict
+        """
+        content = {}
+
+        # Labels and descriptions
+        if self.labels:
+            content["labels"] = marshal_terms(self.labels)
+        if self.descriptions:
+            content["descriptions"] = marshal_terms(self.descriptions)
+
+        # Aliases
+        aliases = marshal_aliases(self.aliases_replaced, {})
+        for language, alias_list in self.aliases_added.items():
+            aliases += [{"language": language, "value": a, "add": ""} for a in alias_list]
+        for language, alias_list in self.aliases_removed.items():
+            aliases += [{"language": language, "value": a, "remove": ""} for a in alias_list]
+        if aliases:
+            content["aliases"] = aliases
+
+        # Claims
+        claims = [claim.marshal() for claim in self.claims.values()]
+        claims += [{"id": claim_id, "remove": ""} for claim_id in self.removed_claim_ids]
+        if claims:
+            content["claims"] = claims
+
+        return content
+
+    def unmarshal(self, entity):
+        """Update the entity's local data with the "wbeditentity" response after saving the
+        session (e.g. to store the hashes of new qualifiers and references)
+
+        :param entity: Data about the entity provided by the Wikibase API
+        :type entity: dict
+        """
+        entity_id = self.entity.entity_id
+        if self.entity.label is not None:
+            self.entity.label.unmarshal(entity_id, entity.get("labels") or {})
+        if self.entity.description is not None:
+            self.entity.description.unmarshal(entity_id, entity.get("descriptions") or {})
+        if self.entity.aliases is not None:
+            self.entity.aliases.unmarshal(entity_id, entity.get("aliases") or {})
+
+        claims_data = {}
+        for claim_list in (entity.get("claims") or {}).values():
+            for claim_data in claim_list:
+                claims_data[claim_data["id"]] = claim_data
+        for claim_id, claim in self.claims.items():
+            if claim_id in claims_data:
+                claim.unmarshal_ids(claims_data[claim_id])
@@ -1,11 +1,40 @@
 from wikibase_api import ApiError
 
+from python_wikibase.data_model.edit_session import EditSession, get_edit_session
+from python_wikibase.data_model.terms import (
+    get_terms_content,
+    raise_term_error,
+    unpack_aliases,
+    unpack_terms,
+)
+from python_wikibase.utils.cache import invalidate_entity
+from python_wikibase.utils.chunks import chunks, unique
 from python_wikibase.utils.data_types import class_to_data_type, data_type_to_class
 from python_wikibase.utils.exceptions import EditError, NotFoundError, SearchError
+from python_wikibase.utils.instrumentation import observe
 from python_wikibase.value import Value
 
+# Maximum number of entity IDs the Wikibase API accepts in a single "wbgetentities" request
+MAX_ENTITIES_PER_REQUEST = 50
+
+# Parts of an entity which can be requested separately (see the "props" parameter of Entity.get())
+ENTITY_PROPS = ["labels", "descriptions", "aliases", "claims"]
+
 
 class Entity(Value):
+    __slots__ = (
+        "entity_type",
+        "entity_id",
+        "revision_id",
+        "loaded_props",
+        "loaded_languages",
+        "label",
+        "description",
+        "aliases",
+        "claims",
+        "data_type",
+    )
+
     def __init__(self, py_wb, api, language, entity_type):
         """Wikibase entity (item or property)
 
@@ -18,6 +47,9 @@ class Entity(Value):
         """
         self.entity_type = entity_type
         self.entity_id = None
+        self.revision_id = None  # ID of the entity's revision the local data is based on
+        self.loaded_props = None  # Parts of the entity which have been fetched (None: all)
+        self.loaded_languages = None  # Languages of the fetched labels etc. (None: all)
         self.label = None
         self.description = None
         self.aliases = None
@@ -29,40 +61,143 @@ class Entity(Value):
     def marshal(self):
         return {"entity-type": self.entity_type, "numeric-id": int(self.entity_id[1:])}
 
-    def _create(self, content):
+    def _marshal_new(self, label, description=None, aliases=None, claims=None):
+        """Return the content for creating a new entity with the specified data
+
+        :param label: Label of the new entity
+        :type label: str
+        :param description: Description of the new entity
+        :type description: str
+        :param aliases: Aliases of the new entity
+        :type aliases: list(str)
+        :param claims: Claims of the new entity
+        :type claims: list(tuple(Property, Value))
+        :return: Content of the new entity
+        :rtype: dict
+        """
+        content = {"labels": {self.language: {"language": self.language, "value": label}}}
+        if description:
+            content["descriptions"] = {
+                self.language: {"language": self.language, "value": description}
+            }
+        if aliases:
+            content["aliases"] = {
+                self.language: [{"language": self.language, "value": alias} for alias in aliases]
+            }
+        if claims:
+            # Imported here because the data types and the property registry import this module
+            from python_wikibase.data_model.property_types import resolve_data_type
+            from python_wikibase.data_types.data_type import check_data_type, marshal_snak
+
+            content["claims"] = []
+            for prop, value in claims:
+                check_prop_param(prop)
+                resolve_data_type(self.py_wb, prop)
+                check_data_type(value, prop)
+                content["claims"].append(
+                    {
+                        "type": "statement",
+                        "rank": "normal",
+                        "mainsnak": marshal_snak(prop, value, "value"),
+                    }
+                )
+        return content
+
+    def _create(self, content, api=None):
         """Create a new entity with the specified label and content
 
         :param content: Content of the new entity
         :type content: dict
+        :param api: wikibase-api object to use for the request (default: the entity's)
+        :type api: Wikibase
         :return: self
         :rtype: Entity
         """
+        if api is None:
+            api = self.api
+
         # Create entity
-        try:
-            r = self.api.entity.add(self.entity_type, content)
-        except ApiError as e:
-            raise EditError(f"Could not create {self.entity_type}: {e}") from None
-        entity = r["entity"]
+        with observe(self.py_wb) as observation:
+            try:
+                r = api.entity.add(self.entity_type, content)
+            except ApiError as e:
+                raise EditError(f"Could not create {self.entity_type}: {e}") from None
+            with observation.unmarshalling():
+                return self._unmarshal_created(r["entity"])
 
-        # Save entity_id and label
+    def _unmarshal_created(self, entity):
+        """Fill object with the information about a newly created entity
+
+        :param entity: Data about the new entity provided by the Wikibase API
+        :type entity: dict
+        :return: self
+        :rtype: Entity
+        """
+        # Save entity_id, revision ID and label
         self.entity_id = entity["id"]
+        self.revision_id = entity.get("lastrevid")
         self.label = self.py_wb.Label().unmarshal(self.entity_id, entity["labels"])
 
-        # Save empty attributes
-        self.description = self.py_wb.Description().unmarshal(self.entity_id, {})
-        self.aliases = self.py_wb.Aliases().unmarshal(self.entity_id, {})
-        self.claims = self.py_wb.Claims().unmarshal(self.entity_id, {})
+        # Save other attributes (empty unless they were part of the new entity's content)
+        self.description = self.py_wb.Description().unmarshal(
+            self.entity_id, entity.get("descriptions") or {}
+        )
+        self.aliases = self.py_wb.Aliases().unmarshal(self.entity_id, entity.get("aliases") or {})
+        self.claims = self.py_wb.Claims().unmarshal(self.entity_id, entity.get("claims") or {})
 
         return self
 
-    def get(self, entity_id=None):
+    def get(self, entity_id=None, props=None, languages=None):
         """Fetch information about the specified entity from Wikibase
 
+        Only parts of the entity can be fetched using the ``props`` and ``languages`` parameters.
+        Attributes which haven't been requested are set to ``None``
+
         :param entity_id: ID of the entity on Wikibase (e.g. "Q1")
         :type entity_id: str
+        :param props: Parts of the entity to fetch (some of ``ENTITY_PROPS``, default: all)
+        :type props: list(str)
+        :param languages: Languages to fetch labels, descriptions and aliases in (default: all)
+        :type languages: list(str)
+        :return: self
+        :rtype: Entity
+        """
+        entity_id = self._check_entity_id(entity_id)
+        check_props(props)
+        if self._unmarshal_cached(entity_id, props, languages):
+            return self
+        with observe(self.py_wb) as observation:
+            try:
+                r = request_entities(self.api, [entity_id], props, languages)
+            except ApiError as e:
+                raise SearchError(f"Could not get {self.entity_type}: {e}") from None
+            with observation.unmarshalling():
+                return self._unmarshal_response(entity_id, r, props, languages)
+
+    def refresh(self):
+        """Update the entity with its current data on Wikibase. Only the ID of the entity's latest
+        revision is requested first, the full data is only fetched (and unmarshalled) if the entity
+        has been edited since it was fetched. Use :meth:`PyWikibase.refresh_entities` to refresh
+        multiple entities with as few API requests as possible
+
         :return: self
         :rtype: Entity
         """
+        entity_id = self._check_entity_id(None)
+        refreshed = refresh_entities(self.py_wb, [self])
+        if entity_id in refreshed and refreshed[entity_id] is None:
+            raise NotFoundError(f'No {self.entity_type} found with the entity_id "{entity_id}"')
+        return self
+
+    def _check_entity_id(self, entity_id):
+        """Return the entity ID to use for fetching the entity (the provided one or, if it's not
+        set, the entity's current ID)
+
+        :param entity_id: ID of the entity on Wikibase (e.g. "Q1")
+        :type entity_id: str
+        :return: Entity ID
+        :rtype: str
+        """
         if not entity_id:
             if not self.entity_id:
                 raise ValueError(
@@ -71,76 +206,398 @@ class Entity(Value):
                 )
             else:
                 entity_id = self.entity_id
+        return entity_id
 
-        try:
-            r = self.api.entity.get(entity_id)
-        except ApiError as e:
-            raise SearchError(f"Could not get {self.entity_type}: {e}") from None
+    def _unmarshal_cached(self, entity_id, props=None, languages=None):
+        """Fill object with the entity's data from the cache (if it has been cached)
+
+        :param entity_id: ID of the entity on Wikibase (e.g. "Q1")
+        :type entity_id: str
+        :param props: Parts of the entity to unmarshal (default: all)
+        :type props: list(str)
+        :param languages: Languages to unmarshal labels, descriptions and aliases in (default: all)
+        :type languages: list(str)
+        :return: Whether the entity has been found in the cache
+        :rtype: bool
+        """
+        if self.py_wb.cache is None:
+            return False
+        entity = self.py_wb.cache.get(entity_id)
+        if entity is None:
+            return False
+        self._check_entity_type(entity_id, entity)
+        self.unmarshal(entity, props, languages)
+        return True
+
+    def _unmarshal_response(self, entity_id, r, props=None, languages=None):
+        """Parse the "wbgetentities" response for a single entity and fill object with the provided
+        information
+
+        :param entity_id: ID of the requested entity
+        :type entity_id: str
+        :param r: Response of the Wikibase API
+        :type r: dict
+        :param props: Parts of the entity which have been requested (default: all)
+        :type props: list(str)
+        :param languages: Languages which have been requested (default: all)
+        :type languages: list(str)
+        :return: self
+        :rtype: Entity
+        """
         if "success" not in r or r["success"] != 1:
-            raise NotFoundError(
-                f'No {self.entity_type} found with the entity_id "{self.entity_id}"'
-            )
+            raise NotFoundError(f'No {self.entity_type} found with the entity_id "{entity_id}"')
 
         entity = r["entities"][entity_id]
         if "missing" in entity:
-            raise NotFoundError(
-                f'No {self.entity_type} found with the entity_id "{self.entity_id}"'
-            )
+            raise NotFoundError(f'No {self.entity_type} found with the entity_id "{entity_id}"')
+        self._check_entity_type(entity_id, entity)
+
+        if is_complete(props, languages) and self.py_wb.cache is not None:
+            self.py_wb.cache.set(entity_id, entity)
+        return self.unmarshal(entity, props, languages)
 
-        # Save entity_id and label
+    def _check_entity_type(self, entity_id, entity):
+        """Make sure that the fetched entity has the type of this object (e.g. that no property is
+        unmarshalled into an item)
+
+        :param entity_id: ID of the requested entity
+        :type entity_id: str
+        :param entity: Data about the entity provided by the Wikibase API
+        :type entity: dict
+        """
+        if entity.get("type", self.entity_type) != self.entity_type:
+            raise NotFoundError(f'No {self.entity_type} found with the entity_id "{entity_id}"')
+
+    def get_many(self, entity_ids, props=None, languages=None):
+        """Fetch information about multiple entities of this type from Wikibase. The entity IDs are
+        split up into batches so only one API request is made for every
+        ``MAX_ENTITIES_PER_REQUEST`` entities
+
+        :param entity_ids: IDs of the entities on Wikibase (e.g. ``["Q1", "Q2"]``)
+        :type entity_ids: list(str)
+        :param props: Parts of the entities to fetch (some of ``ENTITY_PROPS``, default: all)
+        :type props: list(str)
+        :param languages: Languages to fetch labels, descriptions and aliases in (default: all)
+        :type languages: list(str)
+        :return: Dict mapping every entity ID to the fetched entity (or to ``None`` if no entity
+            with the ID exists). ``NotFoundError`` is raised if one of the IDs belongs to an entity
+            of another type
+        :rtype: dict
+        """
+        check_props(props)
+        entity_data = fetch_entity_data(self.api, entity_ids, self.py_wb.cache, props, languages)
+        # The entities are requested while they are being unmarshalled (fetch_entity_data is a
+        # generator), the time spent in the API calls isn't counted as unmarshalling time
+        with observe(self.py_wb) as observation, observation.unmarshalling():
+            return self._unmarshal_many(entity_data, props, languages)
+
+    def _unmarshal_many(self, entity_data, props=None, languages=None):
+        """Create entities of this type from the provided entity data
+
+        :param entity_data: Tuples of the form ``(entity_id, entity_data)`` (see
+            :func:`fetch_entity_data`)
+        :type entity_data: iterable(tuple)
+        :param props: Parts of the entities to unmarshal (default: all)
+        :type props: list(str)
+        :param languages: Languages to unmarshal labels, descriptions and aliases in (default: all)
+        :type languages: list(str)
+        :return: Dict mapping every entity ID to the new entity (or to ``None`` if the entity
+            doesn't exist)
+        :rtype: dict
+        """
+        entities = {}
+        for entity_id, entity in entity_data:
+            if entity is None:
+                entities[entity_id] = None
+            else:
+                self._check_entity_type(entity_id, entity)
+                new_entity = self.__class__(self.py_wb, self.api, self.language)
+                entities[entity_id] = new_entity.unmarshal(entity, props, languages)
+        return entities
+
+    def unmarshal(self, entity, props=None, languages=None):
+        """Parse API response and fill object with the provided information
+
+        :param entity: Data about the entity provided by the Wikibase API
+        :type entity: dict
+        :param props: Parts of the entity to unmarshal (default: all). The attributes of all other
+            parts are set to ``None``
+        :type props: list(str)
+        :param languages: Languages to unmarshal labels, descriptions and aliases in (default: all)
+        :type languages: list(str)
+        :return: self
+        :rtype: Entity
+        """
+        # Save entity_id, revision ID and which parts of the entity are loaded
         self.entity_id = entity["id"]
-        self.label = self.py_wb.Label().unmarshal(self.entity_id, entity["labels"])
+        self.revision_id = entity.get("lastrevid")
+        self.loaded_props = None if props is None else list(props)
+        self.loaded_languages = None if languages is None else list(languages)
 
-        # Save data_type
+        # Save data_type (class name of the values, "UnknownValue" if there is no value class for
+        # the property's data type)
         if self.entity_type == "property":
-            self.data_type = data_type_to_class[entity["datatype"]]
+            self.data_type = data_type_to_class.get(entity["datatype"], "UnknownValue")
 
-        # Save other attributes
-        self.description = self.py_wb.Description().unmarshal(
-            self.entity_id, entity["descriptions"]
-        )
-        self.aliases = self.py_wb.Aliases().unmarshal(self.entity_id, entity["aliases"])
-        self.claims = self.py_wb.Claims().unmarshal(self.entity_id, entity["claims"])
+        # Save labels, descriptions and aliases
+        self.label = None
+        self.description = None
+        self.aliases = None
+        if props is None or "labels" in props:
+            labels = filter_languages(entity["labels"], languages)
+            self.label = self.py_wb.Label().unmarshal(self.entity_id, labels)
+        if props is None or "descriptions" in props:
+            descriptions = filter_languages(entity["descriptions"], languages)
+            self.description = self.py_wb.Description().unmarshal(self.entity_id, descriptions)
+        if props is None or "aliases" in props:
+            aliases = filter_languages(entity["aliases"], languages)
+            self.aliases = self.py_wb.Aliases().unmarshal(self.entity_id, aliases)
+
+        # Save claims
+        self.claims = None
+        if props is None or "claims" in props:
+            self.claims = self.py_wb.Claims().unmarshal(self.entity_id, entity["claims"])
+
+        return self
 
+    def set_terms(self, labels=None, descriptions=None, aliases=None):
+        """Update the entity's labels, descriptions and aliases in multiple languages using a
+        single API request (e.g. to add translations of the entity)
+
+        :param labels: Dict mapping languages to labels (``None`` removes the label)
+        :type labels: dict
+        :param descriptions: Dict mapping languages to descriptions (``None`` removes the
+            description)
+        :type descriptions: dict
+        :param aliases: Dict mapping languages to lists of aliases, which replace the current
+            aliases in these languages
+        :type aliases: dict
+        :return: self
+        :rtype: Entity
+        """
+        if self._record_terms(labels, descriptions, aliases):
+            return self
+        current_aliases = self.aliases.aliases if self.aliases is not None else {}
+        content = get_terms_content(labels, descriptions, aliases, current_aliases)
+        if not content:
+            return self
+
+        try:
+            r = self.api.entity.update(self.entity_id, content)
+        except ApiError as e:
+            raise_term_error(e, f"Could not update terms of {self.entity_type}")
+        invalidate_entity(self.py_wb, self.entity_id)
+        return self._unmarshal_terms(r["entity"], labels, descriptions, aliases)
+
+    def _record_terms(self, labels, descriptions, aliases):
+        """Update the labels, descriptions and aliases only locally if an edit session is active
+        for the entity
+
+        Terms which haven't been fetched (see the ``props`` parameter of :meth:`get`) are only
+        recorded in the session
+
+        :return: Whether the changes have been recorded in an edit session
+        :rtype: bool
+        """
+        session = get_edit_session(self.py_wb, self.entity_id)
+        if not session:
+            return False
+        for language, label in (labels or {}).items():
+            if self.label is None:
+                session.label_changed(language, label)
+            else:
+                self.label._record_set(label, language)
+        for language, description in (descriptions or {}).items():
+            if self.description is None:
+                session.description_changed(language, description)
+            else:
+                self.description._record_set(description, language)
+        for language, alias_list in (aliases or {}).items():
+            if self.aliases is None:
+                session.aliases_replaced_with(list(alias_list), language)
+                continue
+            current = self.aliases.get(language)
+            self.aliases._record_update(
+                [alias for alias in alias_list if alias not in current],
+                [alias for alias in current if alias not in alias_list],
+                language,
+            )
+        return True
+
+    def _unmarshal_terms(self, entity, labels, descriptions, aliases):
+        """Save the labels, descriptions and aliases returned by the Wikibase API after updating
+        them (only in the edited languages)
+
+        :param entity: Data about the entity provided by the Wikibase API
+        :type entity: dict
+        :return: self
+        :rtype: Entity
+        """
+        if labels and self.label is not None:
+            unpack_terms(self.label.labels, entity.get("labels") or {}, labels)
+        if descriptions and self.description is not None:
+            unpack_terms(
+                self.description.descriptions, entity.get("descriptions") or {}, descriptions
+            )
+        if aliases and self.aliases is not None:
+            unpack_aliases(self.aliases.aliases, entity.get("aliases") or {}, aliases)
         return self
 
+    def edit_session(self):
+        """Start an edit session for the entity. Until :meth:`save` is called, all changes to the
+        entity's label, description, aliases, claims, qualifiers and references are only made
+        locally. :meth:`save` then sends all of them to Wikibase in a single API request
+
+        The returned session can be used as a context manager, which saves the changes when the
+        ``with`` block is left::
+
+            with item.edit_session():
+                item.label.set("new label")
+                claim = item.claims.add(prop, value)
+                claim.qualifiers.add(prop, value)
+
+        :return: Edit session
+        :rtype: EditSession
+        """
+        if not self.entity_id:
+            raise ValueError(
+                f"You need to create or fetch the {self.entity_type} before being able to start an "
+                f"edit session"
+            )
+        session = EditSession(self)
+        self.py_wb.edit_sessions[self.entity_id] = session
+        return session
+
+    def save(self):
+        """Send all changes made during the entity's edit session to Wikibase (using a single API
+        request) and end the session. The session is also ended if saving fails, the local data is
+        not reset in this case (use :meth:`get` to fetch the entity's current data)
+
+        :return: self
+        :rtype: Entity
+        """
+        session = self._get_edit_session()
+        try:
+            content = session.marshal()
+            if content:
+                try:
+                    r = self.api.entity.update(self.entity_id, content)
+                except ApiError as e:
+                    raise EditError(f"Could not save {self.entity_type}: {e}") from None
+                invalidate_entity(self.py_wb, self.entity_id)
+                session.unmarshal(r["entity"])
+        finally:
+            del self.py_wb.edit_sessions[self.entity_id]
+        return self
+
+    def discard(self):
+        """End the entity's edit session without sending its changes to Wikibase. The local data is
+        not reset (use :meth:`get` to fetch the entity's current data)"""
+        self._get_edit_session()
+        del self.py_wb.edit_sessions[self.entity_id]
+
+    def _get_edit_session(self):
+        """Return the entity's active edit session
+
+        :return: Edit session
+        :rtype: EditSession
+        """
+        if self.entity_id not in self.py_wb.edit_sessions:
+            raise ValueError(f"No edit session has been started for the {self.entity_type}")
+        return self.py_wb.edit_sessions[self.entity_id]
+
     def delete(self):
         """Delete the entity from Wikibase"""
-        if self.entity_type == "item":
-            title = "Item:" + self.entity_id
-        else:
-            title = "Property:" + self.entity_id
         try:
-            self.api.entity.remove(title)
+            self.api.entity.remove(get_page_title(self.entity_type, self.entity_id))
         except ApiError as e:
             raise EditError(f"Could not delete {self.entity_type}: {e}") from None
+        invalidate_entity(self.py_wb, self.entity_id)
 
 
 class Item(Entity):
+    __slots__ = ()
+
     def __init__(self, py_wb, wb, language):
         super().__init__(py_wb, wb, language, "item")
 
-    def create(self, label):
-        content = {"labels": {self.language: {"language": self.language, "value": label}}}
-        return super()._create(content)
+    def create(self, label, description=None, aliases=None, claims=None):
+        """Create a new item with the specified data (using a single API request)
+
+        :param label: Label of the new item
+        :type label: str
+        :param description: Description of the new item
+        :type description: str
+        :param aliases: Aliases of the new item
+        :type aliases: list(str)
+        :param claims: Claims of the new item as a list of ``(prop, value)`` tuples
+        :type claims: list(tuple(Property, Value))
+        :return: self
+        :rtype: Item
+        """
+        return super()._create(self._marshal_new(label, description, aliases, claims))
 
 
 class Property(Entity):
+    __slots__ = ()
+
     def __init__(self, py_wb, wb, language):
         super().__init__(py_wb, wb, language, "property")
 
-    def create(self, label, data_type="StringValue"):
+    def _marshal_new(
+        self, label, data_type="StringValue", description=None, aliases=None, claims=None
+    ):
+        """Return the content for creating a new property with the specified data
+
+        :param label: Label of the new property
+        :type label: str
+        :param data_type: Name of the value class for the property's data type
+        :type data_type: str
+        :return: Content of the new property
+        :rtype: dict
+        """
         if data_type not in class_to_data_type.keys():
             raise ValueError(
                 f'"{data_type}" is not a valid value for data_type, must be one of must be one of '
                 f"{class_to_data_type.keys()}"
             )
         self.data_type = data_type
-        content = {
-            "labels": {self.language: {"language": self.language, "value": label}},
-            "datatype": class_to_data_type[data_type],
-        }
-        return super()._create(content)
+        content = super()._marshal_new(label, description, aliases, claims)
+        content["datatype"] = class_to_data_type[data_type]
+        return content
+
+    def create(self, label, data_type="StringValue", description=None, aliases=None, claims=None):
+        """Create a new property with the specified data (using a single API request)
+
+        :param label: Label of the new property
+        :type label: str
+        :param data_type: Name of the value class for the property's data type
+        :type data_type: str
+        :param description: Description of the new property
+        :type description: str
+        :param aliases: Aliases of the new property
+        :type aliases: list(str)
+        :param claims: Claims of the new property as a list of ``(prop, value)`` tuples
+        :type claims: list(tuple(Property, Value))
+        :return: self
+        :rtype: Property
+        """
+        return super()._create(self._marshal_new(label, data_type, description, aliases, claims))
+
+
+def get_page_title(entity_type, entity_id):
+    """Return the title of the wiki page holding the entity
+
+    :param entity_type: Type of the entity (``"item"`` or ``"property"``)
+    :type entity_type: str
+    :param entity_id: ID of the entity
+    :type entity_id: str
+    :return: Page title (e.g. ``"Item:Q1"``)
+    :rtype: str
+    """
+    if entity_type == "item":
+        return "Item:" + entity_id
+    return "Property:" + entity_id
 
 
 def check_item_param(prop, param_name="item"):
@@ -151,3 +608,353 @@ def check_item_param(prop, param_name="item"):
 def check_prop_param(prop, param_name="property"):
     if not isinstance(prop, Property):
         raise ValueError(f"{param_name} parameter must be instance of Property class")
+
+
+def check_props(props):
+    """Check whether all entity parts are valid values for the ``props`` parameter
+
+    :param props: Parts of an entity (``None`` for all parts)
+    :type props: list(str)
+    """
+    if props is None:
+        return
+    for prop in props:
+        if prop not in ENTITY_PROPS:
+            raise ValueError(
+                f'"{prop}" is not a valid value for props, must be one of {ENTITY_PROPS}'
+            )
+
+
+def is_complete(props, languages):
+    """Return whether entity data requested with the specified filters is complete (only complete
+    entity data is saved in the cache)
+
+    :param props: Requested parts of the entity (``None`` for all parts)
+    :type props: list(str)
+    :param languages: Requested languages (``None`` for all languages)
+    :type languages: list(str)
+    :return: Whether all data of the entity has been requested
+    :rtype: bool
+    """
+    return props is None and languages is None
+
+
+def filter_languages(terms, languages):
+    """Return only the labels/descriptions/aliases in the specified languages
+
+    :param terms: Dict of labels, descriptions or aliases provided by the Wikibase API
+    :type terms: dict
+    :param languages: Languages to keep (``None`` for all languages)
+    :type languages: list(str)
+    :return: Filtered dict
+    :rtype: dict
+    """
+    if languages is None:
+        return terms
+    return {language: value for language, value in terms.items() if language in languages}
+
+
+def request_entities(api, entity_ids, props=None, languages=None):
+    """Make a "wbgetentities" request for the specified entities. The request is made directly
+    (instead of using wikibase-api's ``entity.get()``, which sends the wrong value for the
+    ``languages`` parameter)
+
+    :param api: wikibase-api object to use for the request
+    :type api: Wikibase
+    :param entity_ids: IDs of the entities on Wikibase (e.g. ``["Q1", "P1"]``)
+    :type entity_ids: list(str)
+    :param props: Parts of the entities to fetch (some of ``ENTITY_PROPS``, default: all)
+    :type props: list(str)
+    :param languages: Languages to fetch labels, descriptions and aliases in (default: all)
+    :type languages: list(str)
+    :return: Response
+    :rtype: dict
+    """
+    params = {"action": "wbgetentities", "ids": "|".join(entity_ids)}
+    if props is not None:
+        # Page info (revision ID) and the data types of properties are always requested
+        params["props"] = "|".join(["info", "datatype"] + list(props))
+    if languages is not None:
+        params["languages"] = "|".join(languages)
+    return api.api.get(params)
+
+
+def fetch_entity_data(api, entity_ids, cache=None, props=None, languages=None):
+    """Fetch the data of multiple entities from Wikibase, using one "wbgetentities" request for
+    every ``MAX_ENTITIES_PER_REQUEST`` entities
+
+    :param api: wikibase-api object to use for the requests
+    :type api: Wikibase
+    :param entity_ids: IDs of the entities on Wikibase (e.g. ``["Q1", "P1"]``)
+    :type entity_ids: list(str)
+    :param cache: Entity cache to look up the entities in before requesting them (the fetched
+        entities are saved in it if they are complete)
+    :type cache: EntityCache
+    :param props: Parts of the entities to fetch (some of ``ENTITY_PROPS``, default: all)
+    :type props: list(str)
+    :param languages: Languages to fetch labels, descriptions and aliases in (default: all)
+    :type languages: list(str)
+    :return: Generator yielding tuples of the form ``(entity_id, entity_data)``. ``entity_data``
+        is ``None`` if no entity with the ID exists
+    :rtype: generator(tuple)
+    """
+    cache_fetched = cache if is_complete(props, languages) else None
+    for entity_id_chunk in chunks(unique(entity_ids), MAX_ENTITIES_PER_REQUEST):
+        cached, missing_ids = lookup_cached_entities(cache, entity_id_chunk)
+        if missing_ids:
+            try:
+                r = request_entities(api, missing_ids, props, languages)
+            except ApiError as e:
+                raise SearchError(f"Could not get entities: {e}") from None
+            cached.update(cache_entity_data(cache_fetched, unpack_entity_data(missing_ids, r)))
+        for entity_id in entity_id_chunk:
+            yield entity_id, cached[entity_id]
+
+
+def lookup_cached_entities(cache, entity_ids):
+    """Look up the entities in the cache
+
+    :param cache: Entity cache (``None`` if caching is disabled)
+    :type cache: EntityCache
+    :param entity_ids: IDs of the entities (e.g. ``["Q1", "P1"]``)
+    :type entity_ids: list(str)
+    :return: Tuple of the form ``(cached, missing_ids)``. ``cached`` maps the IDs of all cached
+        entities to their data, ``missing_ids`` lists the IDs of the ones which need to be fetched
+    :rtype: tuple(dict, list(str))
+    """
+    if cache is None:
+        return {}, list(entity_ids)
+    cached = {}
+    missing_ids = []
+    for entity_id in entity_ids:
+        entity = cache.get(entity_id)
+        if entity is None:
+            missing_ids.append(entity_id)
+        else:
+            cached[entity_id] = entity
+    return cached, missing_ids
+
+
+def cache_entity_data(cache, entity_data):
+    """Save the fetched entities in the cache
+
+    :param cache: Entity cache (``None`` if caching is disabled)
+    :type cache: EntityCache
+    :param entity_data: Tuples of the form ``(entity_id, entity_data)`` (see
+        :func:`unpack_entity_data`)
+    :type entity_data: list(tuple)
+    :return: The provided entity data
+    :rtype: list(tuple)
+    """
+    if cache is not None:
+        for entity_id, entity in entity_data:
+            if entity is not None:
+                cache.set(entity_id, entity)
+    return entity_data
+
+
+def unpack_entity_data(entity_ids, r):
+    """Extract the data of the requested entities from a "wbgetentities" response
+
+    :param entity_ids: IDs of the requested entities
+    :type entity_ids: list(str)
+    :param r: Response of the Wikibase API
+    :type r: dict
+    :return: List of tuples of the form ``(entity_id, entity_data)``. ``entity_data`` is ``None``
+        if no entity with the ID exists
+    :rtype: list(tuple)
+    """
+    if "success" not in r or r["success"] != 1:
+        raise SearchError(f"Could not get entities: {r}")
+
+    entity_data = []
+    for entity_id in entity_ids:
+        entity = r["entities"].get(entity_id)
+        if entity is None or "missing" in entity:
+            entity_data.append((entity_id, None))
+        else:
+            entity_data.append((entity_id, entity))
+    return entity_data
+
+
+def fetch_revision_ids(api, entity_ids):
+    """Fetch the IDs of the latest revisions of multiple entities, using one "wbgetentities"
+    request (which only returns the entities' page info) for every ``MAX_ENTITIES_PER_REQUEST``
+    entities
+
+    :param api: wikibase-api object to use for the requests
+    :type api: Wikibase
+    :param entity_ids: IDs of the entities on Wikibase (e.g. ``["Q1", "P1"]``)
+    :type entity_ids: list(str)
+    :return: Generator yielding tuples of the form ``(entity_id, revision_id)``. ``revision_id``
+        is ``None`` if no entity with the ID exists
+    :rtype: generator(tuple)
+    """
+    for entity_id_chunk in chunks(unique(entity_ids), MAX_ENTITIES_PER_REQUEST):
+        try:
+            r = api.entity.get(entity_id_chunk, attributes=["info"])
+        except ApiError as e:
+            raise SearchError(f"Could not get revision IDs: {e}") from None
+        yield from unpack_revision_ids(entity_id_chunk, r)
+
+
+def unpack_revision_ids(entity_ids, r):
+    """Extract the revision IDs of the requested entities from a "wbgetentities" response
+
+    :param entity_ids: IDs of the requested entities
+    :type entity_ids: list(str)
+    :param r: Response of the Wikibase API
+    :type r: dict
+    :return: List of tuples of the form ``(entity_id, revision_id)``. ``revision_id`` is ``None``
+        if no entity with the ID exists
+    :rtype: list(tuple)
+    """
+    return [
+        (entity_id, None if entity is None else entity["lastrevid"])
+        for entity_id, entity in unpack_entity_data(entity_ids, r)
+    ]
+
+
+def find_changed_entities(entities, revision_ids):
+    """Compare the revision IDs of the local entities with the ones on Wikibase
+
+    :param entities: Local entities, mapped by their IDs
+    :type entities: dict
+    :param revision_ids: Tuples of the form ``(entity_id, revision_id)`` (see
+        :func:`fetch_revision_ids`)
+    :type revision_ids: iterable(tuple)
+    :return: Tuple of the form ``(changed, deleted_ids)``. ``changed`` maps the IDs of all entities
+        which have been edited to their latest revision IDs, ``deleted_ids`` lists the IDs of all
+        entities which don't exist anymore
+    :rtype: tuple(dict, list(str))
+    """
+    changed = {}
+    deleted_ids = []
+    for entity_id, revision_id in revision_ids:
+        if revision_id is None:
+            deleted_ids.append(entity_id)
+        elif revision_id != entities[entity_id].revision_id:
+            changed[entity_id] = revision_id
+    return changed, deleted_ids
+
+
+def lookup_cached_revisions(cache, changed):
+    """Look up the changed entities in the cache. Cached data is only used if it belongs to the
+    entity's latest revision
+
+    :param cache: Entity cache (``None`` if caching is disabled)
+    :type cache: EntityCache
+    :param changed: Dict mapping the IDs of the changed entities to their latest revision IDs
+    :type changed: dict
+    :return: Tuple of the form ``(cached, missing_ids)`` (see :func:`lookup_cached_entities`)
+    :rtype: tuple(dict, list(str))
+    """
+    cached, missing_ids = lookup_cached_entities(cache, list(changed))
+    for entity_id, entity in list(cached.items()):
+        if entity.get("lastrevid") != changed[entity_id]:
+            del cached[entity_id]
+            missing_ids.append(entity_id)
+    return cached, missing_ids
+
+
+def refresh_entities(py_wb, entities):
+    """Update multiple entities with their current data on Wikibase. For every
+    ``MAX_ENTITIES_PER_REQUEST`` entities, the IDs of their latest revisions are requested first.
+    Only the entities which have been edited since they were fetched are then requested in full
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param entities: Entities to refresh (must have been fetched before)
+    :type entities: iterable(Entity)
+    :return: Dict mapping the IDs of all entities which have changed to the updated entity (or to
+        ``None`` if the entity has been deleted)
+    :rtype: dict
+    """
+    refreshed = {}
+    for entity_chunk in chunks(entities, MAX_ENTITIES_PER_REQUEST):
+        entities_by_id = {entity._check_entity_id(None): entity for entity in entity_chunk}
+        changed, deleted_ids = find_changed_entities(
+            entities_by_id, fetch_revision_ids(py_wb.api, list(entities_by_id))
+        )
+        for entity_id in deleted_ids:
+            refreshed[entity_id] = None
+
+        # Fetch full data of edited entities
+        cached, missing_ids = lookup_cached_revisions(py_wb.cache, changed)
+        if missing_ids:
+            cached.update(
+                cache_entity_data(py_wb.cache, list(fetch_entity_data(py_wb.api, missing_ids)))
+            )
+        for entity_id, entity in cached.items():
+            if entity is None:
+                refreshed[entity_id] = None
+            else:
+                refreshed_entity = entities_by_id[entity_id]
+                refreshed[entity_id] = refreshed_entity.unmarshal(
+                    entity, refreshed_entity.loaded_props, refreshed_entity.loaded_languages
+                )
+    return refreshed
+
+
+def new_entity(py_wb, entity_type):
+    """Create an empty entity object of the specified type
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param entity_type: One of ["item", "property"]
+    :type entity_type: str
+    :return: New entity
+    :rtype: Entity
+    """
+    if entity_type == "item":
+        return py_wb.Item()
+    elif entity_type == "property":
+        return py_wb.Property()
+    else:
+        raise NotImplementedError(f'Entity type "{entity_type}" is not supported')
+
+
+def get_entities(py_wb, entity_ids, props=None, languages=None):
+    """Fetch information about multiple entities (items and/or properties) from Wikibase
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param entity_ids: IDs of the entities on Wikibase (e.g. ``["Q1", "P1"]``)
+    :type entity_ids: list(str)
+    :param props: Parts of the entities to fetch (some of ``ENTITY_PROPS``, default: all)
+    :type props: list(str)
+    :param languages: Languages to fetch labels, descriptions and aliases in (default: all)
+    :type languages: list(str)
+    :return: Dict mapping every entity ID to the fetched entity (or to ``None`` if no entity with
+        the ID exists)
+    :rtype: dict
+    """
+    check_props(props)
+    entity_data = fetch_entity_data(py_wb.api, entity_ids, py_wb.cache, props, languages)
+    return unmarshal_entities(py_wb, entity_data, props, languages)
+
+
+def unmarshal_entities(py_wb, entity_data, props=None, languages=None):
+    """Create items and properties from the provided entity data
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param entity_data: Tuples of the form ``(entity_id, entity_data)`` (see
+        :func:`fetch_entity_data`)
+    :type entity_data: iterable(tuple)
+    :param props: Parts of the entities to unmarshal (default: all)
+    :type props: list(str)
+    :param languages: Languages to unmarshal labels, descriptions and aliases in (default: all)
+    :type languages: list(str)
+    :return: Dict mapping every entity ID to the new entity (or to ``None`` if the entity doesn't
+        exist)
+    :rtype: dict
+    """
+    entities = {}
+    for entity_id, entity in entity_data:
+        if entity is None:
+            entities[entity_id] = None
+        else:
+            new = new_entity(py_wb, entity["type"])
+            entities[entity_id] = new.unmarshal(entity, props, languages)
+    return entities
@@ -1,12 +1,14 @@
-import json
-
 from wikibase_api import ApiError
 
 from python_wikibase.base import Base
-from python_wikibase.utils.exceptions import DuplicateError, EditError
+from python_wikibase.data_model.edit_session import get_edit_session
+from python_wikibase.data_model.terms import get_terms_content, raise_term_error, unpack_terms
+from python_wikibase.utils.cache import invalidate_entity
 
 
 class Label(Base):
+    __slots__ = ("item_id", "labels")
+
     def __init__(self, py_wb, api, language):
         super().__init__(py_wb, api, language)
         self.item_id = None
@@ -45,19 +47,58 @@ class Label(Base):
         """
         if not language:
             language = self.language
+        if self._record_set(label, language):
+            return
 
         try:
             r = self.api.label.set(self.item_id, label, language)
-            self.labels[language] = r["entity"]["labels"][language]["value"]
         except ApiError as e:
-            r_dict = json.loads(str(e))
-            if (
-                "messages" in r_dict
-                and r_dict["messages"][0]["name"]
-                == "wikibase-validator-label-with-description-conflict"
-            ):
-                raise DuplicateError(
-                    "Another entity with the same label and description already exists"
-                ) from None
-            else:
-                raise EditError(f"Could not set label: {e}") from None
+            raise_term_error(e, "Could not set label")
+        unpack_terms(self.labels, r["entity"].get("labels") or {}, [language])
+        invalidate_entity(self.py_wb, self.item_id)
+
+    def set_many(self, labels):
+        """Update the entity's labels in multiple languages using a single API request
+
+        :param labels: Dict mapping languages to labels (``None`` removes the label in the
+            language)
+        :type labels: dict
+        """
+        if not labels or self._record_set_many(labels):
+            return
+
+        try:
+            r = self.api.entity.update(self.item_id, get_terms_content(labels=labels))
+        except ApiError as e:
+            raise_term_error(e, "Could not update labels")
+        unpack_terms(self.labels, r["entity"].get("labels") or {}, labels)
+        invalidate_entity(self.py_wb, self.item_id)
+
+    def _record_set(self, label, language):
+        """Update the label only locally if an edit session is active for the entity
+
+        :return: Whether the change has been recorded in an edit session
+        :rtype: bool
+        """
+        session = get_edit_session(self.py_wb, self.item_id)
+        if not session:
+            return False
+        if label is None:
+            self.labels.pop(language, None)
+        else:
+            self.labels[language] = label
+        session.label_changed(language, label)
+        return True
+
+    def _record_set_many(self, labels):
+        """Update the labels only locally if an edit session is active for the entity
+
+        :return: Whether the changes have been recorded in an edit session
+        :rtype: bool
+        """
+        session = get_edit_session(self.py_wb, self.item_id)
+        if not session:
+            return False
+        for language, label in labels.items():
+            self._record_set(label, language)
+        return True
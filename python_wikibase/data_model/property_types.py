@@ -0,0 +1,241 @@
+import json
+import os
+import threading
+
+from wikibase_api import ApiError
+
+from python_wikibase.data_model.entity import MAX_ENTITIES_PER_REQUEST, request_entities
+from python_wikibase.utils.chunks import chunks, unique
+from python_wikibase.utils.data_types import data_type_to_class
+from python_wikibase.utils.exceptions import NotFoundError, SearchError
+
+# Namespace of property pages on Wikidata (used if the namespace can't be determined)
+DEFAULT_PROPERTY_NAMESPACE = 120
+
+
+class PropertyTypes:
+    """Registry of the data types of properties (property ID -> Wikibase data type). It is filled
+    by :meth:`PyWikibase.load_property_types` and whenever the data type of a property needs to be
+    looked up, so the data type of every property only needs to be requested once. If a path is
+    specified, the registry is saved as a JSON file and loaded again by later processes"""
+
+    def __init__(self, path=None):
+        """
+        :param path: Path of the JSON file to persist the registry in (``None`` to only keep it in
+            memory)
+        :type path: str
+        """
+        self.path = path
+        self.data_types = {}
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.data_types = json.load(f)
+
+    def __contains__(self, prop_id):
+        return prop_id in self.data_types
+
+    def __len__(self):
+        return len(self.data_types)
+
+    def get(self, prop_id):
+        """Return the name of the value class for the property's data type
+
+        :param prop_id: ID of the property (e.g. "P1")
+        :type prop_id: str
+        :return: Name of the value class (e.g. "StringValue", "UnknownValue" for data types without
+            value class, ``None`` if the property isn't in the registry)
+        :rtype: str
+        """
+        data_type = self.data_types.get(prop_id)
+        if data_type is None:
+            return None
+        return data_type_to_class.get(data_type, "UnknownValue")
+
+    def update(self, data_types):
+        """Add the data types of properties to the registry (and save it if a path has been
+        specified)
+
+        :param data_types: Dict mapping property IDs to Wikibase data types (e.g. "string")
+        :type data_types: dict
+        """
+        with self.lock:
+            self.data_types.update(data_types)
+            if self.path:
+                self._save()
+
+    def clear(self):
+        """Remove all properties from the registry"""
+        with self.lock:
+            self.data_types = {}
+            if self.path:
+                self._save()
+
+    def _save(self):
+        # Write to a temporary file first so the registry isn't corrupted if the process is killed
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.data_types, f, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def create_property_types(property_types):
+    """Return the registry to use for the ``property_types`` parameter of ``PyWikibase``
+
+    :param property_types: Path of the JSON file to persist the registry in, a ``PropertyTypes``
+        object or ``None`` for an in-memory registry
+    :type property_types: str or PropertyTypes
+    :return: Property data type registry
+    :rtype: PropertyTypes
+    """
+    if property_types is None or isinstance(property_types, str):
+        return PropertyTypes(property_types)
+    if not isinstance(property_types, PropertyTypes):
+        raise ValueError("property_types parameter must be a path or instance of PropertyTypes")
+    return property_types
+
+
+# Requests (the functions return the request's params or parse its response, so they can be used
+# with both the synchronous and the asynchronous API)
+
+
+def namespaces_params():
+    return {"action": "query", "meta": "siteinfo", "siprop": "namespaces"}
+
+
+def unpack_property_namespace(r):
+    """Return the ID of the namespace of property pages from a "siteinfo" response
+
+    :param r: Response
+    :type r: dict
+    :return: Namespace ID
+    :rtype: int
+    """
+    for namespace in r["query"]["namespaces"].values():
+        if namespace.get("defaultcontentmodel") == "wikibase-property":
+            return namespace["id"]
+    return DEFAULT_PROPERTY_NAMESPACE
+
+
+def all_pages_params(namespace, continue_params=None):
+    params = {"action": "query", "list": "allpages", "apnamespace": namespace, "aplimit": "max"}
+    if continue_params:
+        params.update(continue_params)
+    return params
+
+
+def unpack_all_pages(r):
+    """Return the property IDs and the params for requesting the next page from an "allpages"
+    response
+
+    :param r: Response
+    :type r: dict
+    :return: Tuple of the form ``(prop_ids, continue_params)`` (``continue_params`` is ``None`` if
+        there are no more pages)
+    :rtype: tuple
+    """
+    prop_ids = [page["title"].split(":")[-1] for page in r["query"]["allpages"]]
+    return prop_ids, r.get("continue")
+
+
+def unpack_data_types(r):
+    """Return the data types of the properties in a "wbgetentities" response
+
+    :param r: Response
+    :type r: dict
+    :return: Dict mapping property IDs to Wikibase data types
+    :rtype: dict
+    """
+    return {
+        prop_id: entity["datatype"]
+        for prop_id, entity in r["entities"].items()
+        if "missing" not in entity and "datatype" in entity
+    }
+
+
+def list_property_ids(api):
+    """Return the IDs of all properties on the Wikibase instance
+
+    :param api: wikibase-api object to use for the requests
+    :type api: Wikibase
+    :return: List of property IDs
+    :rtype: list(str)
+    """
+    namespace = unpack_property_namespace(api.api.get(namespaces_params()))
+    prop_ids = []
+    continue_params = None
+    while True:
+        page_ids, continue_params = unpack_all_pages(
+            api.api.get(all_pages_params(namespace, continue_params))
+        )
+        prop_ids += page_ids
+        if not continue_params:
+            return prop_ids
+
+
+def fetch_data_types(api, prop_ids):
+    """Fetch the data types of the properties, using one "wbgetentities" request for every
+    ``MAX_ENTITIES_PER_REQUEST`` properties
+
+    :param api: wikibase-api object to use for the requests
+    :type api: Wikibase
+    :param prop_ids: IDs of the properties
+    :type prop_ids: list(str)
+    :return: Dict mapping property IDs to Wikibase data types
+    :rtype: dict
+    """
+    data_types = {}
+    for chunk in chunks(unique(prop_ids), MAX_ENTITIES_PER_REQUEST):
+        data_types.update(unpack_data_types(request_entities(api, chunk, props=[])))
+    return data_types
+
+
+def load_property_types(py_wb, prop_ids=None):
+    """Fetch the data types of the properties and save them in the registry of ``py_wb``
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param prop_ids: IDs of the properties (default: all properties on the Wikibase instance)
+    :type prop_ids: list(str)
+    :return: Number of properties in the registry
+    :rtype: int
+    """
+    try:
+        if prop_ids is None:
+            prop_ids = list_property_ids(py_wb.api)
+        data_types = fetch_data_types(py_wb.api, prop_ids)
+    except ApiError as e:
+        raise SearchError(f"Could not load property data types: {e}") from None
+    py_wb.property_types.update(data_types)
+    return len(py_wb.property_types)
+
+
+def resolve_data_type(py_wb, prop):
+    """Set the data type of the property if it is unknown (i.e. the property hasn't been fetched
+    using ``get()``). The data type is looked up in the property registry and only requested from
+    Wikibase if it isn't in the registry yet
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param prop: Property whose data type shall be set
+    :type prop: Property
+    """
+    if prop.data_type is not None or prop.entity_id is None:
+        return
+    if prop.entity_id not in py_wb.property_types:
+        load_property_types(py_wb, [prop.entity_id])
+    set_data_type(py_wb, prop)
+
+
+def set_data_type(py_wb, prop):
+    """Set the data type of the property to the one saved in the registry
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param prop: Property whose data type shall be set
+    :type prop: Property
+    """
+    data_type = py_wb.property_types.get(prop.entity_id)
+    if data_type is None:
+        raise NotFoundError(f'No property found with the entity_id "{prop.entity_id}"')
+    prop.data_type = data_type
@@ -1,37 +1,31 @@
 from wikibase_api import ApiError
 
 from python_wikibase.base import Base
+from python_wikibase.data_model.collection import Collection, changing
+from python_wikibase.data_model.edit_session import get_claim_edit_session
 from python_wikibase.data_model.entity import check_prop_param
-from python_wikibase.data_types.data_type import check_data_type, unmarshal_data_value
+from python_wikibase.data_model.property_types import resolve_data_type
+from python_wikibase.data_types.data_type import (
+    check_data_type,
+    marshal_snak,
+    unmarshal_data_value,
+)
+from python_wikibase.utils.cache import invalidate_claim_entity
 from python_wikibase.utils.exceptions import EditError
+from python_wikibase.utils.instrumentation import observe
+from python_wikibase.utils.lazy_dict import LazyDict
 
 
-class Qualifiers(Base):
+class Qualifiers(Collection):
+    __slots__ = ("claim_id", "qualifiers")
+
+    groups_attribute = "qualifiers"
+    id_attribute = "qualifier_id"
+
     def __init__(self, py_wb, api, language):
         super().__init__(py_wb, api, language)
         self.claim_id = None
-        self.qualifiers = {}
-
-    def __getitem__(self, index):
-        return self.to_list()[index]
-
-    def __iter__(self):
-        return iter(self.to_list())
-
-    def __len__(self):
-        return len(self.to_list())
-
-    def _add_locally(self, qualifier):
-        """Save a newly created qualifier in the local collection
-
-        :param qualifier: Qualifier to add locally
-        :type qualifier: Qualifier
-        """
-        prop_id = qualifier.property.entity_id
-        if prop_id in self.qualifiers:
-            self.qualifiers[prop_id].append(qualifier)
-        else:
-            self.qualifiers[prop_id] = [qualifier]
+        self.qualifiers = LazyDict(self._unmarshal_qualifiers)
 
     def _create(self, prop, value, snak_type):
         """Create the qualifier using the Wikibase API and save it in the local collection
@@ -45,24 +39,60 @@ class Qualifiers(Base):
         :return: self
         :rtype: Qualifiers
         """
+        # Only create qualifier locally if an edit session is active
+        new_qualifier = self._record_create(prop, value, snak_type)
+        if new_qualifier:
+            return new_qualifier
+
         # Create qualifier using API
-        try:
-            if value:
+        with observe(self.py_wb) as observation:
+            try:
                 r = self.api.qualifier.add(
-                    self.claim_id, prop.entity_id, value.marshal(), snak_type=snak_type
+                    self.claim_id,
+                    prop.entity_id,
+                    value.marshal() if value else None,
+                    snak_type=snak_type,
                 )
-            else:
-                r = self.api.qualifier.add(self.claim_id, prop.entity_id, None, snak_type=snak_type)
-        except ApiError as e:
-            raise EditError(f"Could not create qualifier: {e}") from None
+            except ApiError as e:
+                raise EditError(f"Could not create qualifier: {e}") from None
+            invalidate_claim_entity(self.py_wb, self.claim_id)
+
+            # Update local qualifier collection
+            with observation.unmarshalling():
+                return self._unmarshal_created(prop, r)
+
+    def _unmarshal_created(self, prop, r):
+        """Save the qualifier returned by a "wbsetqualifier" request in the local collection
 
-        # Update local qualifier collection
-        qualifiers = r["claim"]["qualifiers"]
-        new_qualifier_dict = qualifiers[prop.entity_id][-1]
+        :param prop: Property of the new qualifier
+        :type prop: Property
+        :param r: Response object (containing the claim with all of its qualifiers, the new
+            qualifier is the last one of its property)
+        :type r: dict
+        :return: New qualifier
+        :rtype: Qualifier
+        """
+        new_qualifier_dict = r["claim"]["qualifiers"][prop.entity_id][-1]
         new_qualifier = self.py_wb.Qualifier().unmarshal(self.claim_id, new_qualifier_dict)
         self._add_locally(new_qualifier)
         return new_qualifier
 
+    def _record_create(self, prop, value, snak_type):
+        """Create the qualifier only locally if an edit session is active for the entity
+
+        :return: New qualifier (``None`` if no edit session is active)
+        :rtype: Qualifier
+        """
+        session = get_claim_edit_session(self.py_wb, self.claim_id)
+        if not session:
+            return None
+        session.claim_changed(self.claim_id, self)
+        new_qualifier = self.py_wb.Qualifier()._create_locally(
+            self.claim_id, prop, value, snak_type
+        )
+        self._add_locally(new_qualifier)
+        return new_qualifier
+
     def unmarshal(self, claim_id, qualifiers):
         """Parse API response and fill object with the provided information
 
@@ -78,14 +108,31 @@ class Qualifiers(Base):
 
         # Wikibase API returns qualifiers as dict with properties as keys and lists of qualifiers as
         # values
-        # Loop over those properties and qualifier lists and add create a Qualifier object for each
-        # of them, then add them to the local collection
+        # The Qualifier objects for a property are only created when its qualifiers are accessed
+        # for the first time (see _unmarshal_qualifiers)
         for prop_id, qualifier_dicts in qualifiers.items():
-            for qualifier_dict in qualifier_dicts:
-                qualifier = self.py_wb.Qualifier().unmarshal(self.claim_id, qualifier_dict)
-                self._add_locally(qualifier)
+            if prop_id in self.qualifiers:
+                self.qualifiers[prop_id].extend(self._unmarshal_qualifiers(qualifier_dicts))
+            else:
+                self.qualifiers.set_raw(prop_id, qualifier_dicts)
+        self._reset_indexes()
         return self
 
+    def _unmarshal_qualifiers(self, qualifier_dicts):
+        """Create Qualifier objects for the qualifiers of a property
+
+        :param qualifier_dicts: List of qualifiers provided by the Wikibase API
+        :type qualifier_dicts: list(dict)
+        :return: List of qualifiers
+        :rtype: list(Qualifier)
+        """
+        return self._adopt(
+            [
+                self.py_wb.Qualifier().unmarshal(self.claim_id, qualifier_dict)
+                for qualifier_dict in qualifier_dicts
+            ]
+        )
+
     def add(self, prop, value):
         """Create a new qualifier with the specified prop and value
 
@@ -97,6 +144,7 @@ class Qualifiers(Base):
         :rtype: Qualifiers
         """
         check_prop_param(prop)
+        resolve_data_type(self.py_wb, prop)
         check_data_type(value, prop)
         return self._create(prop, value, "value")
 
@@ -132,46 +180,44 @@ class Qualifiers(Base):
         """
         check_qualifier_param(qualifier)
 
+        # Only remove qualifier locally if an edit session is active
+        session = get_claim_edit_session(self.py_wb, self.claim_id)
+        if session:
+            session.claim_changed(self.claim_id, self)
+            self._remove_locally(qualifier)
+            return self
+
         # Delete qualifier using API
         try:
             self.api.qualifier.remove(qualifier.claim_id, qualifier.qualifier_id)
         except ApiError as e:
             raise EditError(f"Could not remove qualifier: {e}") from None
+        invalidate_claim_entity(self.py_wb, self.claim_id)
 
         # Remove qualifier from local collection
-        prop_id = qualifier.property.entity_id
-        self.qualifiers[prop_id] = [
-            c for c in self.qualifiers[prop_id] if not c.qualifier_id == qualifier.qualifier_id
-        ]
-        if len(self.qualifiers[prop_id]) == 0:
-            del self.qualifiers[prop_id]
-
+        self._remove_locally(qualifier)
         return self
 
-    def to_dict(self):
-        """Return the collection of qualifiers as a dict
+    def marshal(self):
+        """Return the collection of qualifiers in the format used by the Wikibase API
 
         :return: Dict of qualifiers
         :rtype: dict
         """
-        return self.qualifiers
-
-    def to_list(self):
-        """Return the collection of qualifiers as a list
-
-        :return: List of qualifiers
-        :rtype: list
-        """
-        qualifier_list = []
-        [qualifier_list.extend(qualifiers) for prop, qualifiers in self.qualifiers.items()]
-        return qualifier_list
+        return {
+            prop_id: [qualifier.marshal() for qualifier in qualifiers]
+            for prop_id, qualifiers in self.qualifiers.items()
+        }
 
 
 class Qualifier(Base):
+    __slots__ = ("qualifier_id", "claim_id", "collection", "property", "snak_type", "value")
+
     def __init__(self, py_wb, api, language):
         super().__init__(py_wb, api, language)
         self.qualifier_id = None
         self.claim_id = None
+        self.collection = None  # Qualifiers collection holding the qualifier
         self.property = None
         self.snak_type = None
         self.value = None
@@ -196,38 +242,85 @@ class Qualifier(Base):
             self.property.data_type = self.value.__class__.__name__
         return self
 
+    def _create_locally(self, claim_id, prop, value, snak_type):
+        """Fill object with the information about a new qualifier which hasn't been saved on
+        Wikibase yet
+
+        :param claim_id: ID of the claim holding the qualifier
+        :type claim_id: str
+        :param prop: Property of the new qualifier
+        :type prop: Property
+        :param value: Value of the new qualifier
+        :type value: Value
+        :param snak_type: Value type (one of ``["value", "novalue", "somevalue"]``)
+        :type snak_type: str
+        :return: self
+        :rtype: Qualifier
+        """
+        self.claim_id = claim_id
+        self.property = self.py_wb.Property()
+        self.property.entity_id = prop.entity_id
+        self.property.data_type = prop.data_type
+        self.snak_type = snak_type
+        self.value = value
+        return self
+
+    def marshal(self):
+        """Return the qualifier in the format used by the Wikibase API
+
+        :return: Qualifier snak
+        :rtype: dict
+        """
+        return marshal_snak(self.property, self.value, self.snak_type)
+
+    def _record_update(self, value, snak_type):
+        """Update the qualifier only locally if an edit session is active for the entity
+
+        :return: Whether the change has been recorded in an edit session
+        :rtype: bool
+        """
+        session = get_claim_edit_session(self.py_wb, self.claim_id)
+        if not session:
+            return False
+        session.claim_changed(self.claim_id, self)
+        with changing(self):
+            self.value = value
+            self.snak_type = snak_type
+        return True
+
     def set_value(self, value):
+        resolve_data_type(self.py_wb, self.property)
         check_data_type(value, self.property)
-        try:
-            self.api.qualifier.update(
-                self.claim_id,
-                self.qualifier_id,
-                self.property.entity_id,
-                value.marshal(),
-                snak_type="value",
-            )
-        except ApiError as e:
-            raise EditError(f"Could not update qualifier value: {e}") from None
+        self._update(value, "value")
 
     def set_no_value(self):
-        try:
-            self.api.qualifier.update(
-                self.claim_id, self.qualifier_id, self.property.entity_id, None, snak_type="novalue"
-            )
-        except ApiError as e:
-            raise EditError(f"Could not update qualifier value: {e}") from None
+        self._update(None, "novalue")
 
     def set_some_value(self):
+        self._update(None, "somevalue")
+
+    def _update(self, value, snak_type):
+        """Replace the qualifier's value using the Wikibase API (or only locally if an edit session
+        is active for the entity)
+
+        :param value: New value
+        :type value: Value
+        :param snak_type: Value type (one of ``["value", "novalue", "somevalue"]``)
+        :type snak_type: str
+        """
+        if self._record_update(value, snak_type):
+            return
         try:
             self.api.qualifier.update(
                 self.claim_id,
                 self.qualifier_id,
                 self.property.entity_id,
-                None,
-                snak_type="somevalue",
+                value.marshal() if value else None,
+                snak_type=snak_type,
             )
         except ApiError as e:
             raise EditError(f"Could not update qualifier value: {e}") from None
+        invalidate_claim_entity(self.py_wb, self.claim_id)
 
 
 def check_qualifier_param(prop, param_name="qualifier"):
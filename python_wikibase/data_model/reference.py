@@ -1,72 +1,92 @@
+import json
+
 from wikibase_api import ApiError
 
 from python_wikibase.base import Base
+from python_wikibase.data_model.collection import Collection, changing, get_fingerprint
+from python_wikibase.data_model.edit_session import get_claim_edit_session
 from python_wikibase.data_model.entity import check_prop_param
-from python_wikibase.data_types.data_type import check_data_type, unmarshal_data_value
-from python_wikibase.utils.data_types import class_to_data_type
+from python_wikibase.data_model.property_types import resolve_data_type
+from python_wikibase.data_types.data_type import (
+    check_data_type,
+    marshal_snak,
+    unmarshal_data_value,
+)
+from python_wikibase.utils.cache import invalidate_claim_entity
+from python_wikibase.utils.chunks import unique
+from python_wikibase.utils.concurrency import ThreadLocalApi, map_concurrently
 from python_wikibase.utils.exceptions import EditError
+from python_wikibase.utils.instrumentation import observe
+from python_wikibase.utils.lazy_dict import LazyDict
+
 
+class References(Collection):
+    __slots__ = ("claim_id", "references")
+
+    groups_attribute = "references"
+    id_attribute = "reference_id"
 
-class References(Base):
     def __init__(self, py_wb, api, language):
         super().__init__(py_wb, api, language)
         self.claim_id = None
-        self.references = {}
-
-    def __getitem__(self, index):
-        return self.to_list()[index]
+        self.references = LazyDict(self._unmarshal_references)
 
-    def __iter__(self):
-        return iter(self.to_list())
-
-    def __len__(self):
-        return len(self.to_list())
-
-    def _add_locally(self, reference):
-        """Save a newly created reference in the local collection
+    def _create(self, snaks, api=None):
+        """Create the reference using the Wikibase API and save it in the local collection
 
-        :param reference: Reference to add locally
-        :type reference: Reference
+        :param snaks: Snaks of the new reference
+        :type snaks: list(Snak)
+        :param api: wikibase-api object to use for the request (default: the collection's)
+        :type api: Wikibase
+        :return: New reference
+        :rtype: Reference
         """
-        prop_id = reference.property.entity_id
-        if prop_id in self.references:
-            self.references[prop_id].append(reference)
-        else:
-            self.references[prop_id] = [reference]
+        if api is None:
+            api = self.api
 
-    def _create(self, prop, value, snak_type):
-        """Create the reference using the Wikibase API and save it in the local collection
+        # Only create reference locally if an edit session is active
+        new_reference = self._record_create(snaks)
+        if new_reference:
+            return new_reference
 
-        :param prop: Property of the new reference
-        :type prop: Property
-        :param value: Value of the new reference
-        :type value: Value
-        :param snak_type: Value type (one of ``["value", "novalue", "somevalue"]``)
-        :type snak_type: str
+        # Create reference using API
+        with observe(self.py_wb) as observation:
+            try:
+                r = api.api.post(get_set_reference_params(self.claim_id, snaks))
+            except ApiError as e:
+                raise EditError(f"Could not create reference: {e}") from None
+            invalidate_claim_entity(self.py_wb, self.claim_id)
+
+            # Save reference in local collection
+            with observation.unmarshalling():
+                return self._unmarshal_created(r)
+
+    def _unmarshal_created(self, r):
+        """Save the reference returned by a "wbsetreference" request in the local collection
+
+        :param r: Response object
+        :type r: dict
         :return: New reference
         :rtype: Reference
         """
-        # Create reference using API
-        try:
-            if value:
-                value_class = value.__class__.__name__
-                value_marshalled = {
-                    "type": class_to_data_type[value_class],
-                    "value": value.marshal(),
-                }
-                r = self.api.reference.add(
-                    self.claim_id, prop.entity_id, value_marshalled, snak_type=snak_type
-                )
-            else:
-                r = self.api.reference.add(self.claim_id, prop.entity_id, None, snak_type=snak_type)
-        except ApiError as e:
-            raise EditError(f"Could not create reference: {e}") from None
-
-        # Save reference in local collection
         new_reference = self.py_wb.Reference().unmarshal(self.claim_id, r["reference"])
         self._add_locally(new_reference)
         return new_reference
 
+    def _record_create(self, snaks):
+        """Create the reference only locally if an edit session is active for the entity
+
+        :return: New reference (``None`` if no edit session is active)
+        :rtype: Reference
+        """
+        session = get_claim_edit_session(self.py_wb, self.claim_id)
+        if not session:
+            return None
+        session.claim_changed(self.claim_id, self)
+        new_reference = self.py_wb.Reference()._create_locally(self.claim_id, snaks)
+        self._add_locally(new_reference)
+        return new_reference
+
     def unmarshal(self, claim_id, references):
         """Parse API response and fill object with the provided information
 
@@ -81,13 +101,36 @@ class References(Base):
         self.claim_id = claim_id
 
         # Wikibase API returns references as list
-        # Loop over the references add create a Reference object for each of them, then add them to
-        # the local collection
+        # Group the references by the property of their first snak. The Reference objects for a
+        # property are only created when its references are accessed for the first time (see
+        # _unmarshal_references)
+        reference_dicts_by_prop = {}
         for reference_dict in references:
-            reference = self.py_wb.Reference().unmarshal(self.claim_id, reference_dict)
-            self._add_locally(reference)
+            prop_id = get_snaks_order(reference_dict)[0]
+            reference_dicts_by_prop.setdefault(prop_id, []).append(reference_dict)
+        for prop_id, reference_dicts in reference_dicts_by_prop.items():
+            if prop_id in self.references:
+                self.references[prop_id].extend(self._unmarshal_references(reference_dicts))
+            else:
+                self.references.set_raw(prop_id, reference_dicts)
+        self._reset_indexes()
         return self
 
+    def _unmarshal_references(self, reference_dicts):
+        """Create Reference objects for the references of a property
+
+        :param reference_dicts: List of references provided by the Wikibase API
+        :type reference_dicts: list(dict)
+        :return: List of references
+        :rtype: list(Reference)
+        """
+        return self._adopt(
+            [
+                self.py_wb.Reference().unmarshal(self.claim_id, reference_dict)
+                for reference_dict in reference_dicts
+            ]
+        )
+
     def add(self, prop, value):
         """Create a new reference with the specified prop and value
 
@@ -98,9 +141,7 @@ class References(Base):
         :return: New reference
         :rtype: Reference
         """
-        check_prop_param(prop)
-        check_data_type(value, prop)
-        return self._create(prop, value, "value")
+        return self._create(new_snaks(self.py_wb, [(prop, value)]))
 
     def add_no_value(self, prop):
         """Create a new reference with the specified prop and no value
@@ -111,7 +152,7 @@ class References(Base):
         :rtype: Reference
         """
         check_prop_param(prop)
-        return self._create(prop, None, "novalue")
+        return self._create([Snak(prop, None, "novalue")])
 
     def add_some_value(self, prop):
         """Create a new reference with the specified prop and an unspecified value
@@ -122,7 +163,18 @@ class References(Base):
         :rtype: Reference
         """
         check_prop_param(prop)
-        return self._create(prop, None, "somevalue")
+        return self._create([Snak(prop, None, "somevalue")])
+
+    def add_snaks(self, snaks):
+        """Create a new reference with multiple property-value pairs (e.g. the source, its URL and
+        the date it has been retrieved) using a single API request
+
+        :param snaks: Snaks of the new reference as a list of ``(prop, value)`` tuples
+        :type snaks: list(tuple(Property, Value))
+        :return: New reference
+        :rtype: Reference
+        """
+        return self._create(new_snaks(self.py_wb, snaks))
 
     def remove(self, reference):
         """Delete the provided reference
@@ -134,49 +186,103 @@ class References(Base):
         """
         check_reference_param(reference)
 
+        # Only remove reference locally if an edit session is active
+        session = get_claim_edit_session(self.py_wb, self.claim_id)
+        if session:
+            session.claim_changed(self.claim_id, self)
+            self._remove_locally(reference)
+            return self
+
         # Delete reference using API
         try:
             self.api.reference.remove(reference.claim_id, reference.reference_id)
         except ApiError as e:
             raise EditError(f"Could not remove reference: {e}") from None
+        invalidate_claim_entity(self.py_wb, self.claim_id)
 
         # Remove reference from local collection
-        prop_id = reference.property.entity_id
-        self.references[prop_id] = [
-            c for c in self.references[prop_id] if not c.reference_id == reference.reference_id
-        ]
-        if len(self.references[prop_id]) == 0:
-            del self.references[prop_id]
-
+        self._remove_locally(reference)
         return self
 
+    def _get_fingerprints(self, reference):
+        """References are indexed by the values of all of their snaks, so they can be found by any
+        of them (e.g. by the URL or retrieval date of a cited source)"""
+        fingerprints = []
+        for snak in reference.snaks:
+            fingerprint = get_fingerprint(snak.property.entity_id, snak.value, snak.snak_type)
+            if fingerprint not in fingerprints:
+                fingerprints.append(fingerprint)
+        return fingerprints
+
+    def find(self, prop, value=None):
+        """Return the references with a snak with the specified property (and value)
+
+        :param prop: Property of one of the references' snaks
+        :type prop: Property
+        :param value: Value of the snak (default: all references with a snak with the property)
+        :type value: Value
+        :return: List of references
+        :rtype: list(Reference)
+        """
+        if value is not None:
+            return super().find(prop, value)
+        return [
+            reference
+            for reference in self._get_flat()
+            if any(snak.property.entity_id == prop.entity_id for snak in reference.snaks)
+        ]
+
     def to_dict(self):
-        """Return the collection of references as a dict
+        """Return the collection as a dict mapping property IDs to lists of references. A reference
+        is listed under the properties of all of its snaks
 
         :return: Dict of references
         :rtype: dict
         """
-        return self.references
+        references_by_prop = {}
+        for reference in self._get_flat():
+            for prop_id in unique(snak.property.entity_id for snak in reference.snaks):
+                references_by_prop.setdefault(prop_id, []).append(reference)
+        return references_by_prop
 
-    def to_list(self):
-        """Return the collection of references as a list
+    def marshal(self):
+        """Return the collection of references in the format used by the Wikibase API
 
         :return: List of references
-        :rtype: list
+        :rtype: list(dict)
         """
-        reference_list = []
-        [reference_list.extend(references) for prop, references in self.references.items()]
-        return reference_list
+        return [reference.marshal() for reference in self.to_list()]
+
+
+class Snak:
+    """Property-value pair of a reference. Snaks aren't changed after they have been created, they
+    are replaced when a reference is updated"""
+
+    __slots__ = ("property", "snak_type", "value")
+
+    def __init__(self, prop, value, snak_type="value"):
+        self.property = prop
+        self.snak_type = snak_type
+        self.value = value
+
+    def marshal(self):
+        """Return the snak in the format used by the Wikibase API
+
+        :return: Snak
+        :rtype: dict
+        """
+        return marshal_snak(self.property, self.value, self.snak_type)
 
 
 class Reference(Base):
+    __slots__ = ("reference_id", "claim_id", "collection", "snaks")
+
     def __init__(self, py_wb, api, language):
         super().__init__(py_wb, api, language)
         self.reference_id = None
         self.claim_id = None
-        self.property = None
-        self.snak_type = None
-        self.value = None
+        self.collection = None  # References collection holding the reference
+        self.snaks = []
 
     def unmarshal(self, claim_id, reference_data):
         """Parse API response and fill object with the provided information
@@ -188,53 +294,303 @@ class Reference(Base):
         """
         self.reference_id = reference_data["hash"]
         self.claim_id = claim_id
+        self.snaks = [
+            unmarshal_snak(self.py_wb, snak_data)
+            for prop_id in get_snaks_order(reference_data)
+            for snak_data in reference_data["snaks"][prop_id]
+        ]
+        return self
 
-        prop_id = list(reference_data["snaks"].keys())[0]
-        main_snak = reference_data["snaks"][prop_id][0]
-        self.property = self.py_wb.Property()
-        self.property.entity_id = prop_id
+    def _create_locally(self, claim_id, snaks):
+        """Fill object with the information about a new reference which hasn't been saved on
+        Wikibase yet
 
-        # Parse snak type and value (if snak type is "value")
-        self.snak_type = main_snak["snaktype"]
-        if self.snak_type == "value":
-            self.value = unmarshal_data_value(self.py_wb, main_snak)
-            self.property.data_type = self.value.__class__.__name__
+        :param claim_id: ID of the claim holding the reference
+        :type claim_id: str
+        :param snaks: Snaks of the new reference
+        :type snaks: list(Snak)
+        :return: self
+        :rtype: Reference
+        """
+        self.claim_id = claim_id
+        self.snaks = snaks
         return self
 
-    def set_value(self, value):
-        check_data_type(value, self.property)
-        try:
-            self.api.reference.update(
-                self.claim_id,
-                self.property.entity_id,
-                self.reference_id,
-                value.marshal(),
-                snak_type="value",
-            )
-        except ApiError as e:
-            raise EditError(f"Could not update reference value: {e}") from None
+    def marshal(self):
+        """Return the reference in the format used by the Wikibase API
 
-    def set_no_value(self):
-        try:
-            self.api.reference.update(
-                self.claim_id, self.property.entity_id, self.reference_id, None, snak_type="novalue"
-            )
-        except ApiError as e:
-            raise EditError(f"Could not update reference value: {e}") from None
+        :return: Reference
+        :rtype: dict
+        """
+        snaks = marshal_snaks(self.snaks)
+        return {"snaks": snaks, "snaks-order": list(snaks)}
 
-    def set_some_value(self):
+    def _record_update(self, snaks):
+        """Update the reference only locally if an edit session is active for the entity
+
+        :return: Whether the change has been recorded in an edit session
+        :rtype: bool
+        """
+        session = get_claim_edit_session(self.py_wb, self.claim_id)
+        if not session:
+            return False
+        session.claim_changed(self.claim_id, self)
+        with changing(self):
+            self.snaks = snaks
+        return True
+
+    def _update(self, snaks):
+        """Replace the reference's snaks using a single API request. Wikibase identifies references
+        by the hash of their snaks, so the reference's ID changes
+
+        :param snaks: New snaks of the reference
+        :type snaks: list(Snak)
+        """
+        if self._record_update(snaks):
+            return
         try:
-            self.api.reference.update(
-                self.claim_id,
-                self.property.entity_id,
-                self.reference_id,
-                None,
-                snak_type="somevalue",
-            )
+            r = self.api.api.post(get_set_reference_params(self.claim_id, snaks, self.reference_id))
         except ApiError as e:
             raise EditError(f"Could not update reference value: {e}") from None
+        invalidate_claim_entity(self.py_wb, self.claim_id)
+        self.unmarshal_update(snaks, r)
+
+    def unmarshal_update(self, snaks, r):
+        """Save the new snaks and hash of the reference after updating it
+
+        :param snaks: New snaks of the reference
+        :type snaks: list(Snak)
+        :param r: Response of the Wikibase API
+        :type r: dict
+        """
+        with changing(self):
+            self.snaks = snaks
+            self.reference_id = r["reference"]["hash"]
+
+    def set_snaks(self, snaks):
+        """Replace all property-value pairs of the reference
+
+        :param snaks: New snaks of the reference as a list of ``(prop, value)`` tuples
+        :type snaks: list(tuple(Property, Value))
+        """
+        self._update(new_snaks(self.py_wb, snaks))
+
+    def set_value(self, value, index=0):
+        """Update the value of one of the reference's snaks (the other snaks are kept)
+
+        :param value: New value of the snak
+        :type value: Value
+        :param index: Position of the snak in ``snaks`` (default: the first snak)
+        :type index: int
+        """
+        prop = self._get_snak(index).property
+        resolve_data_type(self.py_wb, prop)
+        check_data_type(value, prop)
+        self._update(self._replace_snak(index, value, "value"))
+
+    def set_no_value(self, index=0):
+        self._update(self._replace_snak(index, None, "novalue"))
+
+    def set_some_value(self, index=0):
+        self._update(self._replace_snak(index, None, "somevalue"))
+
+    def _get_snak(self, index):
+        """Return the snak at the position
+
+        :param index: Position of the snak in ``snaks``
+        :type index: int
+        :return: Snak
+        :rtype: Snak
+        """
+        if not self.snaks:
+            raise ValueError("The reference doesn't have any snaks")
+        if not 0 <= index < len(self.snaks):
+            raise ValueError(f"The reference doesn't have a snak at index {index}")
+        return self.snaks[index]
+
+    def _replace_snak(self, index, value, snak_type):
+        """Return the reference's snaks with the one at the position replaced
+
+        :param index: Position of the snak in ``snaks``
+        :type index: int
+        :param value: New value of the snak
+        :type value: Value
+        :param snak_type: Value type (one of ``["value", "novalue", "somevalue"]``)
+        :type snak_type: str
+        :return: New snaks
+        :rtype: list(Snak)
+        """
+        prop = self._get_snak(index).property
+        snaks = list(self.snaks)
+        snaks[index] = Snak(prop, value, snak_type)
+        return snaks
+
+    # Property, snak type and value of the reference's first snak. Most references only consist of
+    # one snak. Defined last because ``property`` shadows the built-in in the class body
+    @property
+    def snak_type(self):
+        return self.snaks[0].snak_type if self.snaks else None
+
+    @property
+    def value(self):
+        return self.snaks[0].value if self.snaks else None
+
+    @property
+    def property(self):
+        return self.snaks[0].property if self.snaks else None
 
 
 def check_reference_param(prop, param_name="reference"):
     if not isinstance(prop, Reference):
         raise ValueError(f"{param_name} parameter must be instance of Reference class")
+
+
+def new_snaks(py_wb, snaks):
+    """Check the property-value pairs of a new reference and create its snaks
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param snaks: Snaks as a list of ``(prop, value)`` tuples
+    :type snaks: list(tuple(Property, Value))
+    :return: Snaks
+    :rtype: list(Snak)
+    """
+    snaks = list(snaks)
+    if not snaks:
+        raise ValueError("A reference needs at least one snak")
+    new = []
+    for prop, value in snaks:
+        check_prop_param(prop)
+        resolve_data_type(py_wb, prop)
+        check_data_type(value, prop)
+
+        # Copy the property so the reference doesn't change if the Property object is modified
+        snak_prop = py_wb.Property()
+        snak_prop.entity_id = prop.entity_id
+        snak_prop.data_type = prop.data_type
+        new.append(Snak(snak_prop, value, "value"))
+    return new
+
+
+def unmarshal_snak(py_wb, snak_data):
+    """Create a snak from the data provided by the Wikibase API
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param snak_data: Snak provided by the Wikibase API
+    :type snak_data: dict
+    :return: Snak
+    :rtype: Snak
+    """
+    prop = py_wb.Property()
+    prop.entity_id = snak_data["property"]
+
+    # Parse snak type and value (if snak type is "value")
+    snak_type = snak_data["snaktype"]
+    value = None
+    if snak_type == "value":
+        value = unmarshal_data_value(py_wb, snak_data)
+        prop.data_type = value.__class__.__name__
+    return Snak(prop, value, snak_type)
+
+
+def marshal_snaks(snaks):
+    """Return the snaks of a reference in the format used by the Wikibase API
+
+    :param snaks: Snaks
+    :type snaks: list(Snak)
+    :return: Dict mapping property IDs to lists of snaks (in the order of ``snaks``)
+    :rtype: dict
+    """
+    snaks_marshalled = {}
+    for snak in snaks:
+        snaks_marshalled.setdefault(snak.property.entity_id, []).append(snak.marshal())
+    return snaks_marshalled
+
+
+def get_snaks_order(reference_data):
+    """Return the IDs of the properties of a reference's snaks in their order
+
+    :param reference_data: Reference provided by the Wikibase API
+    :type reference_data: dict
+    :return: Property IDs
+    :rtype: list(str)
+    """
+    return reference_data.get("snaks-order") or list(reference_data["snaks"])
+
+
+def get_set_reference_params(claim_id, snaks, reference_id=None):
+    """Return the parameters of a "wbsetreference" request creating a reference with the snaks (or
+    replacing the snaks of an existing reference)
+
+    :param claim_id: ID of the claim holding the reference
+    :type claim_id: str
+    :param snaks: Snaks of the reference
+    :type snaks: list(Snak)
+    :param reference_id: Hash of the reference to update (``None`` to create a new reference)
+    :type reference_id: str
+    :return: Request parameters
+    :rtype: dict
+    """
+    snaks_marshalled = marshal_snaks(snaks)
+    params = {
+        "action": "wbsetreference",
+        "statement": claim_id,
+        "snaks": json.dumps(snaks_marshalled),
+        "snaks-order": "|".join(snaks_marshalled),
+    }
+    if reference_id is not None:
+        params["reference"] = reference_id
+    return params
+
+
+def unique_claims(claims):
+    """Return the claims without duplicates (claims with the same ID)
+
+    :param claims: Claims
+    :type claims: list(Claim)
+    :return: Claims in their original order
+    :rtype: list(Claim)
+    """
+    claims_by_id = {}
+    for claim in claims:
+        claims_by_id.setdefault(claim.claim_id, claim)
+    return list(claims_by_id.values())
+
+
+def add_references(py_wb, claims, snaks, max_workers=4):
+    """Add the same reference to multiple claims using a pool of threads. Every reference is
+    created with its own "wbsetreference" request, so the other qualifiers and references of the
+    claims are left untouched. For claims of entities with an active edit session, the reference
+    is only created locally
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param claims: Claims to add the reference to
+    :type claims: iterable(Claim)
+    :param snaks: Snaks of the reference as a list of ``(prop, value)`` tuples
+    :type snaks: list(tuple(Property, Value))
+    :param max_workers: Maximum number of concurrent requests
+    :type max_workers: int
+    :return: New references (in the order of ``claims``)
+    :rtype: list(Reference)
+    """
+    snaks = new_snaks(py_wb, snaks)
+    claims = list(claims)
+    new_references = {}
+    pending = []
+    for claim in unique_claims(claims):
+        if get_claim_edit_session(py_wb, claim.claim_id):
+            new_references[claim.claim_id] = claim.references._record_create(list(snaks))
+        else:
+            pending.append(claim)
+
+    worker_apis = ThreadLocalApi(py_wb.api)
+
+    def create_reference(claim):
+        return claim.references._create(list(snaks), api=worker_apis.get())
+
+    references = map_concurrently(create_reference, pending, max_workers, ordered=True)
+    for claim, reference in zip(pending, references):
+        new_references[claim.claim_id] = reference
+    return [new_references[claim.claim_id] for claim in claims]
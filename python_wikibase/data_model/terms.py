@@ -0,0 +1,142 @@
+import json
+
+from python_wikibase.utils.exceptions import DuplicateError, EditError
+
+
+def raise_term_error(e, message):
+    """Raise a ``DuplicateError`` if the label/description edit failed because of a conflict with
+    another entity, or an ``EditError`` otherwise"""
+    r_dict = json.loads(str(e))
+    if (
+        "messages" in r_dict
+        and r_dict["messages"][0]["name"] == "wikibase-validator-label-with-description-conflict"
+    ):
+        raise DuplicateError(
+            "Another entity with the same label and description already exists"
+        ) from None
+    else:
+        raise EditError(f"{message}: {e}") from None
+
+
+def marshal_terms(terms):
+    """Return labels or descriptions in the format used by the "wbeditentity" API
+
+    :param terms: Dict mapping languages to labels/descriptions (``None`` removes the term in the
+        language)
+    :type terms: dict
+    :return: Terms
+    :rtype: dict
+    """
+    terms_marshalled = {}
+    for language, value in terms.items():
+        if value is None:
+            terms_marshalled[language] = {"language": language, "remove": ""}
+        else:
+            terms_marshalled[language] = {"language": language, "value": value}
+    return terms_marshalled
+
+
+def marshal_aliases(aliases, current_aliases):
+    """Return aliases which replace the current ones in the format used by the "wbeditentity" API
+
+    :param aliases: Dict mapping languages to the new lists of aliases
+    :type aliases: dict
+    :param current_aliases: Dict mapping languages to the current lists of aliases. Wikibase can't
+        replace aliases with an empty list, so the current aliases are removed explicitly
+    :type current_aliases: dict
+    :return: Aliases
+    :rtype: list(dict)
+    """
+    aliases_marshalled = []
+    for language, alias_list in aliases.items():
+        if alias_list:
+            aliases_marshalled += [{"language": language, "value": a} for a in alias_list]
+        else:
+            aliases_marshalled += [
+                {"language": language, "value": a, "remove": ""}
+                for a in current_aliases.get(language, [])
+            ]
+    return aliases_marshalled
+
+
+def get_terms_content(labels=None, descriptions=None, aliases=None, current_aliases=None):
+    """Return the content of a "wbeditentity" request updating the labels, descriptions and
+    aliases of an entity in multiple languages
+
+    :param labels: Dict mapping languages to labels
+    :type labels: dict
+    :param descriptions: Dict mapping languages to descriptions
+    :type descriptions: dict
+    :param aliases: Dict mapping languages to lists of aliases (replacing the current ones)
+    :type aliases: dict
+    :param current_aliases: Dict mapping languages to the current lists of aliases
+    :type current_aliases: dict
+    :return: Content of the edit (empty if nothing is changed)
+    :rtype: dict
+    """
+    content = {}
+    if labels:
+        content["labels"] = marshal_terms(labels)
+    if descriptions:
+        content["descriptions"] = marshal_terms(descriptions)
+    if aliases:
+        aliases_marshalled = marshal_aliases(aliases, current_aliases or {})
+        if aliases_marshalled:
+            content["aliases"] = aliases_marshalled
+    return content
+
+
+def get_set_aliases_params(entity_id, language, add=None, remove=None):
+    """Return the parameters of a "wbsetaliases" request adding and removing aliases in one edit
+
+    :param entity_id: ID of the entity
+    :type entity_id: str
+    :param language: Language of the aliases
+    :type language: str
+    :param add: Aliases to add
+    :type add: list(str)
+    :param remove: Aliases to remove
+    :type remove: list(str)
+    :return: Request parameters
+    :rtype: dict
+    """
+    params = {"action": "wbsetaliases", "id": entity_id, "language": language}
+    if add:
+        params["add"] = "|".join(add)
+    if remove:
+        params["remove"] = "|".join(remove)
+    return params
+
+
+def unpack_terms(terms, terms_data, languages):
+    """Save the labels or descriptions returned by the Wikibase API after an edit
+
+    :param terms: Dict mapping languages to labels/descriptions which is updated
+    :type terms: dict
+    :param terms_data: Labels/descriptions provided by the Wikibase API
+    :type terms_data: dict
+    :param languages: Languages which have been edited
+    :type languages: iterable(str)
+    """
+    for language in languages:
+        if language in terms_data:
+            terms[language] = terms_data[language]["value"]
+        else:
+            terms.pop(language, None)
+
+
+def unpack_aliases(aliases, aliases_data, languages):
+    """Save the aliases returned by the Wikibase API after an edit
+
+    :param aliases: Dict mapping languages to lists of aliases which is updated
+    :type aliases: dict
+    :param aliases_data: Aliases provided by the Wikibase API
+    :type aliases_data: dict
+    :param languages: Languages which have been edited
+    :type languages: iterable(str)
+    """
+    for language in languages:
+        if language in aliases_data:
+            aliases[language] = [alias_item["value"] for alias_item in aliases_data[language]]
+        else:
+            aliases.pop(language, None)
@@ -1,6 +1,31 @@
+from python_wikibase.data_types.commons_media import CommonsMedia
 from python_wikibase.data_types.external_id import ExternalId
 from python_wikibase.data_types.geo_location import GeoLocation
+from python_wikibase.data_types.geo_shape import GeoShape
+from python_wikibase.data_types.lexeme import Form, Lexeme, Sense
+from python_wikibase.data_types.math import Math
+from python_wikibase.data_types.monolingual_text import MonolingualText
 from python_wikibase.data_types.quantity import Quantity
 from python_wikibase.data_types.string_value import StringValue
+from python_wikibase.data_types.table import Table
+from python_wikibase.data_types.time import Time
+from python_wikibase.data_types.unknown_value import UnknownValue
+from python_wikibase.data_types.url import Url
 
-__all__ = ["ExternalId", "GeoLocation", "Quantity", "StringValue"]
+__all__ = [
+    "CommonsMedia",
+    "ExternalId",
+    "Form",
+    "GeoLocation",
+    "GeoShape",
+    "Lexeme",
+    "Math",
+    "MonolingualText",
+    "Quantity",
+    "Sense",
+    "StringValue",
+    "Table",
+    "Time",
+    "UnknownValue",
+    "Url",
+]
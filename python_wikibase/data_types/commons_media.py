@@ -0,0 +1,23 @@
+from python_wikibase.data_types.data_type import DataType
+
+
+class CommonsMedia(DataType):
+    __slots__ = ("file_name",)
+
+    def __init__(self, py_wb, api, language):
+        super().__init__(py_wb, api, language)
+        self.file_name = None  # Name of the file on Wikimedia Commons (e.g. "Example.jpg")
+
+    def __str__(self):
+        return self.file_name
+
+    def unmarshal(self, data_value):
+        self.file_name = data_value["value"]
+        return self
+
+    def marshal(self):
+        return self.file_name
+
+    def create(self, file_name):
+        self.file_name = file_name
+        return self
@@ -1,5 +1,10 @@
 from abc import abstractmethod
 
+from python_wikibase.utils.data_types import (
+    class_to_data_type,
+    class_to_value_type,
+    data_type_to_class,
+)
 from python_wikibase.value import Value
 
 
@@ -7,6 +12,8 @@ class DataType(Value):
     """Abstract class for Wikibase data types (see
     https://www.mediawiki.org/wiki/Wikibase/DataModel)"""
 
+    __slots__ = ()
+
     @abstractmethod
     def unmarshal(self, data_value):
         pass
@@ -20,58 +27,176 @@ class DataType(Value):
         pass
 
 
+def _unmarshal_commons_media(py_wb, data_value):
+    return py_wb.CommonsMedia().unmarshal(data_value)
+
+
+def _unmarshal_external_id(py_wb, data_value):
+    return py_wb.ExternalId().unmarshal(data_value)
+
+
+def _unmarshal_form(py_wb, data_value):
+    return py_wb.Form().unmarshal(data_value)
+
+
+def _unmarshal_geo_location(py_wb, data_value):
+    return py_wb.GeoLocation().unmarshal(data_value)
+
+
+def _unmarshal_geo_shape(py_wb, data_value):
+    return py_wb.GeoShape().unmarshal(data_value)
+
+
+def _unmarshal_item(py_wb, data_value):
+    item = py_wb.Item()
+    item.entity_id = data_value["value"]["id"]
+    return item
+
+
+def _unmarshal_lexeme(py_wb, data_value):
+    return py_wb.Lexeme().unmarshal(data_value)
+
+
+def _unmarshal_math(py_wb, data_value):
+    return py_wb.Math().unmarshal(data_value)
+
+
+def _unmarshal_monolingual_text(py_wb, data_value):
+    return py_wb.MonolingualText().unmarshal(data_value)
+
+
+def _unmarshal_property(py_wb, data_value):
+    prop = py_wb.Property()
+    prop.entity_id = data_value["value"]["id"]
+    return prop
+
+
+def _unmarshal_quantity(py_wb, data_value):
+    return py_wb.Quantity().unmarshal(data_value)
+
+
+def _unmarshal_sense(py_wb, data_value):
+    return py_wb.Sense().unmarshal(data_value)
+
+
+def _unmarshal_string_value(py_wb, data_value):
+    return py_wb.StringValue().unmarshal(data_value)
+
+
+def _unmarshal_table(py_wb, data_value):
+    return py_wb.Table().unmarshal(data_value)
+
+
+def _unmarshal_time(py_wb, data_value):
+    return py_wb.Time().unmarshal(data_value)
+
+
+def _unmarshal_url(py_wb, data_value):
+    return py_wb.Url().unmarshal(data_value)
+
+
+# Functions for unmarshalling the values of each Wikibase data type. They are called with the
+# PyWikibase object and the "datavalue" of a snak and return the value object (see
+# ``register_data_type``)
+data_value_unmarshallers = {
+    "commonsMedia": _unmarshal_commons_media,
+    "external-id": _unmarshal_external_id,
+    "geo-shape": _unmarshal_geo_shape,
+    "globe-coordinate": _unmarshal_geo_location,
+    "math": _unmarshal_math,
+    "monolingualtext": _unmarshal_monolingual_text,
+    "quantity": _unmarshal_quantity,
+    "string": _unmarshal_string_value,
+    "tabular-data": _unmarshal_table,
+    "time": _unmarshal_time,
+    "url": _unmarshal_url,
+    "wikibase-form": _unmarshal_form,
+    "wikibase-item": _unmarshal_item,
+    "wikibase-lexeme": _unmarshal_lexeme,
+    "wikibase-property": _unmarshal_property,
+    "wikibase-sense": _unmarshal_sense,
+}
+
+
+# Options for handling values of data types without unmarshalling function (see the
+# ``unknown_data_types`` parameter of ``PyWikibase``)
+UNKNOWN_DATA_TYPES_OPTIONS = ["raise", "raw"]
+
+
+def check_unknown_data_types(unknown_data_types):
+    if unknown_data_types not in UNKNOWN_DATA_TYPES_OPTIONS:
+        raise ValueError(
+            f"unknown_data_types parameter must be one of {UNKNOWN_DATA_TYPES_OPTIONS}"
+        )
+
+
+def register_data_type(data_type, unmarshal_fn, value_class=None, value_type="string"):
+    """Register a function for unmarshalling the values of a Wikibase data type (e.g. one which
+    isn't supported by python-wikibase). Replaces the function registered for the data type before
+
+    :param data_type: Wikibase data type (e.g. "musical-notation")
+    :type data_type: str
+    :param unmarshal_fn: Function which is called with the PyWikibase object and the "datavalue"
+        of a snak and returns the value
+    :type unmarshal_fn: function
+    :param value_class: Class of the values (a ``DataType`` subclass). If it is specified, the
+        class is used as data type of properties with the data type, so its values can be used
+        in new claims, qualifiers and references
+    :type value_class: type
+    :param value_type: Type of the "datavalue" objects Wikibase uses for the values (e.g.
+        "string", only used if ``value_class`` is specified)
+    :type value_type: str
+    """
+    data_value_unmarshallers[data_type] = unmarshal_fn
+    if value_class is not None:
+        class_name = value_class.__name__
+        class_to_data_type[class_name] = data_type
+        class_to_value_type[class_name] = value_type
+        data_type_to_class[data_type] = class_name
+
+
 def unmarshal_data_value(py_wb, main_snak):
-    # Return None if snak type is "novalue" or "somevalue"
-    snak_type = main_snak["snaktype"]
-    if snak_type != "value":
-        return None
+    """Return the value of the snak
 
-    if "datatype" in main_snak:
-        data_type = main_snak["datatype"]
-    else:
-        data_type = "string"
-    data_value = main_snak["datavalue"]
-
-    # DataType
-    if data_type in ["monolingualtext", "string"]:
-        return py_wb.StringValue().unmarshal(data_value)
-    elif data_type == "commonsMedia":
-        raise NotImplementedError  # TODO
-    elif data_type == "external-id":
-        return py_wb.ExternalId().unmarshal(data_value)
-    elif data_type == "geo-shape":
-        raise NotImplementedError  # TODO
-    elif data_type == "globe-coordinate":
-        return py_wb.GeoLocation().unmarshal(data_value)
-    elif data_type == "math":
-        raise NotImplementedError  # TODO
-    elif data_type == "quantity":
-        return py_wb.Quantity().unmarshal(data_value)
-    elif data_type == "tabular-data":
-        raise NotImplementedError  # TODO
-    elif data_type == "time":
-        raise NotImplementedError  # TODO
-    elif data_type == "url":
-        raise NotImplementedError  # TODO
-    elif data_type == "wikibase-form":
-        raise NotImplementedError  # TODO
-    elif data_type == "wikibase-lexeme":
-        raise NotImplementedError  # TODO
-    elif data_type == "wikibase-sense":
-        raise NotImplementedError  # TODO
-
-    # Entity
-    elif data_type == "wikibase-item":
-        item = py_wb.Item()
-        item.entity_id = data_value["value"]["id"]
-        return item
-    elif data_type == "wikibase-property":
-        prop = py_wb.Property()
-        prop.entity_id = data_value["value"]["id"]
-        return prop
-
-    else:
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param main_snak: Snak provided by the Wikibase API
+    :type main_snak: dict
+    :return: Value (``None`` if snak type is "novalue" or "somevalue")
+    :rtype: Value
+    """
+    if main_snak["snaktype"] != "value":
+        return None
+    data_type = main_snak.get("datatype", "string")
+    unmarshal_fn = data_value_unmarshallers.get(data_type)
+    if unmarshal_fn is None:
+        if py_wb.unknown_data_types == "raw":
+            return py_wb.UnknownValue().unmarshal(main_snak["datavalue"], data_type)
         raise NotImplementedError(f'No unmarshalling function for data type "{data_type}" defined')
+    return unmarshal_fn(py_wb, main_snak["datavalue"])
+
+
+def marshal_snak(prop, value, snak_type):
+    """Return the snak (property-value pair) in the format used by the Wikibase API
+
+    :param prop: Property of the snak
+    :type prop: Property
+    :param value: Value of the snak (``None`` if snak type is "novalue" or "somevalue")
+    :type value: Value
+    :param snak_type: Value type (one of ``["value", "novalue", "somevalue"]``)
+    :type snak_type: str
+    :return: Snak
+    :rtype: dict
+    """
+    snak = {"snaktype": snak_type, "property": prop.entity_id}
+    if snak_type == "value":
+        value_class = value.__class__.__name__
+        if value_class == "UnknownValue":
+            value_type = value.value_type
+        else:
+            value_type = class_to_value_type[value_class]
+        snak["datavalue"] = {"value": value.marshal(), "type": value_type}
+    return snak
 
 
 def check_data_type(value, prop):
@@ -2,6 +2,8 @@ from python_wikibase.data_types.data_type import DataType
 
 
 class ExternalId(DataType):
+    __slots__ = ("external_id",)
+
     def __init__(self, py_wb, api, language):
         super().__init__(py_wb, api, language)
         self.external_id = None
@@ -2,6 +2,8 @@ from python_wikibase.data_types.data_type import DataType
 
 
 class GeoLocation(DataType):
+    __slots__ = ("latitude", "longitude", "altitude", "precision", "globe")
+
     def __init__(self, py_wb, api, language):
         super().__init__(py_wb, api, language)
         self.latitude = None
@@ -0,0 +1,57 @@
+from python_wikibase.data_types.data_type import DataType
+
+
+class LexemeEntityValue(DataType):
+    """Reference to a lexeme or to one of its forms or senses (lexemes can't be fetched or edited
+    using python-wikibase, so only the ID is stored)"""
+
+    __slots__ = ("entity_id",)
+
+    entity_type = None  # "lexeme", "form" or "sense"
+
+    def __init__(self, py_wb, api, language):
+        super().__init__(py_wb, api, language)
+        self.entity_id = None
+
+    def __str__(self):
+        return self.entity_id
+
+    def unmarshal(self, data_value):
+        self.entity_id = data_value["value"]["id"]
+        return self
+
+    def marshal(self):
+        return {"entity-type": self.entity_type, "id": self.entity_id}
+
+    def create(self, entity_id):
+        self.entity_id = entity_id
+        return self
+
+
+class Lexeme(LexemeEntityValue):
+    """Reference to a lexeme (e.g. "L1")"""
+
+    __slots__ = ()
+
+    entity_type = "lexeme"
+
+    def marshal(self):
+        marshalled = super().marshal()
+        marshalled["numeric-id"] = int(self.entity_id[1:])
+        return marshalled
+
+
+class Form(LexemeEntityValue):
+    """Reference to a form of a lexeme (e.g. "L1-F1")"""
+
+    __slots__ = ()
+
+    entity_type = "form"
+
+
+class Sense(LexemeEntityValue):
+    """Reference to a sense of a lexeme (e.g. "L1-S1")"""
+
+    __slots__ = ()
+
+    entity_type = "sense"
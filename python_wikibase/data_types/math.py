@@ -0,0 +1,23 @@
+from python_wikibase.data_types.data_type import DataType
+
+
+class Math(DataType):
+    __slots__ = ("formula",)
+
+    def __init__(self, py_wb, api, language):
+        super().__init__(py_wb, api, language)
+        self.formula = None  # TeX formula (e.g. "E = mc^2")
+
+    def __str__(self):
+        return self.formula
+
+    def unmarshal(self, data_value):
+        self.formula = data_value["value"]
+        return self
+
+    def marshal(self):
+        return self.formula
+
+    def create(self, formula):
+        self.formula = formula
+        return self
@@ -0,0 +1,33 @@
+from python_wikibase.data_types.data_type import DataType
+
+
+class MonolingualText(DataType):
+    __slots__ = ("text", "text_language")
+
+    def __init__(self, py_wb, api, language):
+        super().__init__(py_wb, api, language)
+        self.text = None
+        self.text_language = None
+
+    def __str__(self):
+        return self.text
+
+    def unmarshal(self, data_value):
+        text_value = data_value["value"]
+        self.text = text_value["text"]
+        self.text_language = text_value["language"]
+        return self
+
+    def marshal(self):
+        return {"text": self.text, "language": self.text_language}
+
+    def create(self, text, language=None):
+        """
+        :param text: Text
+        :type text: str
+        :param language: Language of the text (default: the language of the PyWikibase object)
+        :type language: str
+        """
+        self.text = text
+        self.text_language = language or self.language
+        return self
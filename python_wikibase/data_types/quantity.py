@@ -3,6 +3,8 @@ from python_wikibase.data_types.data_type import DataType
 
 
 class Quantity(DataType):
+    __slots__ = ("amount", "unit")
+
     @staticmethod
     def parse_number(value):
         """Parse and return number (string, float or int) as int or float"""
@@ -2,6 +2,8 @@ from python_wikibase.data_types.data_type import DataType
 
 
 class StringValue(DataType):
+    __slots__ = ("value",)
+
     def __init__(self, py_wb, api, language):
         super().__init__(py_wb, api, language)
         self.value = None
@@ -0,0 +1,23 @@
+from python_wikibase.data_types.data_type import DataType
+
+
+class Table(DataType):
+    __slots__ = ("page",)
+
+    def __init__(self, py_wb, api, language):
+        super().__init__(py_wb, api, language)
+        self.page = None  # Tabular data page on Wikimedia Commons (e.g. "Data:Population.tab")
+
+    def __str__(self):
+        return self.page
+
+    def unmarshal(self, data_value):
+        self.page = data_value["value"]
+        return self
+
+    def marshal(self):
+        return self.page
+
+    def create(self, page):
+        self.page = page
+        return self
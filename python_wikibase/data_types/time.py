@@ -0,0 +1,85 @@
+from datetime import date, datetime, timezone
+
+from python_wikibase.data_types.data_type import DataType
+
+# Calendar models (Wikibase uses the Wikidata concept URIs on all instances)
+GREGORIAN_CALENDAR = "http://www.wikidata.org/entity/Q1985727"
+JULIAN_CALENDAR = "http://www.wikidata.org/entity/Q1985786"
+
+# Precisions of time values
+PRECISION_YEAR = 9
+PRECISION_MONTH = 10
+PRECISION_DAY = 11
+PRECISION_HOUR = 12
+PRECISION_MINUTE = 13
+PRECISION_SECOND = 14
+
+
+def format_time(time):
+    """Return the date in the format used by Wikibase (e.g. "+2019-01-31T00:00:00Z"). Wikibase
+    doesn't store times with a precision finer than a day, so the time of day is always zeroed.
+    Timezone-aware datetimes are converted to UTC first
+
+    :param time: Date or time string (returned as is)
+    :type time: date or datetime or str
+    :return: Time string
+    :rtype: str
+    """
+    if isinstance(time, datetime):
+        if time.tzinfo is not None:
+            time = time.astimezone(timezone.utc)
+        time = time.date()
+    if isinstance(time, date):
+        return "+%04d-%02d-%02dT00:00:00Z" % (time.year, time.month, time.day)
+    return time
+
+
+class Time(DataType):
+    __slots__ = ("time", "precision", "timezone", "before", "after", "calendar_model")
+
+    def __init__(self, py_wb, api, language):
+        super().__init__(py_wb, api, language)
+        self.time = None  # Time string (e.g. "+2019-01-31T00:00:00Z")
+        self.precision = PRECISION_DAY
+        self.timezone = 0  # Offset from UTC in minutes
+        self.before = 0
+        self.after = 0
+        self.calendar_model = GREGORIAN_CALENDAR
+
+    def __str__(self):
+        return self.time
+
+    def unmarshal(self, data_value):
+        time_value = data_value["value"]
+        self.time = time_value["time"]
+        self.precision = time_value["precision"]
+        self.timezone = time_value.get("timezone", 0)
+        self.before = time_value.get("before", 0)
+        self.after = time_value.get("after", 0)
+        self.calendar_model = time_value.get("calendarmodel", GREGORIAN_CALENDAR)
+        return self
+
+    def marshal(self):
+        return {
+            "time": self.time,
+            "precision": self.precision,
+            "timezone": self.timezone,
+            "before": self.before,
+            "after": self.after,
+            "calendarmodel": self.calendar_model,
+        }
+
+    def create(self, time, precision=PRECISION_DAY, calendar_model=GREGORIAN_CALENDAR):
+        """
+        :param time: Date, datetime or time string in the format used by Wikibase (e.g.
+            "+2019-01-31T00:00:00Z")
+        :type time: date or datetime or str
+        :param precision: Precision of the time (e.g. ``PRECISION_YEAR``)
+        :type precision: int
+        :param calendar_model: URI of the calendar model
+        :type calendar_model: str
+        """
+        self.time = format_time(time)
+        self.precision = precision
+        self.calendar_model = calendar_model
+        return self
@@ -0,0 +1,30 @@
+from python_wikibase.data_types.data_type import DataType
+
+
+class UnknownValue(DataType):
+    """Value of a data type for which no unmarshalling function is registered. Only created if
+    ``PyWikibase`` is configured with ``unknown_data_types="raw"``. The raw data value is kept, so
+    the value can still be marshalled again (e.g. when saving the claim holding it)"""
+
+    __slots__ = ("data_type", "value_type", "value")
+
+    def __init__(self, py_wb, api, language):
+        super().__init__(py_wb, api, language)
+        self.data_type = None  # Wikibase data type (e.g. "musical-notation")
+        self.value_type = None  # Type of the data value (e.g. "string")
+        self.value = None  # Raw value as provided by the Wikibase API
+
+    def unmarshal(self, data_value, data_type=None):
+        self.data_type = data_type
+        self.value_type = data_value["type"]
+        self.value = data_value["value"]
+        return self
+
+    def marshal(self):
+        return self.value
+
+    def create(self, value, value_type, data_type=None):
+        self.data_type = data_type
+        self.value_type = value_type
+        self.value = value
+        return self
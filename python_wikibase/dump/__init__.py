@@ -0,0 +1,4 @@
+from python_wikibase.dump.parallel import map_dump, map_reduce_dump
+from python_wikibase.dump.reader import open_dump, read_dump, read_entity_data
+
+__all__ = ["map_dump", "map_reduce_dump", "open_dump", "read_dump", "read_entity_data"]
@@ -0,0 +1,237 @@
+import os
+from multiprocessing import Pool
+
+from python_wikibase.dump.reader import (
+    get_compression,
+    open_dump,
+    parse_dump_line,
+    unmarshal_dump_entity,
+)
+
+# Number of uncompressed bytes processed by a worker at a time
+DEFAULT_SHARD_SIZE = 64 * 1024 * 1024
+
+# Number of lines of a compressed dump which are sent to a worker at a time
+LINES_PER_BATCH = 1000
+
+# State of the worker processes (set by ``_init_worker``)
+_worker = {}
+
+
+def get_shards(path, shard_size=DEFAULT_SHARD_SIZE):
+    """Split an uncompressed dump file into byte ranges. The ranges don't need to start or end at
+    line breaks: every line belongs to the shard in which it starts
+
+    :param path: Path of the uncompressed dump file
+    :type path: str
+    :param shard_size: Size of the shards in bytes
+    :type shard_size: int
+    :return: List of tuples of the form ``(start, end)``
+    :rtype: list(tuple)
+    """
+    size = os.path.getsize(path)
+    return [(start, min(start + shard_size, size)) for start in range(0, size, shard_size)]
+
+
+def read_shard_lines(path, start, end):
+    """Read all lines starting within the specified byte range of an uncompressed file
+
+    :param path: Path of the uncompressed dump file
+    :type path: str
+    :param start: Start of the byte range
+    :type start: int
+    :param end: End of the byte range (exclusive)
+    :type end: int
+    :return: Generator yielding the lines
+    :rtype: generator(bytes)
+    """
+    with open(path, "rb") as f:
+        if start > 0:
+            # Skip the line which has started in the previous shard
+            f.seek(start - 1)
+            f.readline()
+        position = f.tell()
+        while position < end:
+            line = f.readline()
+            if not line:
+                break
+            yield line
+            position += len(line)
+
+
+def _init_worker(api_url, language, unknown_data_types, map_fn, reduce_fn, entity_types):
+    """Create the objects used by a worker process"""
+    # Imported here to avoid a circular import (PyWikibase provides the dump functions)
+    from python_wikibase.python_wikibase import PyWikibase
+
+    _worker["py_wb"] = PyWikibase(
+        api_url=api_url, language=language, cache=False, unknown_data_types=unknown_data_types
+    )
+    _worker["map_fn"] = map_fn
+    _worker["reduce_fn"] = reduce_fn
+    _worker["entity_types"] = entity_types
+
+
+def _process_lines(lines):
+    """Unmarshal the entities on the provided lines and apply the map (and reduce) function to
+    them
+
+    :param lines: Lines of the dump
+    :type lines: iterable(bytes)
+    :return: Tuple of the form ``(count, result)``. If a reduce function has been provided,
+        ``result`` is the reduced value of all mapped entities. Otherwise, it is a list of all
+        mapped values. ``count`` is the number of mapped values which aren't ``None``
+    :rtype: tuple
+    """
+    py_wb = _worker["py_wb"]
+    map_fn = _worker["map_fn"]
+    reduce_fn = _worker["reduce_fn"]
+
+    count = 0
+    result = None if reduce_fn else []
+    for line in lines:
+        entity_data = parse_dump_line(line)
+        if entity_data is None:
+            continue
+        entity = unmarshal_dump_entity(py_wb, entity_data, _worker["entity_types"])
+        if entity is None:
+            continue
+        value = map_fn(entity)
+        if value is None:
+            continue
+        if reduce_fn is None:
+            result.append(value)
+        elif count == 0:
+            result = value
+        else:
+            result = reduce_fn(result, value)
+        count += 1
+    return count, result
+
+
+def _process_shard(shard):
+    path, start, end = shard
+    return _process_lines(read_shard_lines(path, start, end))
+
+
+def _read_line_batches(path):
+    """Read the lines of a (compressed) dump in batches
+
+    :param path: Path of the dump file
+    :type path: str
+    :return: Generator yielding lists of lines
+    :rtype: generator(list(bytes))
+    """
+    with open_dump(path) as f:
+        batch = []
+        for line in f:
+            batch.append(line)
+            if len(batch) == LINES_PER_BATCH:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _map_dump_chunks(py_wb, path, map_fn, reduce_fn, processes, entity_types, shard_size):
+    """Process the dump in a pool of worker processes
+
+    :return: Generator yielding the ``(count, result)`` tuples of all chunks (see
+        :func:`_process_lines`) as soon as they are available
+    :rtype: generator(tuple)
+    """
+    initargs = (
+        py_wb.api.api.base_url,
+        py_wb.language,
+        py_wb.unknown_data_types,
+        map_fn,
+        reduce_fn,
+        entity_types,
+    )
+    with Pool(processes, initializer=_init_worker, initargs=initargs) as pool:
+        if get_compression(path) is not None:
+            # Compressed dumps can only be read sequentially: Decompress them in this process and
+            # send batches of lines to the workers
+            chunk_results = pool.imap_unordered(_process_lines, _read_line_batches(path))
+        else:
+            # Every worker reads its own byte ranges of uncompressed dumps
+            shards = [(path, start, end) for start, end in get_shards(path, shard_size)]
+            chunk_results = pool.imap_unordered(_process_shard, shards)
+        yield from chunk_results
+
+
+def map_dump(py_wb, path, map_fn, processes=None, entity_types=None, shard_size=DEFAULT_SHARD_SIZE):
+    """Apply the function to all items and properties of a Wikibase JSON dump using a pool of
+    worker processes. Uncompressed dumps are split into shards (byte ranges) which are read by the
+    workers in parallel. Compressed dumps (gzip or bz2) are decompressed in the calling process,
+    the entities are then unmarshalled and mapped by the workers
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param path: Path of the dump file
+    :type path: str
+    :param map_fn: Function which is called with every ``Item`` and ``Property`` and returns the
+        value to yield (or ``None`` to skip the entity). The function is called in the worker
+        processes, so it must be picklable (e.g. defined at the top level of a module)
+    :type map_fn: function
+    :param processes: Number of worker processes (default: number of CPUs)
+    :type processes: int
+    :param entity_types: Types of entities to process (default: ``["item", "property"]``)
+    :type entity_types: list(str)
+    :param shard_size: Size of the shards of uncompressed dumps in bytes
+    :type shard_size: int
+    :return: Generator yielding the return values of ``map_fn`` (unordered)
+    :rtype: generator
+    """
+    for _, values in _map_dump_chunks(
+        py_wb, path, map_fn, None, processes, entity_types, shard_size
+    ):
+        yield from values
+
+
+def map_reduce_dump(
+    py_wb,
+    path,
+    map_fn,
+    reduce_fn,
+    initial=None,
+    processes=None,
+    entity_types=None,
+    shard_size=DEFAULT_SHARD_SIZE,
+):
+    """Apply the map function to all items and properties of a Wikibase JSON dump and combine the
+    results using the reduce function (see :func:`map_dump`). Results are reduced in the worker
+    processes first, so only one value per shard is sent back to the calling process
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param path: Path of the dump file
+    :type path: str
+    :param map_fn: Function which is called with every ``Item`` and ``Property`` and returns the
+        value to reduce (or ``None`` to skip the entity). Must be picklable
+    :type map_fn: function
+    :param reduce_fn: Function which combines two values into one (e.g. ``operator.add``). The
+        order in which values are combined is undefined, so the function must be associative and
+        commutative. Must be picklable
+    :type reduce_fn: function
+    :param initial: Value to combine the first result with
+    :type initial: any
+    :param processes: Number of worker processes (default: number of CPUs)
+    :type processes: int
+    :param entity_types: Types of entities to process (default: ``["item", "property"]``)
+    :type entity_types: list(str)
+    :param shard_size: Size of the shards of uncompressed dumps in bytes
+    :type shard_size: int
+    :return: Reduced value (``initial`` if no entity has been mapped to a value)
+    :rtype: any
+    """
+    result = initial
+    has_result = initial is not None
+    for count, value in _map_dump_chunks(
+        py_wb, path, map_fn, reduce_fn, processes, entity_types, shard_size
+    ):
+        if count == 0:
+            continue
+        result = reduce_fn(result, value) if has_result else value
+        has_result = True
+    return result
@@ -0,0 +1,119 @@
+import bz2
+import gzip
+import json
+
+from python_wikibase.data_model.entity import new_entity
+
+# Magic numbers at the start of compressed files
+GZIP_MAGIC = b"\x1f\x8b"
+BZ2_MAGIC = b"BZh"
+
+
+def get_compression(path):
+    """Detect the compression of a dump file by its first bytes
+
+    :param path: Path of the dump file
+    :type path: str
+    :return: "gzip", "bz2" or ``None`` if the file isn't compressed
+    :rtype: str
+    """
+    with open(path, "rb") as f:
+        magic = f.read(3)
+    if magic.startswith(GZIP_MAGIC):
+        return "gzip"
+    elif magic.startswith(BZ2_MAGIC):
+        return "bz2"
+    return None
+
+
+def open_dump(path):
+    """Open a JSON dump file for reading. Compressed files (gzip or bz2) are detected by their first
+    bytes and decompressed incrementally while reading
+
+    :param path: Path of the (compressed or uncompressed) dump file
+    :type path: str
+    :return: File object which returns the dump's decompressed content as bytes
+    :rtype: file
+    """
+    compression = get_compression(path)
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    elif compression == "bz2":
+        return bz2.open(path, "rb")
+    else:
+        return open(path, "rb")
+
+
+def parse_dump_line(line):
+    """Parse a line of a JSON dump. Wikibase dumps are JSON arrays with one entity per line, so
+    the brackets of the array and the commas after the entities need to be removed
+
+    :param line: Line of the dump
+    :type line: bytes
+    :return: Data of the entity (``None`` if the line doesn't contain an entity)
+    :rtype: dict
+    """
+    line = line.strip()
+    if line.endswith(b","):
+        line = line[:-1]
+    if not line or line == b"[" or line == b"]":
+        return None
+    return json.loads(line)
+
+
+def read_entity_data(path):
+    """Read the data of all entities from a JSON dump. Only one line of the dump is kept in memory
+    at a time
+
+    :param path: Path of the (compressed or uncompressed) dump file
+    :type path: str
+    :return: Generator yielding the data of every entity in the dump (in the format used by the
+        Wikibase API)
+    :rtype: generator(dict)
+    """
+    with open_dump(path) as f:
+        for line in f:
+            entity = parse_dump_line(line)
+            if entity is not None:
+                yield entity
+
+
+def unmarshal_dump_entity(py_wb, entity, entity_types=None):
+    """Create an item or property from the data of an entity in a dump
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param entity: Data of the entity
+    :type entity: dict
+    :param entity_types: Types of entities to unmarshal (default: ``["item", "property"]``)
+    :type entity_types: list(str)
+    :return: New entity (``None`` if it isn't of one of the specified types)
+    :rtype: Entity
+    """
+    if entity_types is None:
+        entity_types = ["item", "property"]
+    if entity["type"] not in entity_types:
+        return None
+    return new_entity(py_wb, entity["type"]).unmarshal(entity)
+
+
+def read_dump(py_wb, path, entity_types=None):
+    """Read a Wikibase JSON dump (e.g. ``latest-all.json.gz`` from
+    https://dumps.wikimedia.org/wikidatawiki/entities) and create ``Item`` and ``Property``
+    objects for its entities. The dump is streamed, so the memory usage doesn't depend on its size.
+    No API requests are made
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param path: Path of the (compressed or uncompressed) dump file
+    :type path: str
+    :param entity_types: Types of entities to read (default: ``["item", "property"]``). Entities of
+        other types (e.g. lexemes) are skipped
+    :type entity_types: list(str)
+    :return: Generator yielding an ``Item`` or ``Property`` for every entity in the dump
+    :rtype: generator(Entity)
+    """
+    for entity in read_entity_data(path):
+        entity_obj = unmarshal_dump_entity(py_wb, entity, entity_types)
+        if entity_obj is not None:
+            yield entity_obj
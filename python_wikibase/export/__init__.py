@@ -0,0 +1,3 @@
+from python_wikibase.export.claim_table import ClaimTable, export_claims
+
+__all__ = ["ClaimTable", "export_claims"]
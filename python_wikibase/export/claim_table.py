@@ -0,0 +1,203 @@
+from array import array
+
+# Number of rows of the tables returned by ``export_claims``
+DEFAULT_CHUNK_SIZE = 100000
+
+# Columns holding strings (``None`` for missing values)
+STRING_COLUMNS = [
+    "entity_id",
+    "claim_id",
+    "property",
+    "snak_type",
+    "rank",
+    "data_type",
+    "string",
+    "language",
+    "time",
+    "entity",
+    "unit",
+    "globe",
+]
+
+# Columns holding floats (NaN for missing values)
+FLOAT_COLUMNS = ["amount", "latitude", "longitude", "altitude", "geo_precision", "time_precision"]
+
+COLUMNS = STRING_COLUMNS + FLOAT_COLUMNS
+
+
+def _entity_columns(value):
+    return {"entity": value.entity_id}
+
+
+def _string_columns(value):
+    # The value classes of data types with string values don't use the same attribute name
+    return {"string": str(value)}
+
+
+def _geo_location_columns(value):
+    return {
+        "latitude": value.latitude,
+        "longitude": value.longitude,
+        "altitude": value.altitude,
+        "geo_precision": value.precision,
+        "globe": value.globe,
+    }
+
+
+def _quantity_columns(value):
+    return {
+        "amount": value.amount,
+        "unit": value.unit.entity_id if value.unit is not None else None,
+    }
+
+
+def _monolingual_text_columns(value):
+    return {"string": value.text, "language": value.text_language}
+
+
+def _time_columns(value):
+    return {"time": value.time, "time_precision": value.precision}
+
+
+# Functions returning the column values for the value of a claim (by class name of the value)
+value_columns = {
+    "CommonsMedia": _string_columns,
+    "ExternalId": _string_columns,
+    "Form": _entity_columns,
+    "GeoLocation": _geo_location_columns,
+    "GeoShape": _string_columns,
+    "Item": _entity_columns,
+    "Lexeme": _entity_columns,
+    "Math": _string_columns,
+    "MonolingualText": _monolingual_text_columns,
+    "Property": _entity_columns,
+    "Quantity": _quantity_columns,
+    "Sense": _entity_columns,
+    "StringValue": _string_columns,
+    "Table": _string_columns,
+    "Time": _time_columns,
+    "Url": _string_columns,
+}
+
+
+class ClaimTable:
+    """Claims in columnar form: every column is a sequence with one entry per claim. String columns
+    are lists (with ``None`` for missing values), numeric columns are ``array.array("d")`` objects
+    (with NaN for missing values), which can be wrapped by NumPy without copying (e.g.
+    ``numpy.frombuffer(table.columns["amount"])``)
+
+    Columns:
+
+    - ``entity_id``, ``claim_id``, ``property``, ``snak_type``, ``rank``
+    - ``data_type``: Class name of the value (e.g. "Quantity", ``None`` if there is no value)
+    - ``string``: Values with string data (e.g. ``StringValue``, ``Url`` or ``MonolingualText``)
+    - ``language``: Language of ``MonolingualText`` values
+    - ``time``, ``time_precision``: Time string and precision (e.g. ``PRECISION_DAY``) of ``Time``
+      values
+    - ``entity``: ID of ``Item``, ``Property``, ``Lexeme``, ``Form`` and ``Sense`` values
+    - ``amount``, ``unit``: Amount and unit item ID of ``Quantity`` values
+    - ``latitude``, ``longitude``, ``altitude``, ``geo_precision``, ``globe``: ``GeoLocation``
+      values (``geo_precision`` is the precision in degrees)
+    """
+
+    def __init__(self):
+        self.columns = {column: [] for column in STRING_COLUMNS}
+        self.columns.update({column: array("d") for column in FLOAT_COLUMNS})
+
+    def __len__(self):
+        return len(self.columns["claim_id"])
+
+    def append(self, entity_id, claim):
+        """Add a row for the claim to the table
+
+        :param entity_id: ID of the entity holding the claim
+        :type entity_id: str
+        :param claim: Claim to add
+        :type claim: Claim
+        """
+        row = {
+            "entity_id": entity_id,
+            "claim_id": claim.claim_id,
+            "property": claim.property.entity_id,
+            "snak_type": claim.snak_type,
+            "rank": claim.rank,
+        }
+        if claim.snak_type == "value" and claim.value is not None:
+            data_type = claim.value.__class__.__name__
+            row["data_type"] = data_type
+            get_columns = value_columns.get(data_type)
+            if get_columns:
+                row.update(get_columns(claim.value))
+
+        for column in STRING_COLUMNS:
+            self.columns[column].append(row.get(column))
+        for column in FLOAT_COLUMNS:
+            number = row.get(column)
+            self.columns[column].append(float("nan") if number is None else number)
+
+    def to_pandas(self):
+        """Return the table as a pandas ``DataFrame`` (requires the ``pandas`` package)
+
+        :return: Data frame with one row per claim
+        :rtype: pandas.DataFrame
+        """
+        try:
+            import numpy
+            import pandas
+        except ImportError:
+            raise ImportError(
+                "The pandas package is required for converting claim tables"
+            ) from None
+        data = {column: self.columns[column] for column in STRING_COLUMNS}
+        data.update(
+            {column: numpy.array(self.columns[column], dtype="float64") for column in FLOAT_COLUMNS}
+        )
+        return pandas.DataFrame(data, columns=COLUMNS)
+
+    def to_arrow(self):
+        """Return the table as a PyArrow ``Table`` (requires the ``pyarrow`` package), which can
+        e.g. be written to a Parquet file using ``pyarrow.parquet.write_table``
+
+        :return: Arrow table with one row per claim
+        :rtype: pyarrow.Table
+        """
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError(
+                "The pyarrow package is required for converting claim tables"
+            ) from None
+        arrays = [
+            pyarrow.array(self.columns[column], pyarrow.string()) for column in STRING_COLUMNS
+        ]
+        arrays += [
+            pyarrow.array(self.columns[column], pyarrow.float64()) for column in FLOAT_COLUMNS
+        ]
+        return pyarrow.Table.from_arrays(arrays, names=COLUMNS)
+
+
+def export_claims(entities, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Convert the claims of the entities into columnar tables. The tables are built in chunks of
+    ``chunk_size`` rows, so the memory usage is bounded if ``entities`` is a generator (e.g. the
+    one returned by ``PyWikibase.read_dump``)
+
+    :param entities: Entities whose claims should be exported
+    :type entities: iterable(Entity)
+    :param chunk_size: Maximum number of rows per table
+    :type chunk_size: int
+    :return: Generator yielding the tables
+    :rtype: generator(ClaimTable)
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    table = ClaimTable()
+    for entity in entities:
+        if entity.claims is None:
+            continue
+        for claim in entity.claims:
+            table.append(entity.entity_id, claim)
+            if len(table) == chunk_size:
+                yield table
+                table = ClaimTable()
+    if len(table) > 0:
+        yield table
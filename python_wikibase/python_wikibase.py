@@ -13,7 +13,42 @@ from python_wikibase.data_model import (
     Reference,
     References,
 )
-from python_wikibase.data_types import ExternalId, GeoLocation, Quantity, StringValue
+from python_wikibase.data_model.claim import add_statements, remove_claims
+from python_wikibase.data_model.entity import (
+    MAX_ENTITIES_PER_REQUEST,
+    check_props,
+    fetch_entity_data,
+    get_entities,
+    refresh_entities,
+    unmarshal_entities,
+)
+from python_wikibase.data_model.property_types import create_property_types, load_property_types
+from python_wikibase.data_model.reference import add_references
+from python_wikibase.data_types import (
+    CommonsMedia,
+    ExternalId,
+    Form,
+    GeoLocation,
+    GeoShape,
+    Lexeme,
+    Math,
+    MonolingualText,
+    Quantity,
+    Sense,
+    StringValue,
+    Table,
+    Time,
+    UnknownValue,
+    Url,
+)
+from python_wikibase.data_types.data_type import check_unknown_data_types
+from python_wikibase.dump import map_dump, map_reduce_dump, read_dump
+from python_wikibase.utils.cache import create_cache
+from python_wikibase.utils.chunks import chunks, unique
+from python_wikibase.utils.concurrency import ThreadLocalApi, map_concurrently
+from python_wikibase.utils.instrumentation import Instrumentation, instrument_requests
+from python_wikibase.utils.retry import retry_requests
+from python_wikibase.utils.scheduler import schedule_edits
 
 DEFAULT_CONFIG = {
     "api_url": "https://www.wikidata.org/w/api.php",
@@ -36,6 +71,12 @@ class PyWikibase:
         config_path=None,
         # Other params
         language="en",
+        cache=False,
+        unknown_data_types="raise",
+        property_types=None,
+        edit_scheduler=None,
+        retry_policy=None,
+        observers=None,
     ):
         # Create instance of wikibase-api's Wikibase class (includes authentication)
         self.api = WikibaseApi(
@@ -48,6 +89,41 @@ class PyWikibase:
         )
         self.language = language
 
+        # Cache for the data of fetched entities (``None`` if caching is disabled, which is the
+        # default). Can be set to ``True`` (in-memory LRU cache with TTL), ``False`` or an
+        # ``EntityCache`` object
+        self.cache = create_cache(cache)
+
+        # Handling of values of data types without unmarshalling function: "raise" (raise a
+        # ``NotImplementedError``) or "raw" (return ``UnknownValue`` objects holding the raw data)
+        check_unknown_data_types(unknown_data_types)
+        self.unknown_data_types = unknown_data_types
+
+        # Registry of the data types of properties, which are used for validating new claims,
+        # qualifiers and references. Can be set to the path of a JSON file to persist the registry
+        self.property_types = create_property_types(property_types)
+
+        # Scheduler pacing the edits (``None`` if edits are made without delay)
+        self.edit_scheduler = edit_scheduler
+        if edit_scheduler is not None:
+            schedule_edits(self.api, edit_scheduler)
+
+        # Policy for retrying requests which have failed with a transient error (``None`` if
+        # errors are raised immediately)
+        self.retry_policy = retry_policy
+        if retry_policy is not None:
+            retry_requests(self.api, retry_policy)
+
+        # Observers which are called with an ``ApiCallEvent`` after every API call
+        self.instrumentation = Instrumentation(observers)
+        instrument_requests(self.api, self.instrumentation)
+
+        # Active edit sessions (entity ID -> EditSession)
+        self.edit_sessions = {}
+
+        # Context shared by the data model objects (see base.Context)
+        self.context = None
+
     # Data model
 
     def Aliases(self):
@@ -85,14 +161,280 @@ class PyWikibase:
 
     # Data types
 
+    def CommonsMedia(self):
+        return CommonsMedia(self, self.api, self.language)
+
     def ExternalId(self):
         return ExternalId(self, self.api, self.language)
 
+    def Form(self):
+        return Form(self, self.api, self.language)
+
     def GeoLocation(self):
         return GeoLocation(self, self.api, self.language)
 
+    def GeoShape(self):
+        return GeoShape(self, self.api, self.language)
+
+    def Lexeme(self):
+        return Lexeme(self, self.api, self.language)
+
+    def Math(self):
+        return Math(self, self.api, self.language)
+
+    def MonolingualText(self):
+        return MonolingualText(self, self.api, self.language)
+
     def Quantity(self):
         return Quantity(self, self.api, self.language)
 
+    def Sense(self):
+        return Sense(self, self.api, self.language)
+
     def StringValue(self):
         return StringValue(self, self.api, self.language)
+
+    def Table(self):
+        return Table(self, self.api, self.language)
+
+    def Time(self):
+        return Time(self, self.api, self.language)
+
+    def UnknownValue(self):
+        return UnknownValue(self, self.api, self.language)
+
+    def Url(self):
+        return Url(self, self.api, self.language)
+
+    # Properties
+
+    def load_property_types(self, prop_ids=None):
+        """Fetch the data types of properties (in batches) and save them in the property registry,
+        so they don't need to be requested when adding claims, qualifiers or references. If the
+        registry is persisted, the data types are only requested once across processes
+
+        :param prop_ids: IDs of the properties (default: all properties on the Wikibase instance)
+        :type prop_ids: list(str)
+        :return: Number of properties in the registry
+        :rtype: int
+        """
+        return load_property_types(self, prop_ids)
+
+    # Batch operations
+
+    def get_entities(self, entity_ids, props=None, languages=None):
+        """Fetch information about multiple entities (items and/or properties) from Wikibase. The
+        entity IDs are split up into batches so as few API requests as possible are made
+
+        :param entity_ids: IDs of the entities on Wikibase (e.g. ``["Q1", "P1"]``)
+        :type entity_ids: list(str)
+        :param props: Parts of the entities to fetch (some of ``ENTITY_PROPS``, default: all)
+        :type props: list(str)
+        :param languages: Languages to fetch labels, descriptions and aliases in (default: all)
+        :type languages: list(str)
+        :return: Dict mapping every entity ID to the fetched ``Item`` or ``Property`` (or to
+            ``None`` if no entity with the ID exists)
+        :rtype: dict
+        """
+        return get_entities(self, entity_ids, props, languages)
+
+    def refresh_entities(self, entities):
+        """Update multiple entities with their current data on Wikibase. Only the IDs of the
+        entities' latest revisions are requested first (in batches), the full data is then only
+        fetched for the entities which have been edited since they were fetched
+
+        :param entities: Entities to refresh (must have been fetched before)
+        :type entities: iterable(Entity)
+        :return: Dict mapping the IDs of all entities which have changed to the updated ``Item`` or
+            ``Property`` (or to ``None`` if the entity has been deleted)
+        :rtype: dict
+        """
+        return refresh_entities(self, entities)
+
+    def fetch_concurrently(
+        self, entity_ids, max_workers=4, ordered=False, props=None, languages=None
+    ):
+        """Fetch information about multiple entities (items and/or properties) from Wikibase using
+        a pool of threads. The entity IDs are split up into batches, which are requested in
+        parallel (every thread uses its own HTTP session)
+
+        :param entity_ids: IDs of the entities on Wikibase (e.g. ``["Q1", "P1"]``)
+        :type entity_ids: iterable(str)
+        :param max_workers: Maximum number of concurrent requests
+        :type max_workers: int
+        :param ordered: Whether entities should be yielded in the order of ``entity_ids``
+            (otherwise, they are yielded as soon as their batch has been fetched)
+        :type ordered: bool
+        :param props: Parts of the entities to fetch (some of ``ENTITY_PROPS``, default: all)
+        :type props: list(str)
+        :param languages: Languages to fetch labels, descriptions and aliases in (default: all)
+        :type languages: list(str)
+        :return: Generator yielding tuples of the form ``(entity_id, entity)``. ``entity`` is an
+            ``Item`` or ``Property`` (or ``None`` if no entity with the ID exists)
+        :rtype: generator(tuple)
+        """
+        check_props(props)
+        worker_apis = ThreadLocalApi(self.api)
+
+        def fetch_chunk(entity_id_chunk):
+            return list(
+                fetch_entity_data(worker_apis.get(), entity_id_chunk, self.cache, props, languages)
+            )
+
+        entity_id_chunks = chunks(unique(entity_ids), MAX_ENTITIES_PER_REQUEST)
+        for chunk_data in map_concurrently(fetch_chunk, entity_id_chunks, max_workers, ordered):
+            yield from unmarshal_entities(self, chunk_data, props, languages).items()
+
+    def create_items(self, specs, max_workers=4, ordered=False):
+        """Create multiple items using a pool of threads. Every item is created with a single API
+        request containing all of its data
+
+        :param specs: Data of the new items. Every spec is a dict with the parameters of
+            :meth:`Item.create` (e.g. ``{"label": "Item", "claims": [(prop, value)]}``)
+        :type specs: iterable(dict)
+        :param max_workers: Maximum number of concurrent requests
+        :type max_workers: int
+        :param ordered: Whether items should be yielded in the order of ``specs`` (otherwise, they
+            are yielded as soon as they have been created)
+        :type ordered: bool
+        :return: Generator yielding tuples of the form ``(spec, item)``
+        :rtype: generator(tuple)
+        """
+        worker_apis = ThreadLocalApi(self.api)
+
+        def create_item(spec):
+            item = self.Item()
+            return spec, item._create(item._marshal_new(**spec), api=worker_apis.get())
+
+        yield from map_concurrently(create_item, specs, max_workers, ordered)
+
+    def add_statements(self, specs, max_workers=4, ordered=False):
+        """Create claims (together with their qualifiers and references) on multiple entities using
+        a pool of threads. The claim IDs are generated locally, so every statement is saved with a
+        single "wbsetclaim" request and the statements don't need to wait for each other
+
+        The claims aren't added to the ``Item`` and ``Property`` objects you have fetched before
+        and edit sessions aren't taken into account, use :meth:`Claims.add_statements` for adding
+        claims to a single entity
+
+        :param specs: Data of the new claims. Every spec is a dict with the ID of the entity and
+            the parameters of :meth:`Claims.add_statement` (e.g. ``{"entity_id": "Q1", "prop":
+            prop, "value": value, "references": [(prop, value)]}``)
+        :type specs: iterable(dict)
+        :param max_workers: Maximum number of concurrent requests
+        :type max_workers: int
+        :param ordered: Whether claims should be yielded in the order of ``specs`` (otherwise, they
+            are yielded as soon as they have been created)
+        :type ordered: bool
+        :return: Generator yielding tuples of the form ``(spec, claim)``
+        :rtype: generator(tuple)
+        """
+        return add_statements(self, specs, max_workers, ordered)
+
+    def add_references(self, claims, snaks, max_workers=4):
+        """Add the same reference to multiple claims (e.g. to cite a source for all imported
+        statements). Every reference is created with its own "wbsetreference" request, the requests
+        are made using a pool of threads. The other qualifiers and references of the claims are
+        left untouched, even if they have been changed on Wikibase since the claims were fetched
+
+        The new references are added to the claims' local collections. For claims of entities with
+        an active edit session, the references are only created locally and saved with the session
+
+        :param claims: Claims to add the reference to
+        :type claims: iterable(Claim)
+        :param snaks: Snaks of the reference as a list of ``(prop, value)`` tuples
+        :type snaks: list(tuple(Property, Value))
+        :param max_workers: Maximum number of concurrent requests
+        :type max_workers: int
+        :return: New references (in the order of ``claims``)
+        :rtype: list(Reference)
+        """
+        return add_references(self, claims, snaks, max_workers)
+
+    def remove_claims(self, claims, max_workers=4):
+        """Delete claims of multiple entities. The claims are grouped by entity and deleted using
+        one "wbremoveclaims" request for every ``MAX_CLAIMS_PER_REQUEST`` claims, the claims of
+        different entities are deleted using a pool of threads. If a request fails, its claims are
+        split up to find the ones which can't be deleted, the others are deleted nevertheless
+
+        The local claim collections of the entities aren't updated (unless an edit session is
+        active for the entity), use :meth:`Claims.remove_many` for removing claims of an entity
+        you have fetched
+
+        :param claims: Claims to delete
+        :type claims: iterable(Claim)
+        :param max_workers: Maximum number of concurrent requests
+        :type max_workers: int
+        :return: Dict mapping the IDs of the claims which couldn't be deleted to an ``EditError``
+            (empty if all claims have been deleted)
+        :rtype: dict
+        """
+        return remove_claims(self, claims, max_workers)
+
+    # Dumps
+
+    def read_dump(self, path, entity_types=None):
+        """Read a Wikibase JSON dump (gzip/bz2-compressed or uncompressed) and create ``Item`` and
+        ``Property`` objects for its entities. The dump is streamed, so the memory usage doesn't
+        depend on its size
+
+        :param path: Path of the dump file
+        :type path: str
+        :param entity_types: Types of entities to read (default: ``["item", "property"]``)
+        :type entity_types: list(str)
+        :return: Generator yielding an ``Item`` or ``Property`` for every entity in the dump
+        :rtype: generator(Entity)
+        """
+        return read_dump(self, path, entity_types)
+
+    def map_dump(self, path, map_fn, processes=None, entity_types=None):
+        """Apply the function to all entities of a Wikibase JSON dump using a pool of worker
+        processes (see :func:`python_wikibase.dump.map_dump`)
+
+        :param path: Path of the dump file
+        :type path: str
+        :param map_fn: Picklable function which is called with every entity and returns the value
+            to yield (or ``None`` to skip the entity)
+        :type map_fn: function
+        :param processes: Number of worker processes (default: number of CPUs)
+        :type processes: int
+        :param entity_types: Types of entities to process (default: ``["item", "property"]``)
+        :type entity_types: list(str)
+        :return: Generator yielding the return values of ``map_fn`` (unordered)
+        :rtype: generator
+        """
+        return map_dump(self, path, map_fn, processes=processes, entity_types=entity_types)
+
+    def map_reduce_dump(
+        self, path, map_fn, reduce_fn, initial=None, processes=None, entity_types=None
+    ):
+        """Apply the map function to all entities of a Wikibase JSON dump using a pool of worker
+        processes and combine the results using the reduce function (see
+        :func:`python_wikibase.dump.map_reduce_dump`)
+
+        :param path: Path of the dump file
+        :type path: str
+        :param map_fn: Picklable function which is called with every entity and returns the value
+            to reduce (or ``None`` to skip the entity)
+        :type map_fn: function
+        :param reduce_fn: Picklable, associative and commutative function which combines two
+            values into one
+        :type reduce_fn: function
+        :param initial: Value to combine the first result with
+        :type initial: any
+        :param processes: Number of worker processes (default: number of CPUs)
+        :type processes: int
+        :param entity_types: Types of entities to process (default: ``["item", "property"]``)
+        :type entity_types: list(str)
+        :return: Reduced value
+        :rtype: any
+        """
+        return map_reduce_dump(
+            self,
+            path,
+            map_fn,
+            reduce_fn,
+            initial=initial,
+            processes=processes,
+            entity_types=entity_types,
+        )
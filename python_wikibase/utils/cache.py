@@ -0,0 +1,257 @@
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from python_wikibase.utils.claim_ids import claim_id_to_entity_id
+
+
+class EntityCache(ABC):
+    """Abstract cache for the data of entities as returned by the Wikibase API. Entries are keyed
+    by entity ID and store the entity's ``lastrevid``, so data of an older revision never replaces
+    that of a newer one
+
+    Implementations need to count cache hits, misses and evictions in the ``hits``, ``misses`` and
+    ``evictions`` attributes"""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @abstractmethod
+    def get(self, entity_id):
+        """Return the cached data of the entity
+
+        :param entity_id: ID of the entity (e.g. "Q1")
+        :type entity_id: str
+        :return: Entity data (or ``None`` if the entity isn't cached)
+        :rtype: dict
+        """
+        pass
+
+    @abstractmethod
+    def set(self, entity_id, entity):
+        """Save the data of the entity in the cache
+
+        :param entity_id: ID of the entity (e.g. "Q1")
+        :type entity_id: str
+        :param entity: Data about the entity provided by the Wikibase API
+        :type entity: dict
+        """
+        pass
+
+    @abstractmethod
+    def invalidate(self, entity_id):
+        """Remove the entity from the cache (e.g. because it has been edited)
+
+        :param entity_id: ID of the entity (e.g. "Q1")
+        :type entity_id: str
+        """
+        pass
+
+    @abstractmethod
+    def clear(self):
+        """Remove all entities from the cache"""
+        pass
+
+    @abstractmethod
+    def __len__(self):
+        pass
+
+    def stats(self):
+        """Return the cache's counters
+
+        :return: Dict with the number of cache hits, misses and evictions and the current number of
+            cached entities
+        :rtype: dict
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self),
+        }
+
+
+class MemoryCache(EntityCache):
+    """In-memory entity cache. If more than ``max_size`` entities are cached, the least recently
+    used one is evicted. Entries expire ``ttl`` seconds after they have been saved
+
+    The entities are stored as JSON, so ``get`` returns a new dict every time and changes to it
+    (or to the dict passed to ``set``) don't affect the cache"""
+
+    def __init__(self, max_size=1000, ttl=300):
+        """
+        :param max_size: Maximum number of cached entities
+        :type max_size: int
+        :param ttl: Number of seconds after which a cached entity expires (``None`` for no expiry)
+        :type ttl: float
+        """
+        super().__init__()
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()  # Entity ID -> (expiry time, revision ID, entity data as JSON)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, entity_id):
+        with self.lock:
+            entry = self.entries.get(entity_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, _, data = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self.entries[entity_id]
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self.entries.move_to_end(entity_id)
+            self.hits += 1
+        return json.loads(data)
+
+    def set(self, entity_id, entity):
+        data = json.dumps(entity, ensure_ascii=False, separators=(",", ":"))
+        with self.lock:
+            revision_id = entity.get("lastrevid", 0)
+            entry = self.entries.get(entity_id)
+            if entry is not None and entry[1] > revision_id:
+                return
+            expires_at = None if self.ttl is None else time.monotonic() + self.ttl
+            self.entries[entity_id] = (expires_at, revision_id, data)
+            self.entries.move_to_end(entity_id)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, entity_id):
+        with self.lock:
+            self.entries.pop(entity_id, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class SqliteCache(EntityCache):
+    """Persistent entity cache which stores the entities' data in a local SQLite database. Cached
+    entities are kept across restarts, so entities which have been fetched by a previous process
+    don't need to be requested again. The database file can be shared by multiple processes"""
+
+    def __init__(self, path, ttl=None):
+        """
+        :param path: Path of the SQLite database file (it is created if it doesn't exist)
+        :type path: str
+        :param ttl: Number of seconds after which a cached entity expires (``None`` for no expiry)
+        :type ttl: float
+        """
+        super().__init__()
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS entities ("
+            "entity_id TEXT PRIMARY KEY, "
+            "revision_id INTEGER NOT NULL, "
+            "expires_at REAL, "
+            "data TEXT NOT NULL)"
+        )
+
+    def __len__(self):
+        with self.lock:
+            return self.connection.execute("SELECT COUNT(*) FROM entities").fetchone()[0]
+
+    def get(self, entity_id):
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT expires_at, data FROM entities WHERE entity_id = ?", (entity_id,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            expires_at, data = row
+            if expires_at is not None and expires_at <= time.time():
+                self.connection.execute("DELETE FROM entities WHERE entity_id = ?", (entity_id,))
+                self.evictions += 1
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(data)
+
+    def set(self, entity_id, entity):
+        expires_at = None if self.ttl is None else time.time() + self.ttl
+        data = json.dumps(entity, ensure_ascii=False, separators=(",", ":"))
+        revision_id = entity.get("lastrevid", 0)
+        with self.lock:
+            # Upserts ("ON CONFLICT DO UPDATE") require SQLite 3.24, so an existing row is replaced
+            # unless it holds a newer revision
+            self.connection.execute(
+                "INSERT OR REPLACE INTO entities (entity_id, revision_id, expires_at, data) "
+                "SELECT ?, ?, ?, ? WHERE NOT EXISTS ("
+                "SELECT 1 FROM entities WHERE entity_id = ? AND revision_id > ?)",
+                (entity_id, revision_id, expires_at, data, entity_id, revision_id),
+            )
+
+    def invalidate(self, entity_id):
+        with self.lock:
+            self.connection.execute("DELETE FROM entities WHERE entity_id = ?", (entity_id,))
+
+    def clear(self):
+        with self.lock:
+            self.connection.execute("DELETE FROM entities")
+
+    def close(self):
+        """Close the connection to the database"""
+        with self.lock:
+            self.connection.close()
+
+
+def create_cache(cache):
+    """Return the entity cache to use for the ``cache`` parameter of ``PyWikibase``
+
+    :param cache: ``True`` for a ``MemoryCache`` with the default settings, ``False``/``None`` to
+        disable caching, or an ``EntityCache`` object
+    :type cache: bool or EntityCache
+    :return: Entity cache (``None`` if caching is disabled)
+    :rtype: EntityCache
+    """
+    if cache is True:
+        return MemoryCache()
+    if not cache:
+        return None
+    if not isinstance(cache, EntityCache):
+        raise ValueError("cache parameter must be a boolean or instance of EntityCache class")
+    return cache
+
+
+def invalidate_entity(py_wb, entity_id):
+    """Remove the entity from the cache after it has been edited
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param entity_id: ID of the entity (e.g. "Q1")
+    :type entity_id: str
+    """
+    if py_wb.cache is not None and entity_id is not None:
+        py_wb.cache.invalidate(entity_id)
+
+
+def invalidate_claim_entity(py_wb, claim_id):
+    """Remove the entity holding the specified claim from the cache after the claim has been edited
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :param claim_id: ID of the claim (e.g. ``"Q1$8C67587E-79D5-4E8C-972C-A3C5F7ED06B3"``)
+    :type claim_id: str
+    """
+    if claim_id is not None:
+        invalidate_entity(py_wb, claim_id_to_entity_id(claim_id))
@@ -0,0 +1,29 @@
+def chunks(items, size):
+    """Split the provided items into lists of (at most) the specified size
+
+    :param items: Items to split up
+    :type items: iterable
+    :param size: Maximum number of items per chunk
+    :type size: int
+    :return: Generator yielding the chunks
+    :rtype: generator(list)
+    """
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def unique(items):
+    """Remove duplicates from the provided items while preserving their order
+
+    :param items: Items to deduplicate
+    :type items: iterable
+    :return: Deduplicated items
+    :rtype: list
+    """
+    return list(dict.fromkeys(items))
@@ -0,0 +1,24 @@
+import uuid
+
+
+def new_claim_id(entity_id):
+    """Generate a new claim ID (GUID) for the specified entity. Wikibase accepts client-generated
+    claim IDs of the form ``"{entity_id}${UUID}"``
+
+    :param entity_id: ID of the entity holding the claim (e.g. "Q1")
+    :type entity_id: str
+    :return: Claim ID (e.g. ``"Q1$8C67587E-79D5-4E8C-972C-A3C5F7ED06B3"``)
+    :rtype: str
+    """
+    return f"{entity_id}${str(uuid.uuid4()).upper()}"
+
+
+def claim_id_to_entity_id(claim_id):
+    """Return the ID of the entity holding the specified claim
+
+    :param claim_id: Claim ID (e.g. ``"Q1$8C67587E-79D5-4E8C-972C-A3C5F7ED06B3"``)
+    :type claim_id: str
+    :return: Entity ID (e.g. "Q1")
+    :rtype: str
+    """
+    return claim_id.split("$")[0]
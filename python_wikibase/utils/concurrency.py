@@ -0,0 +1,109 @@
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from wikibase_api import Wikibase as WikibaseApi
+
+from python_wikibase.utils.instrumentation import get_instrumentation, instrument_requests
+from python_wikibase.utils.retry import get_retry_policy, retry_requests
+from python_wikibase.utils.scheduler import get_scheduler, schedule_edits
+
+
+def clone_api(api):
+    """Create a copy of the wikibase-api object with its own HTTP session. The copy shares the
+    original's authentication (OAuth, login cookies and edit token), so it can be used for reads
+    and edits from another thread. Edits made using the copy are paced by the original's edit
+    scheduler, its requests are retried using the original's retry policy and its API calls are
+    reported to the original's observers
+
+    :param api: wikibase-api object to copy
+    :type api: Wikibase
+    :return: Copy of the wikibase-api object
+    :rtype: Wikibase
+    """
+    original = api.api
+    api_copy = WikibaseApi(
+        api_url=original.base_url, is_bot=original.is_bot, summary=original.summary
+    )
+    api_copy.api.session.auth = original.session.auth
+    api_copy.api.session.cookies.update(original.session.cookies)
+    api_copy.api.edit_token = original.edit_token
+    scheduler = get_scheduler(api)
+    if scheduler is not None:
+        schedule_edits(api_copy, scheduler)
+    policy = get_retry_policy(api)
+    if policy is not None:
+        retry_requests(api_copy, policy)
+    instrumentation = get_instrumentation(api)
+    if instrumentation is not None:
+        instrument_requests(api_copy, instrumentation)
+    return api_copy
+
+
+class ThreadLocalApi:
+    """Lazily create one copy of the wikibase-api object per thread (``requests`` sessions must not
+    be shared between threads)"""
+
+    def __init__(self, api):
+        self.api = api
+        self.local = threading.local()
+
+    def get(self):
+        """Return the wikibase-api object for the current thread
+
+        :return: wikibase-api object
+        :rtype: Wikibase
+        """
+        if not hasattr(self.local, "api"):
+            self.local.api = clone_api(self.api)
+        return self.local.api
+
+
+def map_concurrently(fn, items, max_workers, ordered=False):
+    """Apply the function to all items using a pool of threads. Items are submitted lazily, so at
+    most ``2 * max_workers`` of them are being processed or waiting to be yielded at any time
+
+    :param fn: Function to call with every item
+    :type fn: function
+    :param items: Items to pass to the function
+    :type items: iterable
+    :param max_workers: Maximum number of threads
+    :type max_workers: int
+    :param ordered: Whether results should be yielded in the order of the items (otherwise, they
+        are yielded as soon as they are available)
+    :type ordered: bool
+    :return: Generator yielding the function's return values
+    :rtype: generator
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    items = iter(items)
+    pending = deque()
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit_items():
+        while len(pending) < 2 * max_workers:
+            try:
+                item = next(items)
+            except StopIteration:
+                return
+            pending.append(executor.submit(fn, item))
+
+    try:
+        submit_items()
+        while pending:
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = next(f for f in pending if f in done)
+                pending.remove(future)
+            result = future.result()
+            submit_items()
+            yield result
+    finally:
+        # Don't start any new work if the generator is closed early or a call has failed
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
@@ -7,6 +7,7 @@ class_to_data_type = {
     "Item": "wikibase-item",
     "Lexeme": "wikibase-lexeme",
     "Math": "math",
+    "MonolingualText": "monolingualtext",
     "Property": "wikibase-property",
     "Quantity": "quantity",
     "Sense": "wikibase-sense",
@@ -16,6 +17,26 @@ class_to_data_type = {
     "Url": "url",
 }
 
+# Types of the "datavalue" objects Wikibase uses for the values of each data type
+class_to_value_type = {
+    "CommonsMedia": "string",
+    "ExternalId": "string",
+    "Form": "wikibase-entityid",
+    "GeoLocation": "globecoordinate",
+    "GeoShape": "string",
+    "Item": "wikibase-entityid",
+    "Lexeme": "wikibase-entityid",
+    "Math": "string",
+    "MonolingualText": "monolingualtext",
+    "Property": "wikibase-entityid",
+    "Quantity": "quantity",
+    "Sense": "wikibase-entityid",
+    "StringValue": "string",
+    "Table": "string",
+    "Time": "time",
+    "Url": "string",
+}
+
 data_type_to_class = {}
 
 # Populate data_type_to_class
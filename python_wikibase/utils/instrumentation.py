@@ -0,0 +1,484 @@
+import functools
+import math
+import random
+import threading
+import time
+from array import array
+from urllib.parse import urlencode
+
+from python_wikibase.utils.claim_ids import claim_id_to_entity_id
+
+try:
+    from contextvars import ContextVar
+except ImportError:  # Python 3.6
+    ContextVar = None
+
+
+class ThreadLocalVar:
+    """Fallback for ``contextvars.ContextVar`` (which requires Python 3.7). The value is stored per
+    thread, so coroutines running concurrently in the same thread share it (API calls made by
+    ``AsyncPyWikibase`` might be attributed to the wrong observation)"""
+
+    def __init__(self, name, default=None):
+        self.name = name
+        self.default = default
+        self.local = threading.local()
+
+    def get(self):
+        return getattr(self.local, "value", self.default)
+
+    def set(self, value):
+        """Set the value and return a token for restoring the previous one (see ``reset``)"""
+        token = self.get()
+        self.local.value = value
+        return token
+
+    def reset(self, token):
+        self.local.value = token
+
+
+def context_var(name):
+    """Return a context variable with the default ``None`` (a ``ThreadLocalVar`` if the
+    ``contextvars`` module isn't available)"""
+    if ContextVar is None:
+        return ThreadLocalVar(name, default=None)
+    return ContextVar(name, default=None)
+
+
+# API call which is currently being made (``None`` if no call is in progress or nobody observes it)
+current_call = context_var("current_call")
+
+# Observation of the data model function which is currently running (see ``observe``)
+current_observation = context_var("current_observation")
+
+# Default maximum number of calls per action which StatsAggregator keeps for computing percentiles
+DEFAULT_MAX_SAMPLES = 1000
+
+# Request parameters which contain the ID of the entity an API call is about (in order of priority)
+ENTITY_ID_PARAMS = ["ids", "id", "entity", "claim", "statement", "title"]
+
+
+class ApiCallEvent:
+    """Information about an API call which is passed to the observers once the call has
+    finished"""
+
+    __slots__ = (
+        "action",
+        "entity_id",
+        "method",
+        "bytes_out",
+        "bytes_in",
+        "latency",
+        "unmarshal_time",
+        "attempts",
+        "error",
+    )
+
+    def __init__(self, action, entity_id, method):
+        self.action = action
+        self.entity_id = entity_id
+        self.method = method
+        self.bytes_out = 0  # Size of the encoded request parameters (all attempts)
+        self.bytes_in = 0  # Size of the response bodies (all attempts)
+        self.latency = 0  # Seconds spent waiting for HTTP responses (all attempts)
+        self.unmarshal_time = 0  # Seconds spent parsing the response into data model objects
+        self.attempts = 0  # Number of HTTP requests (more than 1 if the call has been retried)
+        self.error = None  # Exception the call has failed with
+
+    @property
+    def retries(self):
+        return max(self.attempts - 1, 0)
+
+    def to_dict(self):
+        """Return the event's information as a dict
+
+        :return: Event information
+        :rtype: dict
+        """
+        info = {key: getattr(self, key) for key in self.__slots__}
+        info["retries"] = self.retries
+        return info
+
+    def __repr__(self):
+        return f"<ApiCallEvent {self.method} {self.action} {self.entity_id}>"
+
+
+class Instrumentation:
+    """Observer registry of a ``PyWikibase`` object. Every observer is called with an
+    ``ApiCallEvent`` after every API call. If no observers are subscribed, API calls aren't
+    measured"""
+
+    def __init__(self, observers=None):
+        """
+        :param observers: Functions to call with the events
+        :type observers: list(function)
+        """
+        self.observers = list(observers or [])
+
+    def subscribe(self, observer):
+        """Call the function with the event of every API call
+
+        :param observer: Function to call
+        :type observer: function
+        """
+        self.observers.append(observer)
+
+    def unsubscribe(self, observer):
+        """Stop calling the function
+
+        :param observer: Function which has been subscribed
+        :type observer: function
+        """
+        self.observers.remove(observer)
+
+    def emit(self, event):
+        for observer in self.observers:
+            observer(event)
+
+    def start_call(self, method, params):
+        """Create the event for an API call which is about to be made
+
+        :param method: HTTP method (either "GET" or "POST")
+        :type method: str
+        :param params: Query parameters or form fields of the request
+        :type params: dict
+        :return: Tuple of the form ``(event, start_time, token)`` (``None`` if nobody observes the
+            call)
+        :rtype: tuple
+        """
+        if not self.observers:
+            return None
+        event = ApiCallEvent(params.get("action"), get_entity_id(params), method)
+        return event, time.perf_counter(), current_call.set(event)
+
+    def end_call(self, call, error=None):
+        """Pass the event of a finished API call to the observers (or, if it is made by an observed
+        data model function, to the function's observation)
+
+        :param call: Return value of :meth:`start_call`
+        :type call: tuple
+        :param error: Exception the call has failed with
+        :type error: Exception
+        """
+        if call is None:
+            return
+        event, start_time, token = call
+        current_call.reset(token)
+        event.error = error
+        observation = current_observation.get()
+        if observation is not None and observation.instrumentation is self:
+            observation.add(event, time.perf_counter() - start_time)
+        else:
+            self.emit(event)
+
+
+class Observation:
+    """Collects the events of the API calls made by a data model function, so the time spent
+    unmarshalling the responses can be added before they are passed to the observers. The
+    unmarshalling time of the function is attributed to its last API call"""
+
+    __slots__ = ("instrumentation", "events", "is_unmarshalling", "call_time", "token")
+
+    def __init__(self, instrumentation):
+        self.instrumentation = instrumentation
+        self.events = []
+        self.is_unmarshalling = False
+        self.call_time = 0  # Seconds spent in API calls while unmarshalling (e.g. for generators)
+        self.token = None
+
+    def __enter__(self):
+        self.token = current_observation.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        current_observation.reset(self.token)
+        for event in self.events:
+            self.instrumentation.emit(event)
+
+    def add(self, event, duration):
+        self.events.append(event)
+        if self.is_unmarshalling:
+            self.call_time += duration
+
+    def unmarshalling(self):
+        """Return a context manager measuring the time spent unmarshalling the responses
+
+        :return: Context manager
+        :rtype: Unmarshalling
+        """
+        return Unmarshalling(self)
+
+
+class Unmarshalling:
+    __slots__ = ("observation", "start_time")
+
+    def __init__(self, observation):
+        self.observation = observation
+        self.start_time = None
+
+    def __enter__(self):
+        self.observation.is_unmarshalling = True
+        self.start_time = time.perf_counter()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        observation = self.observation
+        observation.is_unmarshalling = False
+        if observation.events:
+            duration = time.perf_counter() - self.start_time - observation.call_time
+            observation.events[-1].unmarshal_time += duration
+
+
+class NoObservation:
+    """Stand-in for ``Observation`` if nobody observes the API calls"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        pass
+
+    def unmarshalling(self):
+        return self
+
+
+NO_OBSERVATION = NoObservation()
+
+
+def observe(py_wb):
+    """Return a context manager collecting the events of the API calls made by a data model
+    function (see ``Observation``)::
+
+        with observe(self.py_wb) as observation:
+            r = self.api.entity.get(...)
+            with observation.unmarshalling():
+                return self.unmarshal(...)
+
+    :param py_wb: PyWikibase API wrapper object
+    :type py_wb: PyWikibase
+    :return: Context manager
+    :rtype: Observation
+    """
+    if not py_wb.instrumentation.observers:
+        return NO_OBSERVATION
+    return Observation(py_wb.instrumentation)
+
+
+def record_request(params, duration, bytes_in):
+    """Add an HTTP request to the event of the current API call
+
+    :param params: Query parameters or form fields of the request
+    :type params: dict
+    :param duration: Number of seconds until the response has been received
+    :type duration: float
+    :param bytes_in: Size of the response body
+    :type bytes_in: int
+    """
+    event = current_call.get()
+    if event is None:
+        return
+    event.attempts += 1
+    event.latency += duration
+    event.bytes_out += len(urlencode(params))
+    event.bytes_in += bytes_in
+
+
+def get_entity_id(params):
+    """Return the ID of the entity an API call is about
+
+    :param params: Query parameters or form fields of the request
+    :type params: dict
+    :return: Entity ID (e.g. "Q1", IDs are separated by "|" if there are multiple, ``None`` if the
+        call isn't about an entity)
+    :rtype: str
+    """
+    for key in ENTITY_ID_PARAMS:
+        if key in params:
+            value = str(params[key])
+            if key in ("claim", "statement"):
+                return claim_id_to_entity_id(value)
+            if key == "title":
+                return value.split(":")[-1]
+            return value
+    return None
+
+
+def instrument_requests(api, instrumentation):
+    """Report the API calls of the wikibase-api object to the observers of the instrumentation
+
+    :param api: wikibase-api object
+    :type api: Wikibase
+    :param instrumentation: Instrumentation to report the calls to
+    :type instrumentation: Instrumentation
+    """
+    session = api.api.session
+
+    def measure(request, params_key):
+        @functools.wraps(request)
+        def measured_request(*args, **kwargs):
+            if current_call.get() is None:
+                return request(*args, **kwargs)
+            params = kwargs.get(params_key) or {}
+            start_time = time.perf_counter()
+            try:
+                r = request(*args, **kwargs)
+            except Exception:
+                record_request(params, time.perf_counter() - start_time, 0)
+                raise
+            record_request(params, time.perf_counter() - start_time, len(r.content))
+            return r
+
+        return measured_request
+
+    def observe_calls(call_api, method):
+        @functools.wraps(call_api)
+        def observed_call(params):
+            call = instrumentation.start_call(method, params)
+            try:
+                r = call_api(params)
+            except Exception as e:
+                instrumentation.end_call(call, e)
+                raise
+            instrumentation.end_call(call)
+            return r
+
+        return observed_call
+
+    # HTTP requests are measured on the session, API calls (including their retries) are observed
+    # on the API object
+    session.get = measure(session.get, "params")
+    session.post = measure(session.post, "data")
+    api.api.get = observe_calls(api.api.get, "GET")
+    api.api.post = observe_calls(api.api.post, "POST")
+    api.api.post.instrumentation = instrumentation
+
+
+def get_instrumentation(api):
+    """Return the instrumentation the API calls of the wikibase-api object are reported to
+
+    :param api: wikibase-api object
+    :type api: Wikibase
+    :return: Instrumentation (``None`` if the calls aren't reported)
+    :rtype: Instrumentation
+    """
+    return getattr(api.api.post, "instrumentation", None)
+
+
+class StatsAggregator:
+    """Observer collecting the events of all API calls and computing statistics (e.g. latency
+    percentiles) for every action::
+
+        stats = StatsAggregator()
+        py_wb.instrumentation.subscribe(stats)
+
+    The numbers of calls, errors, retries and bytes are exact. The percentiles are computed from a
+    random sample of at most ``max_samples`` calls per action (every call has the same probability
+    of being part of it), so the memory usage doesn't grow with the number of calls
+    """
+
+    METRICS = ["latency", "unmarshal_time", "bytes_in", "bytes_out"]
+
+    def __init__(self, max_samples=DEFAULT_MAX_SAMPLES):
+        """
+        :param max_samples: Maximum number of calls per action kept for computing percentiles
+        :type max_samples: int
+        """
+        self.max_samples = max_samples
+        self.random = random.Random()
+        self.lock = threading.Lock()
+        self.counts = {}  # action -> [calls, errors, retries, bytes_in, bytes_out]
+        self.samples = {}  # action -> metric -> array of values
+
+    def __call__(self, event):
+        with self.lock:
+            counts = self.counts.get(event.action)
+            if counts is None:
+                counts = self.counts[event.action] = [0, 0, 0, 0, 0]
+                self.samples[event.action] = {metric: array("d") for metric in self.METRICS}
+            counts[0] += 1
+            counts[1] += event.error is not None
+            counts[2] += event.retries
+            counts[3] += event.bytes_in
+            counts[4] += event.bytes_out
+
+            # Reservoir sampling: Once the sample is full, the call replaces a random sampled call
+            # with the probability max_samples / calls
+            samples = self.samples[event.action]
+            if counts[0] <= self.max_samples:
+                for metric in self.METRICS:
+                    samples[metric].append(getattr(event, metric))
+            else:
+                index = self.random.randrange(counts[0])
+                if index < self.max_samples:
+                    for metric in self.METRICS:
+                        samples[metric][index] = getattr(event, metric)
+
+    def percentiles(self, action, metric="latency", percentiles=(50, 90, 99)):
+        """Return percentiles of a metric of the action's API calls
+
+        :param action: API action (e.g. "wbgetentities")
+        :type action: str
+        :param metric: One of ``METRICS``
+        :type metric: str
+        :param percentiles: Percentiles to compute (between 0 and 100)
+        :type percentiles: iterable(float)
+        :return: Dict mapping every percentile to its value (``None`` if no calls have been made)
+        :rtype: dict
+        """
+        if metric not in self.METRICS:
+            raise ValueError(f"metric must be one of {self.METRICS}")
+        with self.lock:
+            values = sorted(self.samples.get(action, {}).get(metric, []))
+        return {p: get_percentile(values, p) for p in percentiles}
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """Return statistics for every action
+
+        :param percentiles: Percentiles to compute for every metric
+        :type percentiles: iterable(float)
+        :return: Dict mapping every action to a dict with the number of calls, errors and retries,
+            the total number of bytes and the percentiles of every metric
+        :rtype: dict
+        """
+        with self.lock:
+            actions = list(self.counts)
+        summary = {}
+        for action in actions:
+            with self.lock:
+                calls, errors, retries, bytes_in, bytes_out = self.counts[action]
+            summary[action] = {
+                "calls": calls,
+                "errors": errors,
+                "retries": retries,
+                "total_bytes_in": int(bytes_in),
+                "total_bytes_out": int(bytes_out),
+            }
+            for metric in self.METRICS:
+                summary[action][metric] = self.percentiles(action, metric, percentiles)
+        return summary
+
+    def reset(self):
+        """Remove all collected events"""
+        with self.lock:
+            self.counts = {}
+            self.samples = {}
+
+
+def get_percentile(values, percentile):
+    """Return the percentile of the sorted values (interpolating linearly between the closest
+    ranks)
+
+    :param values: Sorted values
+    :type values: list(float)
+    :param percentile: Percentile (between 0 and 100)
+    :type percentile: float
+    :return: Value of the percentile (``None`` if there are no values)
+    :rtype: float
+    """
+    if not values:
+        return None
+    rank = (len(values) - 1) * percentile / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    return values[lower] + (values[upper] - values[lower]) * (rank - lower)
@@ -0,0 +1,105 @@
+class RawValue:
+    """Wrapper for raw data which hasn't been loaded by a ``LazyDict`` yet"""
+
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+
+class LazyDict(dict):
+    """Dict whose values can be saved as raw data, which is only loaded (e.g. unmarshalled into
+    objects) when the value is accessed for the first time. Afterwards, the loaded value replaces
+    the raw data"""
+
+    __slots__ = ("load_value",)
+
+    def __init__(self, load_value):
+        """
+        :param load_value: Function which is called with the raw data of a value and returns the
+            loaded value
+        :type load_value: function
+        """
+        super().__init__()
+        self.load_value = load_value
+
+    def set_raw(self, key, data):
+        """Save the raw data of a value, which will be loaded when the value is accessed
+
+        :param key: Key of the value
+        :type key: any
+        :param data: Raw data of the value
+        :type data: any
+        """
+        super().__setitem__(key, RawValue(data))
+
+    def is_loaded(self, key):
+        """Return whether the value has been loaded already
+
+        :param key: Key of the value
+        :type key: any
+        :return: Whether the value has been loaded
+        :rtype: bool
+        """
+        return not isinstance(super().__getitem__(key), RawValue)
+
+    def load_all(self):
+        """Load all values which are still saved as raw data"""
+        for key in list(super().keys()):
+            self[key]
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if isinstance(value, RawValue):
+            value = self.load_value(value.data)
+            super().__setitem__(key, value)
+        return value
+
+    # Iterating over the keys is overridden so ``dict(lazy_dict)`` and ``{**lazy_dict}`` access the
+    # values using ``__getitem__`` (instead of copying the raw data)
+    def __iter__(self):
+        return iter(super().keys())
+
+    def __eq__(self, other):
+        self.load_all()
+        if isinstance(other, LazyDict):
+            other.load_all()
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        self.load_all()
+        return super().__repr__()
+
+    def copy(self):
+        return dict(self)
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def items(self):
+        self.load_all()
+        return super().items()
+
+    def pop(self, key, *args):
+        if key in self:
+            self[key]
+        return super().pop(key, *args)
+
+    def popitem(self):
+        self.load_all()
+        return super().popitem()
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def values(self):
+        self.load_all()
+        return super().values()
@@ -0,0 +1,304 @@
+import asyncio
+import functools
+import json
+import random
+import threading
+import time
+
+import requests
+from wikibase_api import ApiError
+
+from python_wikibase.utils.scheduler import get_status
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Maximum number of retries of a request for every class of errors (see ``classify_error``)
+DEFAULT_MAX_RETRIES = {"connection": 3, "timeout": 3, "server": 3}
+
+# Number of retries which are always allowed, regardless of the retry budget
+RETRY_BUDGET_ALLOWANCE = 10
+
+# Write actions which have the same effect if they are made more than once, so they can be retried
+# even if it is unknown whether the failed request has been processed
+IDEMPOTENT_WRITE_ACTIONS = {
+    "wbsetaliases",
+    "wbsetclaim",
+    "wbsetclaimvalue",
+    "wbsetdescription",
+    "wbsetlabel",
+}
+
+# Write actions whose retries are handled by the caller, which checks whether the failed request has
+# been processed before retrying it (see ``Claims._add_claim``). They are sent without the retrying
+# wrapper of ``retry_requests``, so every attempt is only made and counted once
+CALLER_RETRIED_ACTIONS = {"wbcreateclaim"}
+
+# Error codes of the Wikibase API which indicate a temporary problem on the server
+SERVER_ERROR_CODES = {"readonly", "internal_api_error_DBQueryError"}
+
+
+class RetryPolicy:
+    """Retries API requests which have failed with a transient error (connection errors, timeouts
+    and server errors, see ``classify_error``) with jittered exponential backoff
+
+    Reads and idempotent writes (e.g. setting a label) are retried automatically. Other writes can't
+    be retried blindly because the failed request might have been processed: New claims are only
+    created again if they can't be found on the entity, creating entities and adding qualifiers and
+    references isn't retried
+
+    Retries are capped per request (``max_retries`` and ``max_retry_time``) and across all requests
+    (``retry_budget``), so a failing Wikibase instance isn't flooded with retries"""
+
+    def __init__(
+        self,
+        max_retries=None,
+        backoff=1,
+        max_backoff=60,
+        max_retry_time=300,
+        retry_budget=0.2,
+    ):
+        """
+        :param max_retries: Maximum number of retries of a request for every class of errors
+            (e.g. ``{"connection": 5, "timeout": 3, "server": 3}``, missing classes aren't
+            retried). A number sets the same maximum for all classes. Default:
+            ``DEFAULT_MAX_RETRIES``
+        :type max_retries: dict or int
+        :param backoff: Maximum number of seconds to wait before the first retry (doubled for every
+            further retry). The actual delay is chosen randomly between 0 and the maximum
+        :type backoff: float
+        :param max_backoff: Maximum number of seconds to wait before a retry
+        :type max_backoff: float
+        :param max_retry_time: Maximum number of seconds after the first attempt in which a request
+            is retried (``None`` for no limit)
+        :type max_retry_time: float
+        :param retry_budget: Maximum ratio of retries to requests across all requests (``None``
+            for no limit)
+        :type retry_budget: float
+        """
+        if max_retries is None:
+            max_retries = DEFAULT_MAX_RETRIES
+        elif isinstance(max_retries, int):
+            max_retries = {error_class: max_retries for error_class in DEFAULT_MAX_RETRIES}
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_time = max_retry_time
+        self.retry_budget = retry_budget
+        self.lock = threading.Lock()
+
+        # Metrics
+        self.requests = 0
+        self.retries = {}
+        self.failures = 0
+
+    def _start(self):
+        """Count a new request
+
+        :return: Time at which the request has been started
+        :rtype: float
+        """
+        with self.lock:
+            self.requests += 1
+        return time.monotonic()
+
+    def _get_delay(self, attempt, error, start_time):
+        """Decide whether the failed request should be retried
+
+        :param attempt: Number of the failed attempt (starting at 0)
+        :type attempt: int
+        :param error: Error the request has failed with
+        :type error: Exception
+        :param start_time: Time at which the request has been started
+        :type start_time: float
+        :return: Number of seconds to wait before the retry (``None`` if the request shouldn't be
+            retried)
+        :rtype: float
+        """
+        error_class = classify_error(error)
+        if error_class is None:
+            return None
+        delay = random.uniform(0, min(self.backoff * 2**attempt, self.max_backoff))
+        with self.lock:
+            retries = sum(self.retries.values())
+            if (
+                attempt >= self.max_retries.get(error_class, 0)
+                or (
+                    self.max_retry_time is not None
+                    and time.monotonic() + delay - start_time > self.max_retry_time
+                )
+                or (
+                    self.retry_budget is not None
+                    and retries >= self.retry_budget * self.requests + RETRY_BUDGET_ALLOWANCE
+                )
+            ):
+                self.failures += 1
+                return None
+            self.retries[error_class] = self.retries.get(error_class, 0) + 1
+        return delay
+
+    def run(self, request, params, idempotent=True, find_written=None):
+        """Make the request, retrying it if it fails with a transient error
+
+        :param request: Function making the request
+        :type request: function
+        :param params: Query parameters or form fields of the request
+        :type params: dict
+        :param idempotent: Whether the request can be repeated without changing the result
+        :type idempotent: bool
+        :param find_written: Function which is called before a write request which isn't
+            idempotent is retried. It checks whether the failed request has been processed and, if
+            so, returns the response to use instead of retrying (otherwise ``None``). If it raises
+            an exception, the request isn't retried and its error is raised
+        :type find_written: function
+        :return: Response object
+        :rtype: dict
+        """
+        start_time = self._start()
+        attempt = 0
+        while True:
+            try:
+                return request(params)
+            except Exception as e:
+                if not idempotent and find_written is None:
+                    raise
+                delay = self._get_delay(attempt, e, start_time)
+                if delay is None:
+                    raise
+                error = e
+            time.sleep(delay)
+            if find_written is not None:
+                try:
+                    r = find_written()
+                except Exception:
+                    # It's unknown whether the failed request has been processed, so it can't be
+                    # retried. The request's error is raised instead of the one of the lookup
+                    raise error
+                if r is not None:
+                    return r
+            attempt += 1
+
+    async def run_async(self, request, params, idempotent=True, find_written=None):
+        """Asynchronous counterpart of :meth:`run` (``request`` and ``find_written`` must return
+        coroutines)"""
+        start_time = self._start()
+        attempt = 0
+        while True:
+            try:
+                return await request(params)
+            except Exception as e:
+                if not idempotent and find_written is None:
+                    raise
+                delay = self._get_delay(attempt, e, start_time)
+                if delay is None:
+                    raise
+                error = e
+            await asyncio.sleep(delay)
+            if find_written is not None:
+                try:
+                    r = await find_written()
+                except Exception:
+                    raise error
+                if r is not None:
+                    return r
+            attempt += 1
+
+    def stats(self):
+        """Return the policy's metrics
+
+        :return: Dict with the number of requests, the number of retries for every class of errors
+            and the number of requests which have failed after exhausting their retries
+        :rtype: dict
+        """
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "retries": dict(self.retries),
+                "failures": self.failures,
+            }
+
+
+def classify_error(error):
+    """Return the class of a transient error
+
+    :param error: Error a request has failed with
+    :type error: Exception
+    :return: "connection", "timeout" or "server" (``None`` if the error isn't transient)
+    :rtype: str
+    """
+    if isinstance(error, (requests.Timeout, asyncio.TimeoutError)):
+        return "timeout"
+    if isinstance(error, requests.ConnectionError):
+        return "connection"
+    if aiohttp is not None and isinstance(error, aiohttp.ClientConnectionError):
+        return "connection"
+    if isinstance(error, ApiError):
+        try:
+            code = json.loads(str(error)).get("code")
+        except ValueError:
+            return None
+        return "server" if code in SERVER_ERROR_CODES else None
+    status = get_status(error)
+    if status is not None and status >= 500:
+        return "server"
+    return None
+
+
+def is_caller_retried(body):
+    """Return whether the write request is retried by its caller (see ``CALLER_RETRIED_ACTIONS``)
+
+    :param body: Form fields of the request
+    :type body: dict
+    :rtype: bool
+    """
+    return body.get("action") in CALLER_RETRIED_ACTIONS
+
+
+def is_idempotent_write(body):
+    """Return whether the write request can be retried without checking whether the failed attempt
+    has been processed
+
+    :param body: Form fields of the request
+    :type body: dict
+    :rtype: bool
+    """
+    return body.get("action") in IDEMPOTENT_WRITE_ACTIONS
+
+
+def retry_requests(api, policy):
+    """Retry the failed reads and idempotent writes of the wikibase-api object using the policy
+
+    :param api: wikibase-api object
+    :type api: Wikibase
+    :param policy: Retry policy to use
+    :type policy: RetryPolicy
+    """
+    get = api.api.get
+    post = api.api.post
+
+    @functools.wraps(get)
+    def retrying_get(params):
+        return policy.run(get, params)
+
+    @functools.wraps(post)
+    def retrying_post(body):
+        if is_caller_retried(body):
+            return post(body)
+        return policy.run(post, body, idempotent=is_idempotent_write(body))
+
+    retrying_post.retry_policy = policy
+    api.api.get = retrying_get
+    api.api.post = retrying_post
+
+
+def get_retry_policy(api):
+    """Return the retry policy used for the requests of the wikibase-api object
+
+    :param api: wikibase-api object
+    :type api: Wikibase
+    :return: Retry policy (``None`` if requests aren't retried)
+    :rtype: RetryPolicy
+    """
+    return getattr(api.api.post, "retry_policy", None)
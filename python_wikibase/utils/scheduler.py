@@ -0,0 +1,241 @@
+import asyncio
+import json
+import threading
+import time
+
+from wikibase_api import ApiError
+
+# Error codes with which the Wikibase API rejects edits if the client should slow down
+THROTTLE_ERROR_CODES = {"maxlag", "ratelimited"}
+
+# HTTP status codes with which the Wikibase API (or a proxy in front of it) rejects requests if the
+# client should slow down
+THROTTLE_STATUS_CODES = {429, 503}
+
+
+class EditScheduler:
+    """Paces the edits made using a ``PyWikibase`` object. Every write request waits for the next
+    free slot of the edit budget, is sent with the ``maxlag`` parameter and is retried with
+    exponential backoff if Wikibase responds that the client should slow down (``maxlag`` and
+    ``ratelimited`` errors, HTTP status 429 and 503, in which case the ``Retry-After`` header is
+    respected). While a request is being retried, all other edits are paused as well
+
+    The scheduler is shared by all threads and HTTP sessions of the ``PyWikibase`` object, so
+    concurrent edits (e.g. :meth:`PyWikibase.create_items`) use the same budget"""
+
+    def __init__(self, edits_per_minute=None, maxlag=5, max_retries=5, backoff=5, max_backoff=300):
+        """
+        :param edits_per_minute: Maximum number of edits per minute (``None`` for no limit)
+        :type edits_per_minute: float
+        :param maxlag: Value of the ``maxlag`` parameter in seconds (``None`` to not send it)
+        :type maxlag: int
+        :param max_retries: Maximum number of retries of a throttled edit
+        :type max_retries: int
+        :param backoff: Seconds to wait before the first retry (doubled for every further retry)
+            if the response doesn't specify how long to wait
+        :type backoff: float
+        :param max_backoff: Maximum number of seconds to wait before a retry
+        :type max_backoff: float
+        """
+        if edits_per_minute is not None and edits_per_minute <= 0:
+            raise ValueError("edits_per_minute must be positive")
+        self.interval = 60 / edits_per_minute if edits_per_minute else 0
+        self.maxlag = maxlag
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.lock = threading.Lock()
+
+        # Time (``time.monotonic()``) at which the next edit may be made
+        self.next_slot = 0
+
+        # Metrics
+        self.edits = 0
+        self.retries = 0
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.wait_time = 0
+        self.max_wait_time = 0
+
+    def _reserve(self):
+        """Reserve the next free slot for an edit
+
+        :return: Number of seconds to wait until the slot
+        :rtype: float
+        """
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+            self.queue_depth += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+            return slot - now
+
+    def _release(self, delay):
+        """Record that an edit has waited for its slot and is being sent
+
+        :param delay: Number of seconds the edit has waited
+        :type delay: float
+        """
+        with self.lock:
+            self.queue_depth -= 1
+            self.edits += 1
+            self.wait_time += delay
+            self.max_wait_time = max(self.max_wait_time, delay)
+
+    def _pause(self, attempt, error):
+        """Postpone all edits after a throttled request
+
+        :param attempt: Number of the failed attempt (starting at 0)
+        :type attempt: int
+        :param error: Error the request has failed with
+        :type error: Exception
+        """
+        delay = get_retry_after(error)
+        if delay is None:
+            delay = self.backoff * 2**attempt
+        delay = min(delay, self.max_backoff)
+        with self.lock:
+            self.retries += 1
+            self.next_slot = max(self.next_slot, time.monotonic() + delay)
+
+    def _should_retry(self, attempt, error):
+        return attempt < self.max_retries and is_throttled(error)
+
+    def _prepare(self, body):
+        if self.maxlag is None:
+            return body
+        return {**body, "maxlag": self.maxlag}
+
+    def run(self, post, body):
+        """Make the write request once a slot is free, retrying it if it is throttled
+
+        :param post: Function making the POST request
+        :type post: function
+        :param body: Form fields of the request
+        :type body: dict
+        :return: Response object
+        :rtype: dict
+        """
+        body = self._prepare(body)
+        attempt = 0
+        while True:
+            delay = self._reserve()
+            time.sleep(delay)
+            self._release(delay)
+            try:
+                return post(body)
+            except Exception as e:
+                if not self._should_retry(attempt, e):
+                    raise
+                self._pause(attempt, e)
+                attempt += 1
+
+    async def run_async(self, post, body):
+        """Asynchronous counterpart of :meth:`run` (``post`` must return a coroutine)"""
+        body = self._prepare(body)
+        attempt = 0
+        while True:
+            delay = self._reserve()
+            await asyncio.sleep(delay)
+            self._release(delay)
+            try:
+                return await post(body)
+            except Exception as e:
+                if not self._should_retry(attempt, e):
+                    raise
+                self._pause(attempt, e)
+                attempt += 1
+
+    def stats(self):
+        """Return the scheduler's metrics
+
+        :return: Dict with the number of edits and retries, the number of edits currently waiting
+            for a slot (and its maximum) and the total and maximum number of seconds edits have
+            waited
+        :rtype: dict
+        """
+        with self.lock:
+            return {
+                "edits": self.edits,
+                "retries": self.retries,
+                "queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "wait_time": self.wait_time,
+                "max_wait_time": self.max_wait_time,
+            }
+
+
+def get_status(error):
+    """Return the HTTP status code of a failed request (raised by ``requests`` or ``aiohttp``)
+
+    :param error: Error the request has failed with
+    :type error: Exception
+    :return: HTTP status code (``None`` if the error isn't an HTTP error)
+    :rtype: int
+    """
+    response = getattr(error, "response", None)
+    if response is not None:
+        return getattr(response, "status_code", None)
+    return getattr(error, "status", None)
+
+
+def get_retry_after(error):
+    """Return the value of the ``Retry-After`` header of a failed request
+
+    :param error: Error the request has failed with
+    :type error: Exception
+    :return: Number of seconds to wait (``None`` if the header is missing or not a number)
+    :rtype: float
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response if response is not None else error, "headers", None)
+    if not headers or "Retry-After" not in headers:
+        return None
+    try:
+        return max(float(headers["Retry-After"]), 0)
+    except ValueError:
+        return None
+
+
+def is_throttled(error):
+    """Return whether the request has failed because the client should slow down
+
+    :param error: Error the request has failed with
+    :type error: Exception
+    :rtype: bool
+    """
+    if isinstance(error, ApiError):
+        try:
+            return json.loads(str(error)).get("code") in THROTTLE_ERROR_CODES
+        except ValueError:
+            return False
+    return get_status(error) in THROTTLE_STATUS_CODES
+
+
+def schedule_edits(api, scheduler):
+    """Make all write requests of the wikibase-api object through the scheduler
+
+    :param api: wikibase-api object
+    :type api: Wikibase
+    :param scheduler: Scheduler to use
+    :type scheduler: EditScheduler
+    """
+    post = api.api.post
+
+    def scheduled_post(body):
+        return scheduler.run(post, body)
+
+    scheduled_post.scheduler = scheduler
+    api.api.post = scheduled_post
+
+
+def get_scheduler(api):
+    """Return the scheduler the write requests of the wikibase-api object are made through
+
+    :param api: wikibase-api object
+    :type api: Wikibase
+    :return: Scheduler (``None`` if edits aren't scheduled)
+    :rtype: EditScheduler
+    """
+    return getattr(api.api.post, "scheduler", None)
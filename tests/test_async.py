@@ -0,0 +1,132 @@
+import asyncio
+import inspect
+
+import pytest
+
+from python_wikibase import PyWikibase, data_model
+from python_wikibase.aio import AsyncPyWikibase
+from python_wikibase.aio import data_model as aio_data_model
+from python_wikibase.aio.concurrency import gather_concurrently, map_concurrently
+from tests.conftest import config_path
+from tests.constants import ITEM_LABEL, ITEM_LABEL_2, LANGUAGE, PROP_LABEL, STRING_VALUE
+
+# Public methods which don't make API calls and are therefore synchronous in the async classes
+COLLECTION_METHODS = {"find", "get_by_id", "marshal", "to_dict", "to_list", "unmarshal"}
+LOCAL_METHODS = {
+    "PyWikibase": {"map_dump", "map_reduce_dump", "read_dump"},
+    "Item": {"discard", "edit_session", "marshal", "unmarshal"},
+    "Property": {"discard", "edit_session", "marshal", "unmarshal"},
+    "Label": {"get", "unmarshal"},
+    "Description": {"get", "unmarshal"},
+    "Aliases": {"get", "unmarshal"},
+    "Claims": COLLECTION_METHODS,
+    "Claim": {"marshal", "unmarshal", "unmarshal_ids"},
+    "Qualifiers": COLLECTION_METHODS,
+    "Qualifier": {"marshal", "unmarshal"},
+    "References": COLLECTION_METHODS,
+    "Reference": {"marshal", "unmarshal", "unmarshal_update"},
+}
+
+
+def run(coroutine):
+    """Run the coroutine in a new event loop (``asyncio.run`` requires Python 3.7)"""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class TestAsync:
+    def test_item(self):
+        async def main():
+            async with AsyncPyWikibase(config_path=config_path) as py_wb:
+                # Create item and property
+                item, prop = await asyncio.gather(
+                    py_wb.Item().create(ITEM_LABEL), py_wb.Property().create(PROP_LABEL)
+                )
+                assert item.label.get(LANGUAGE) == ITEM_LABEL
+
+                # Update item label
+                await item.label.set(ITEM_LABEL_2)
+                assert item.label.get(LANGUAGE) == ITEM_LABEL_2
+
+                # Create claim
+                string_value = py_wb.StringValue().create(STRING_VALUE)
+                claim = await item.claims.add(prop, string_value)
+                assert str(claim.value) == STRING_VALUE
+
+                # Get item
+                item_fetched = await py_wb.Item().get(entity_id=item.entity_id)
+                assert item_fetched.label.get(LANGUAGE) == ITEM_LABEL_2
+                assert len(item_fetched.claims) == 1
+
+                # Delete item and property
+                await asyncio.gather(item.delete(), prop.delete())
+
+        run(main())
+
+    def test_edit_session(self):
+        async def main():
+            py_wb = AsyncPyWikibase(cache=False)
+            item = py_wb.Item()
+            item.entity_id = "Q1"
+
+            # Synchronous context manager can't await the save
+            with pytest.raises(TypeError):
+                with item.edit_session():
+                    pass
+            item.discard()
+
+            # Session is ended when leaving the `async with` block
+            async with item.edit_session():
+                assert "Q1" in py_wb.edit_sessions
+            assert "Q1" not in py_wb.edit_sessions
+
+        run(main())
+
+    def test_counterparts(self):
+        """Every public method of the synchronous classes must have an asynchronous counterpart
+        (or be listed in ``LOCAL_METHODS``)"""
+        pairs = [(PyWikibase, AsyncPyWikibase)] + [
+            (getattr(data_model, name), getattr(aio_data_model, "Async" + name))
+            for name in LOCAL_METHODS
+            if name != "PyWikibase"
+        ]
+        missing = []
+        for sync_class, async_class in pairs:
+            for name, _ in inspect.getmembers(sync_class, inspect.isfunction):
+                if name.startswith("_"):
+                    continue
+                async_method = getattr(async_class, name, None)
+                if name in LOCAL_METHODS[sync_class.__name__] or name[0].isupper():
+                    # Local methods and factories of data model objects
+                    is_counterpart = async_method is not None
+                else:
+                    is_counterpart = inspect.iscoroutinefunction(
+                        async_method
+                    ) or inspect.isasyncgenfunction(async_method)
+                if not is_counterpart:
+                    missing.append(f"{async_class.__name__}.{name}")
+        assert missing == []
+
+    def test_map_concurrently(self):
+        running = []
+        max_running = []
+
+        async def double(number):
+            running.append(number)
+            max_running.append(len(running))
+            await asyncio.sleep(0.01 * (5 - number))
+            running.remove(number)
+            return 2 * number
+
+        async def collect(ordered):
+            return [
+                result async for result in map_concurrently(double, range(5), 2, ordered=ordered)
+            ]
+
+        assert run(collect(True)) == [0, 2, 4, 6, 8]
+        assert sorted(run(collect(False))) == [0, 2, 4, 6, 8]
+        assert run(gather_concurrently(double, range(5), 2)) == [0, 2, 4, 6, 8]
+        assert max(max_running) == 2
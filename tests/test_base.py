@@ -0,0 +1,22 @@
+from python_wikibase import PyWikibase
+
+
+class TestBase:
+    def test_shared_context(self):
+        py_wb = PyWikibase(cache=False)
+        claim = py_wb.Claim()
+        value = py_wb.StringValue()
+
+        # Objects don't have instance dicts and share the context of the PyWikibase object
+        assert not hasattr(claim, "__dict__")
+        assert not hasattr(value, "__dict__")
+        assert claim.context is value.context is py_wb.context
+        assert claim.py_wb is py_wb
+        assert claim.api is py_wb.api
+        assert claim.language == py_wb.language
+
+        # A new context is created if the language is changed
+        py_wb.language = "de"
+        item = py_wb.Item()
+        assert item.language == "de"
+        assert claim.language == "en"
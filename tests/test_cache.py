@@ -0,0 +1,77 @@
+import time
+
+from python_wikibase import PyWikibase
+from python_wikibase.utils.cache import MemoryCache, SqliteCache
+from tests.constants import ITEM_LABEL_2, LANGUAGE
+
+
+class TestCache:
+    def test_memory_cache(self):
+        cache = MemoryCache(max_size=2, ttl=0.1)
+
+        # Least recently used entity is evicted
+        cache.set("Q1", {"id": "Q1", "lastrevid": 1})
+        cache.set("Q2", {"id": "Q2", "lastrevid": 1})
+        assert cache.get("Q1")["id"] == "Q1"
+        cache.set("Q3", {"id": "Q3", "lastrevid": 1})
+        assert cache.get("Q2") is None
+        assert len(cache) == 2
+
+        # Older revisions don't replace newer ones
+        cache.set("Q1", {"id": "Q1", "lastrevid": 0})
+        assert cache.get("Q1")["lastrevid"] == 1
+
+        # Entries expire
+        time.sleep(0.2)
+        assert cache.get("Q1") is None
+        assert cache.stats() == {"hits": 2, "misses": 2, "evictions": 2, "size": 1}
+
+    def test_memory_cache_copies(self):
+        cache = MemoryCache()
+        entity = {"id": "Q1", "lastrevid": 1, "labels": {}}
+        cache.set("Q1", entity)
+
+        # Changes to the saved or returned data don't affect the cache
+        entity["labels"]["en"] = "a"
+        cache.get("Q1")["labels"]["en"] = "b"
+        assert cache.get("Q1") == {"id": "Q1", "lastrevid": 1, "labels": {}}
+
+    def test_cache_disabled_by_default(self):
+        assert PyWikibase().cache is None
+        assert isinstance(PyWikibase(cache=True).cache, MemoryCache)
+
+    def test_sqlite_cache(self, tmp_path):
+        path = str(tmp_path / "entities.sqlite")
+        cache = SqliteCache(path)
+        cache.set("Q1", {"id": "Q1", "lastrevid": 2})
+        cache.set("Q2", {"id": "Q2", "lastrevid": 1})
+        cache.invalidate("Q2")
+        cache.close()
+
+        # Entities are kept after reopening the database
+        cache = SqliteCache(path)
+        assert cache.get("Q1") == {"id": "Q1", "lastrevid": 2}
+        assert cache.get("Q2") is None
+        assert len(cache) == 1
+
+        # Older revisions don't replace newer ones
+        cache.set("Q1", {"id": "Q1", "lastrevid": 1})
+        assert cache.get("Q1")["lastrevid"] == 2
+        cache.set("Q1", {"id": "Q1", "lastrevid": 3})
+        assert cache.get("Q1")["lastrevid"] == 3
+        cache.close()
+
+    def test_entity_cache(self, py_wb, item, monkeypatch):
+        monkeypatch.setattr(py_wb, "cache", MemoryCache())
+        hits = py_wb.cache.hits
+
+        # Entity is only fetched once
+        item_fetched = py_wb.Item().get(entity_id=item.entity_id)
+        py_wb.Item().get(entity_id=item.entity_id)
+        assert py_wb.cache.hits == hits + 1
+
+        # Edits remove the entity from the cache
+        item_fetched.label.set(ITEM_LABEL_2)
+        assert py_wb.cache.get(item.entity_id) is None
+        item_fetched = py_wb.Item().get(entity_id=item.entity_id)
+        assert item_fetched.label.get(LANGUAGE) == ITEM_LABEL_2
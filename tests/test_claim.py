@@ -78,3 +78,42 @@ class TestClaim:
         assert claim.value.amount == amount
         assert float(claim.value) == amount
         assert claim.value.marshal() == quantity.marshal()
+
+    # Lazy unmarshalling
+
+    def test_lazy_unmarshalling(self, py_wb, claim):
+        item = py_wb.Item().get(entity_id=claim.item_id)
+        prop_id = claim.property.entity_id
+        assert not item.claims.to_dict().is_loaded(prop_id)
+        assert item.claims[0].claim_id == claim.claim_id
+        assert item.claims.to_dict().is_loaded(prop_id)
+
+    # Bulk removal
+
+    def test_remove_many(self, py_wb, item, prop, string_value):
+        claims = [item.claims.add(prop, string_value) for _ in range(3)]
+        bogus = py_wb.Claim().unmarshal(
+            item.entity_id,
+            {
+                "id": f"{item.entity_id}$00000000-0000-0000-0000-000000000000",
+                "rank": "normal",
+                "mainsnak": {"snaktype": "novalue", "property": prop.entity_id},
+            },
+        )
+        failures = item.claims.remove_many(claims + [bogus])
+        assert list(failures) == [bogus.claim_id]
+        assert len(item.claims) == 0
+        assert len(py_wb.Item().get(entity_id=item.entity_id).claims) == 0
+
+    # Statements with qualifiers and references
+
+    def test_add_statement(self, py_wb, item, prop, string_value):
+        claim = item.claims.add_statement(
+            prop, string_value, qualifiers=[(prop, string_value)], references=[(prop, string_value)]
+        )
+        assert claim.qualifiers[0].qualifier_id is not None
+        assert claim.references[0].reference_id is not None
+        item_fetched = py_wb.Item().get(entity_id=item.entity_id)
+        claim_fetched = item_fetched.claims.get_by_id(claim.claim_id)
+        assert len(claim_fetched.qualifiers) == 1
+        assert len(claim_fetched.references) == 1
@@ -0,0 +1,143 @@
+import pytest
+
+from python_wikibase import PyWikibase
+
+
+def snak_data(prop_id, value):
+    return {
+        "snaktype": "value",
+        "property": prop_id,
+        "datatype": "string",
+        "datavalue": {"value": value, "type": "string"},
+    }
+
+
+def claim_data(claim_id, prop_id, value):
+    return {
+        "id": claim_id,
+        "type": "statement",
+        "rank": "normal",
+        "mainsnak": snak_data(prop_id, value),
+    }
+
+
+def reference_data(reference_id, *snaks):
+    snaks_data = {}
+    for prop_id, value in snaks:
+        snaks_data.setdefault(prop_id, []).append(snak_data(prop_id, value))
+    return {"hash": reference_id, "snaks": snaks_data, "snaks-order": list(snaks_data)}
+
+
+CLAIMS_DATA = {
+    "P1": [claim_data("Q1$1", "P1", "a"), claim_data("Q1$2", "P1", "b")],
+    "P2": [claim_data("Q1$3", "P2", "a")],
+}
+
+
+class TestCollection:
+    def test_collection(self):
+        py_wb = PyWikibase(cache=False)
+        claims = py_wb.Claims().unmarshal("Q1", CLAIMS_DATA)
+        prop_1 = py_wb.Property()
+        prop_1.entity_id = "P1"
+        prop_2 = py_wb.Property()
+        prop_2.entity_id = "P2"
+
+        # Positional access
+        assert len(claims) == 3
+        assert [claim.claim_id for claim in claims] == ["Q1$1", "Q1$2", "Q1$3"]
+        assert claims[-1].claim_id == "Q1$3"
+
+        # Lookups by ID, property and value
+        assert claims.get_by_id("Q1$2") is claims[1]
+        assert claims.get_by_id("Q1$4") is None
+        assert [claim.claim_id for claim in claims.find(prop_1)] == ["Q1$1", "Q1$2"]
+        value_a = py_wb.StringValue().create("a")
+        assert [claim.claim_id for claim in claims.find(prop_1, value_a)] == ["Q1$1"]
+        assert [claim.claim_id for claim in claims.find(prop_2, value_a)] == ["Q1$3"]
+
+        # Indexes are kept up to date when claims are added and removed locally
+        new_claim = py_wb.Claim().unmarshal("Q1", claim_data("Q1$4", "P1", "a"))
+        claims._add_locally(new_claim)
+        assert len(claims) == 4
+        assert claims[2] is new_claim
+        assert claims.get_by_id("Q1$4") is new_claim
+        assert claims.find(prop_1, value_a) == [claims[0], new_claim]
+        for claim in claims:
+            if claim.property.entity_id == "P1":
+                claims._remove_locally(claim)
+        assert [claim.claim_id for claim in claims] == ["Q1$3"]
+        assert claims.get_by_id("Q1$1") is None
+        assert claims.find(prop_1, value_a) == []
+        assert claims.to_dict() == {"P2": [claims[0]]}
+
+    def test_reindex_changed(self):
+        py_wb = PyWikibase(cache=False)
+        item = py_wb.Item().unmarshal(
+            {"id": "Q1", "labels": {}, "descriptions": {}, "aliases": {}, "claims": CLAIMS_DATA}
+        )
+        claims = item.claims
+        prop_1 = py_wb.Property()
+        prop_1.entity_id = "P1"
+        value_a = py_wb.StringValue().create("a")
+        value_b = py_wb.StringValue().create("b")
+        assert claims.find(prop_1, value_b) == [claims[1]]
+        by_id = claims.by_id
+
+        # Changing a claim's value only re-indexes this claim, in the order of the collection
+        item.edit_session()
+        claims[1].set_value(value_a)
+        item.discard()
+        assert claims.by_id is by_id
+        assert claims.find(prop_1, value_b) == []
+        assert claims.find(prop_1, value_a) == [claims[0], claims[1]]
+
+        # Changes to other collections don't affect the index
+        other_claims = py_wb.Claims().unmarshal("Q2", CLAIMS_DATA)
+        other_claims.get_by_id("Q1$1").unmarshal_ids(claim_data("Q1$5", "P1", "a"))
+        assert other_claims.get_by_id("Q1$5") is other_claims[0]
+        assert claims.by_id is by_id
+        assert claims.get_by_id("Q1$1") is claims[0]
+
+    def test_reference_snaks(self):
+        py_wb = PyWikibase(cache=False)
+        data = claim_data("Q1$1", "P1", "a")
+        data["references"] = [
+            reference_data("h1", ("P1", "source"), ("P2", "url 1")),
+            reference_data("h2", ("P2", "url 2")),
+            reference_data("h3", ("P3", "other source"), ("P2", "url 1")),
+        ]
+        item = py_wb.Item().unmarshal(
+            {"id": "Q1", "labels": {}, "descriptions": {}, "aliases": {}, "claims": {"P1": [data]}}
+        )
+        references = item.claims[0].references
+        h1, h2, h3 = references
+        prop_1 = py_wb.Property()
+        prop_1.entity_id = "P1"
+        prop_1.data_type = "StringValue"
+        prop_2 = py_wb.Property()
+        prop_2.entity_id = "P2"
+        prop_2.data_type = "StringValue"
+        url_1 = py_wb.StringValue().create("url 1")
+        url_2 = py_wb.StringValue().create("url 2")
+
+        # References are found by all of their snaks, not only by the first one
+        assert references.find(prop_2) == [h1, h2, h3]
+        assert references.find(prop_2, url_1) == [h1, h3]
+        assert references.to_dict()["P2"] == [h1, h2, h3]
+
+        # Changed and new references are re-indexed in the order of the collection
+        item.edit_session()
+        h1.set_value(url_2, index=1)
+        assert [snak.value.value for snak in h1.snaks] == ["source", "url 2"]
+        assert references.find(prop_2, url_1) == [h3]
+        assert references.find(prop_2, url_2) == [h1, h2]
+        new_reference = references.add_snaks([(prop_1, url_1), (prop_2, url_1)])
+        assert references.find(prop_2, url_1) == [new_reference, h3]
+        item.discard()
+
+        # Snaks which don't exist can't be updated
+        with pytest.raises(ValueError):
+            h2.set_value(url_1, index=1)
+        with pytest.raises(ValueError):
+            py_wb.Reference().set_value(url_1)
@@ -0,0 +1,167 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from python_wikibase import PyWikibase
+from python_wikibase.data_types.data_type import (
+    data_value_unmarshallers,
+    marshal_snak,
+    register_data_type,
+    unmarshal_data_value,
+)
+from python_wikibase.data_types.string_value import StringValue
+from python_wikibase.utils.data_types import (
+    class_to_data_type,
+    class_to_value_type,
+    data_type_to_class,
+)
+
+
+class MusicalNotation(StringValue):
+    __slots__ = ()
+
+
+def unmarshal_musical_notation(py_wb, data_value):
+    return data_value["value"]
+
+
+def unmarshal_musical_notation_value(py_wb, data_value):
+    return MusicalNotation(py_wb, py_wb.api, py_wb.language).unmarshal(data_value)
+
+
+class TestDataType:
+    def test_register_data_type(self):
+        py_wb = PyWikibase(cache=False)
+        snak = {
+            "snaktype": "value",
+            "property": "P1",
+            "datatype": "musical-notation",
+            "datavalue": {"value": "\\relative c' { c d e f }", "type": "string"},
+        }
+        assert "musical-notation" not in data_value_unmarshallers
+        register_data_type("musical-notation", unmarshal_musical_notation)
+        try:
+            assert unmarshal_data_value(py_wb, snak) == "\\relative c' { c d e f }"
+        finally:
+            del data_value_unmarshallers["musical-notation"]
+
+    def test_register_data_type_class(self):
+        py_wb = PyWikibase(cache=False)
+        py_wb.property_types.update({"P1": "musical-notation"})
+        notation = "\\relative c' { c d e f }"
+        register_data_type(
+            "musical-notation", unmarshal_musical_notation_value, value_class=MusicalNotation
+        )
+        try:
+            # Properties with the data type use the registered class
+            prop = py_wb.Property()
+            prop.entity_id = "P1"
+            assert py_wb.property_types.get("P1") == "MusicalNotation"
+
+            # Claims with values of the class can be added
+            item = py_wb.Item().unmarshal(
+                {
+                    "id": "Q1",
+                    "type": "item",
+                    "labels": {},
+                    "descriptions": {},
+                    "aliases": {},
+                    "claims": {},
+                }
+            )
+            item.edit_session()
+            value = MusicalNotation(py_wb, py_wb.api, py_wb.language).create(notation)
+            claim = item.claims.add(prop, value)
+            assert prop.data_type == "MusicalNotation"
+            snak = claim.marshal()["mainsnak"]
+            assert snak["datavalue"] == {"value": notation, "type": "string"}
+            unmarshalled = unmarshal_data_value(py_wb, dict(snak, datatype="musical-notation"))
+            assert isinstance(unmarshalled, MusicalNotation)
+            assert unmarshalled.value == notation
+            item.discard()
+        finally:
+            del data_value_unmarshallers["musical-notation"]
+            del data_type_to_class["musical-notation"]
+            del class_to_data_type["MusicalNotation"]
+            del class_to_value_type["MusicalNotation"]
+
+    def test_unmarshal_marshal(self):
+        py_wb = PyWikibase(cache=False)
+        data_values = {
+            "commonsMedia": ("CommonsMedia", "Example.jpg"),
+            "geo-shape": ("GeoShape", "Data:Berlin.map"),
+            "math": ("Math", "E = mc^2"),
+            "monolingualtext": ("MonolingualText", {"text": "Berlin", "language": "de"}),
+            "tabular-data": ("Table", "Data:Population.tab"),
+            "time": (
+                "Time",
+                {
+                    "time": "+2019-01-31T00:00:00Z",
+                    "precision": 11,
+                    "timezone": 0,
+                    "before": 0,
+                    "after": 0,
+                    "calendarmodel": "http://www.wikidata.org/entity/Q1985727",
+                },
+            ),
+            "url": ("Url", "https://example.com"),
+            "wikibase-form": ("Form", {"entity-type": "form", "id": "L1-F1"}),
+            "wikibase-lexeme": ("Lexeme", {"entity-type": "lexeme", "id": "L1", "numeric-id": 1}),
+            "wikibase-sense": ("Sense", {"entity-type": "sense", "id": "L1-S1"}),
+        }
+        for data_type, (class_name, value) in data_values.items():
+            snak = {
+                "snaktype": "value",
+                "property": "P1",
+                "datatype": data_type,
+                "datavalue": {"value": value, "type": "string"},
+            }
+            unmarshalled = unmarshal_data_value(py_wb, snak)
+            assert unmarshalled.__class__.__name__ == class_name
+            assert unmarshalled.marshal() == value
+
+    def test_create_time(self):
+        py_wb = PyWikibase(cache=False)
+        value = py_wb.Time().create(date(2019, 1, 31))
+        assert value.marshal()["time"] == "+2019-01-31T00:00:00Z"
+        assert value.marshal()["precision"] == 11
+
+        # The time of day is dropped after converting to UTC
+        value = py_wb.Time().create(datetime(2019, 1, 31, 15, 30, 45))
+        assert value.marshal()["time"] == "+2019-01-31T00:00:00Z"
+        value = py_wb.Time().create(
+            datetime(2019, 2, 1, 1, 30, tzinfo=timezone(timedelta(hours=2)))
+        )
+        assert value.marshal()["time"] == "+2019-01-31T00:00:00Z"
+
+        # Years before 1000 are zero-padded
+        value = py_wb.Time().create(date(476, 9, 4))
+        assert value.marshal()["time"] == "+0476-09-04T00:00:00Z"
+
+    def test_unknown_data_types(self):
+        snak = {
+            "snaktype": "value",
+            "property": "P1",
+            "datatype": "musical-notation",
+            "datavalue": {"value": "\\relative c' { c d e f }", "type": "string"},
+        }
+
+        # Raise error by default
+        with pytest.raises(NotImplementedError):
+            unmarshal_data_value(PyWikibase(cache=False), snak)
+
+        # Return raw value
+        py_wb = PyWikibase(cache=False, unknown_data_types="raw")
+        value = unmarshal_data_value(py_wb, snak)
+        assert value.data_type == "musical-notation"
+        assert value.value == "\\relative c' { c d e f }"
+        prop = py_wb.Property()
+        prop.entity_id = "P1"
+        assert marshal_snak(prop, value, "value") == {
+            "snaktype": "value",
+            "property": "P1",
+            "datavalue": snak["datavalue"],
+        }
+
+        with pytest.raises(ValueError):
+            PyWikibase(cache=False, unknown_data_types="ignore")
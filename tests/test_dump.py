@@ -0,0 +1,98 @@
+import gzip
+import json
+import operator
+
+from python_wikibase import PyWikibase
+from python_wikibase.dump import map_dump, read_entity_data
+from tests.constants import ITEM_LABEL, LANGUAGE, PROP_LABEL, STRING_VALUE
+
+DUMP_ENTITIES = [
+    {
+        "type": "property",
+        "id": "P1",
+        "datatype": "string",
+        "labels": {LANGUAGE: {"language": LANGUAGE, "value": PROP_LABEL}},
+        "descriptions": {},
+        "aliases": {},
+        "claims": {},
+    },
+    {
+        "type": "item",
+        "id": "Q1",
+        "labels": {LANGUAGE: {"language": LANGUAGE, "value": ITEM_LABEL}},
+        "descriptions": {},
+        "aliases": {},
+        "claims": {
+            "P1": [
+                {
+                    "id": "Q1$8C67587E-79D5-4E8C-972C-A3C5F7ED06B3",
+                    "type": "statement",
+                    "rank": "normal",
+                    "mainsnak": {
+                        "snaktype": "value",
+                        "property": "P1",
+                        "datatype": "string",
+                        "datavalue": {"value": STRING_VALUE, "type": "string"},
+                    },
+                }
+            ]
+        },
+        "sitelinks": {},
+    },
+    {"type": "lexeme", "id": "L1"},
+]
+
+
+def write_dump(path, compress=True):
+    with gzip.open(path, "wt") if compress else open(path, "w") as f:
+        f.write("[\n")
+        f.write(",\n".join(json.dumps(entity) for entity in DUMP_ENTITIES))
+        f.write("\n]\n")
+
+
+def get_entity_id(entity):
+    return entity.entity_id
+
+
+def count_claims(entity):
+    return len(entity.claims)
+
+
+class TestDump:
+    def test_read_dump(self, tmp_path):
+        path = str(tmp_path / "dump.json.gz")
+        write_dump(path)
+        py_wb = PyWikibase(cache=False)
+
+        # Raw entity data
+        assert [entity["id"] for entity in read_entity_data(path)] == ["P1", "Q1", "L1"]
+
+        # Items and properties (other entity types are skipped)
+        prop, item = list(py_wb.read_dump(path))
+        assert prop.entity_type == "property"
+        assert prop.data_type == "StringValue"
+        assert prop.label.get(LANGUAGE) == PROP_LABEL
+        assert item.label.get(LANGUAGE) == ITEM_LABEL
+        assert str(item.claims[0].value) == STRING_VALUE
+
+        # Filter by entity type
+        assert [e.entity_id for e in py_wb.read_dump(path, entity_types=["item"])] == ["Q1"]
+
+    def test_map_dump(self, tmp_path):
+        py_wb = PyWikibase(cache=False)
+        compressed_path = str(tmp_path / "dump.json.gz")
+        uncompressed_path = str(tmp_path / "dump.json")
+        write_dump(compressed_path)
+        write_dump(uncompressed_path, compress=False)
+
+        for path in [compressed_path, uncompressed_path]:
+            # Small shards so the entities are split across workers
+            entity_ids = map_dump(py_wb, path, get_entity_id, processes=2, shard_size=64)
+            assert sorted(entity_ids) == ["P1", "Q1"]
+            assert py_wb.map_reduce_dump(path, count_claims, operator.add, processes=2) == 1
+            assert (
+                py_wb.map_reduce_dump(
+                    path, count_claims, operator.add, initial=10, entity_types=["property"]
+                )
+                == 10
+            )
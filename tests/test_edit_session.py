@@ -0,0 +1,106 @@
+import pytest
+from wikibase_api import ApiError
+
+from python_wikibase import PyWikibase
+from python_wikibase.utils.exceptions import EditError
+
+ITEM_DATA = {
+    "id": "Q1",
+    "type": "item",
+    "labels": {},
+    "descriptions": {},
+    "aliases": {},
+    "claims": {
+        "P1": [
+            {
+                "id": "Q1$1",
+                "type": "statement",
+                "rank": "normal",
+                "mainsnak": {
+                    "snaktype": "value",
+                    "property": "P1",
+                    "datatype": "string",
+                    "datavalue": {"value": "a", "type": "string"},
+                },
+            }
+        ]
+    },
+}
+
+
+class FailingEntityApi:
+    def update(self, entity_id, content):
+        raise ApiError('{"code": "failed-save"}')
+
+
+class FailingApi:
+    entity = FailingEntityApi()
+
+
+class TestEditSession:
+    def test_claim_changed(self):
+        py_wb = PyWikibase(cache=False)
+        item = py_wb.Item().unmarshal(ITEM_DATA)
+        other_item = py_wb.Item().unmarshal(ITEM_DATA)
+        value = py_wb.StringValue().create("b")
+
+        session = item.edit_session()
+        item.claims[0].set_value(value)
+        assert list(session.claims) == ["Q1$1"]
+
+        # Changes to the claims of another object for the same entity would be lost
+        with pytest.raises(ValueError):
+            other_item.claims[0].set_value(value)
+        assert str(other_item.claims[0].value) == "a"
+        item.discard()
+
+        # Changes can't be recorded if the entity's claims haven't been fetched
+        item_without_claims = py_wb.Item().unmarshal(ITEM_DATA, props=["labels"])
+        item_without_claims.edit_session()
+        with pytest.raises(ValueError):
+            other_item.claims[0].set_value(value)
+        item_without_claims.discard()
+
+    def test_remove_new_qualifier(self):
+        py_wb = PyWikibase(cache=False)
+        item = py_wb.Item().unmarshal(ITEM_DATA)
+        prop = py_wb.Property()
+        prop.entity_id = "P1"
+        prop.data_type = "StringValue"
+
+        # Qualifiers created in the session don't have IDs yet, only the removed one is deleted
+        item.edit_session()
+        qualifiers = item.claims[0].qualifiers
+        qualifier_a = qualifiers.add(prop, py_wb.StringValue().create("a"))
+        qualifier_b = qualifiers.add(prop, py_wb.StringValue().create("b"))
+        assert qualifier_a.qualifier_id is None
+        qualifiers.remove(qualifier_a)
+        assert qualifiers.to_list() == [qualifier_b]
+        assert item.claims[0].marshal()["qualifiers"]["P1"][0]["datavalue"]["value"] == "b"
+        item.discard()
+
+    def test_terms_not_fetched(self):
+        py_wb = PyWikibase(cache=False)
+        item = py_wb.Item().unmarshal(ITEM_DATA, props=["claims"])
+
+        # Terms which haven't been fetched are only recorded in the session
+        session = item.edit_session()
+        item.set_terms(labels={"en": "label"}, descriptions={"de": None}, aliases={"en": ["a"]})
+        assert item.label is None and item.aliases is None
+        assert session.marshal() == {
+            "labels": {"en": {"language": "en", "value": "label"}},
+            "descriptions": {"de": {"language": "de", "remove": ""}},
+            "aliases": [{"language": "en", "value": "a"}],
+        }
+        item.discard()
+
+    def test_failed_save_ends_session(self):
+        py_wb = PyWikibase(cache=False)
+        py_wb.api = FailingApi()
+        item = py_wb.Item().unmarshal(ITEM_DATA)
+
+        item.edit_session()
+        item.label.set("label")
+        with pytest.raises(EditError):
+            item.save()
+        assert item.entity_id not in py_wb.edit_sessions
@@ -1,4 +1,15 @@
-from tests.constants import ITEM_ALIAS, ITEM_DESC, ITEM_LABEL, ITEM_LABEL_2, LANGUAGE, PROP_LABEL
+import pytest
+
+from python_wikibase.utils.exceptions import NotFoundError
+from tests.constants import (
+    ITEM_ALIAS,
+    ITEM_DESC,
+    ITEM_LABEL,
+    ITEM_LABEL_2,
+    LANGUAGE,
+    PROP_LABEL,
+    STRING_VALUE,
+)
 
 
 class TestEntity:
@@ -35,3 +46,139 @@ class TestEntity:
         assert prop_fetched.entity_id == prop.entity_id
         assert prop_fetched.label.get(LANGUAGE) == PROP_LABEL
         assert str(prop_fetched.label) == PROP_LABEL
+
+    def test_get_many(self, py_wb, item, prop):
+        # Get items
+        items_fetched = py_wb.Item().get_many([item.entity_id, "Q999999999"])
+        assert items_fetched[item.entity_id].label.get(LANGUAGE) == ITEM_LABEL
+        assert items_fetched["Q999999999"] is None
+
+        # Entities of another type aren't unmarshalled into items
+        with pytest.raises(NotFoundError):
+            py_wb.Item().get_many([item.entity_id, prop.entity_id])
+        with pytest.raises(NotFoundError):
+            py_wb.Item().get(entity_id=prop.entity_id)
+
+        # Get items and properties
+        entities_fetched = py_wb.get_entities([item.entity_id, prop.entity_id])
+        assert entities_fetched[item.entity_id].entity_type == "item"
+        assert entities_fetched[prop.entity_id].entity_type == "property"
+        assert entities_fetched[prop.entity_id].label.get(LANGUAGE) == PROP_LABEL
+
+    def test_fetch_concurrently(self, py_wb, item, prop):
+        entity_ids = [item.entity_id, "Q999999999", prop.entity_id]
+        entities_fetched = list(py_wb.fetch_concurrently(entity_ids, max_workers=2, ordered=True))
+        assert [entity_id for entity_id, _ in entities_fetched] == entity_ids
+        assert entities_fetched[0][1].label.get(LANGUAGE) == ITEM_LABEL
+        assert entities_fetched[1][1] is None
+        assert entities_fetched[2][1].label.get(LANGUAGE) == PROP_LABEL
+
+    def test_edit_session(self, py_wb, item, prop, string_value):
+        with item.edit_session():
+            item.label.set(ITEM_LABEL_2)
+            item.description.set(ITEM_DESC)
+            item.aliases.add(ITEM_ALIAS)
+            claim = item.claims.add(prop, string_value)
+            qualifier = claim.qualifiers.add(prop, string_value)
+            reference = claim.references.add(prop, string_value)
+
+            # Changes are only made locally before saving
+            assert item.label.get(LANGUAGE) == ITEM_LABEL_2
+            assert qualifier.qualifier_id is None
+            assert reference.reference_id is None
+
+        # Hashes of new qualifiers and references are updated after saving
+        assert qualifier.qualifier_id is not None
+        assert reference.reference_id is not None
+
+        # Get item
+        item_fetched = py_wb.Item().get(entity_id=item.entity_id)
+        assert item_fetched.label.get(LANGUAGE) == ITEM_LABEL_2
+        assert item_fetched.description.get(LANGUAGE) == ITEM_DESC
+        assert item_fetched.aliases.get(LANGUAGE) == [ITEM_ALIAS]
+        assert len(item_fetched.claims) == 1
+        claim_fetched = item_fetched.claims[0]
+        assert claim_fetched.claim_id == claim.claim_id
+        assert str(claim_fetched.value) == STRING_VALUE
+        assert claim_fetched.qualifiers[0].qualifier_id == qualifier.qualifier_id
+        assert claim_fetched.references[0].reference_id == reference.reference_id
+
+    def test_create_with_data(self, py_wb, prop, string_value):
+        item = py_wb.Item().create(
+            ITEM_LABEL,
+            description=ITEM_DESC,
+            aliases=[ITEM_ALIAS],
+            claims=[(prop, string_value)],
+        )
+        try:
+            item_fetched = py_wb.Item().get(entity_id=item.entity_id)
+            assert item_fetched.label.get(LANGUAGE) == ITEM_LABEL
+            assert item_fetched.description.get(LANGUAGE) == ITEM_DESC
+            assert item_fetched.aliases.get(LANGUAGE) == [ITEM_ALIAS]
+            assert len(item_fetched.claims) == 1
+            assert str(item_fetched.claims[0].value) == STRING_VALUE
+        finally:
+            item.delete()
+
+    def test_create_items(self, py_wb, prop, string_value):
+        specs = [
+            {"label": ITEM_LABEL, "claims": [(prop, string_value)]},
+            {"label": ITEM_LABEL_2, "description": ITEM_DESC},
+        ]
+        created = list(py_wb.create_items(specs, max_workers=2, ordered=True))
+        try:
+            assert [spec for spec, _ in created] == specs
+            assert created[0][1].label.get(LANGUAGE) == ITEM_LABEL
+            assert len(created[0][1].claims) == 1
+            assert created[1][1].description.get(LANGUAGE) == ITEM_DESC
+        finally:
+            for _, item in created:
+                item.delete()
+
+    def test_refresh(self, py_wb, item):
+        item_fetched = py_wb.Item().get(entity_id=item.entity_id)
+        revision_id = item_fetched.revision_id
+        assert revision_id is not None
+
+        # Unchanged entity is not updated
+        assert py_wb.refresh_entities([item_fetched]) == {}
+
+        # Edited entity is updated
+        item.label.set(ITEM_LABEL_2)
+        assert py_wb.refresh_entities([item_fetched]) == {item.entity_id: item_fetched}
+        assert item_fetched.revision_id > revision_id
+        assert item_fetched.label.get(LANGUAGE) == ITEM_LABEL_2
+
+    def test_get_partial(self, py_wb, item):
+        item_fetched = py_wb.Item().get(
+            entity_id=item.entity_id, props=["labels"], languages=[LANGUAGE]
+        )
+        assert item_fetched.label.get(LANGUAGE) == ITEM_LABEL
+        assert item_fetched.description is None
+        assert item_fetched.claims is None
+        assert item_fetched.loaded_props == ["labels"]
+        assert item_fetched.loaded_languages == [LANGUAGE]
+
+        entities_fetched = py_wb.get_entities([item.entity_id], props=["claims"])
+        assert entities_fetched[item.entity_id].label is None
+        assert len(entities_fetched[item.entity_id].claims) == 0
+
+    def test_set_terms(self, py_wb, item):
+        item.label.set_many({"de": ITEM_LABEL_2, "fr": ITEM_LABEL_2})
+        item.description.set_many({"de": ITEM_DESC})
+        item.aliases.update(add=[ITEM_ALIAS, "Alias 2"], language="de")
+        item.aliases.update(add=["Alias 3"], remove=["Alias 2"], language="de")
+        item.set_terms(
+            labels={"fr": None, "es": ITEM_LABEL_2},
+            descriptions={"es": ITEM_DESC},
+            aliases={"es": [ITEM_ALIAS]},
+        )
+
+        for item_terms in [item, py_wb.Item().get(entity_id=item.entity_id)]:
+            assert item_terms.label.get("de") == ITEM_LABEL_2
+            assert item_terms.label.get("es") == ITEM_LABEL_2
+            assert item_terms.label.get("fr") is None
+            assert item_terms.description.get("de") == ITEM_DESC
+            assert item_terms.description.get("es") == ITEM_DESC
+            assert item_terms.aliases.get("de") == [ITEM_ALIAS, "Alias 3"]
+            assert item_terms.aliases.get("es") == [ITEM_ALIAS]
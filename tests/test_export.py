@@ -0,0 +1,111 @@
+import math
+
+from python_wikibase import PyWikibase
+from python_wikibase.export import export_claims
+from tests.constants import STRING_VALUE
+
+
+def claim_data(claim_number, data_type, value, value_type):
+    return {
+        "id": f"Q1${claim_number}",
+        "type": "statement",
+        "rank": "normal",
+        "mainsnak": {
+            "snaktype": "value",
+            "property": f"P{claim_number}",
+            "datatype": data_type,
+            "datavalue": {"value": value, "type": value_type},
+        },
+    }
+
+
+ITEM_DATA = {
+    "type": "item",
+    "id": "Q1",
+    "labels": {},
+    "descriptions": {},
+    "aliases": {},
+    "claims": {
+        "P1": [claim_data(1, "string", STRING_VALUE, "string")],
+        "P2": [claim_data(2, "quantity", {"amount": "+5.5", "unit": "1"}, "quantity")],
+        "P3": [
+            claim_data(
+                3,
+                "globe-coordinate",
+                {
+                    "latitude": 1.5,
+                    "longitude": 2.5,
+                    "altitude": None,
+                    "precision": 0.1,
+                    "globe": "http://www.wikidata.org/entity/Q2",
+                },
+                "globecoordinate",
+            )
+        ],
+        "P4": [
+            claim_data(
+                4, "wikibase-item", {"entity-type": "item", "id": "Q5"}, "wikibase-entityid"
+            ),
+            {
+                "id": "Q1$5",
+                "type": "statement",
+                "rank": "preferred",
+                "mainsnak": {"snaktype": "novalue", "property": "P4"},
+            },
+        ],
+    },
+}
+
+
+class TestExport:
+    def test_export_claims(self):
+        py_wb = PyWikibase(cache=False)
+        items = [py_wb.Item().unmarshal(ITEM_DATA) for _ in range(3)]
+
+        tables = list(export_claims(items, chunk_size=4))
+        assert [len(table) for table in tables] == [4, 4, 4, 3]
+
+        columns = tables[0].columns
+        assert columns["entity_id"] == ["Q1"] * 4
+        assert columns["property"] == ["P1", "P2", "P3", "P4"]
+        assert columns["data_type"] == ["StringValue", "Quantity", "GeoLocation", "Item"]
+        assert columns["string"] == [STRING_VALUE, None, None, None]
+        assert columns["entity"] == [None, None, None, "Q5"]
+        assert columns["amount"][1] == 5.5
+        assert columns["latitude"][2] == 1.5
+        assert math.isnan(columns["altitude"][2])
+        assert math.isnan(columns["amount"][0])
+
+        # Claim without value
+        columns = tables[1].columns
+        assert columns["snak_type"][0] == "novalue"
+        assert columns["rank"][0] == "preferred"
+        assert columns["data_type"][0] is None
+
+    def test_precision_columns(self):
+        py_wb = PyWikibase(cache=False)
+        time = {
+            "time": "+2019-01-31T00:00:00Z",
+            "timezone": 0,
+            "before": 0,
+            "after": 0,
+            "precision": 11,
+            "calendarmodel": "http://www.wikidata.org/entity/Q1985727",
+        }
+        geo_location = dict(ITEM_DATA["claims"]["P3"][0]["mainsnak"]["datavalue"]["value"])
+        item_data = dict(
+            ITEM_DATA,
+            claims={
+                "P1": [claim_data(1, "time", time, "time")],
+                "P2": [claim_data(2, "globe-coordinate", geo_location, "globecoordinate")],
+            },
+        )
+        item = py_wb.Item().unmarshal(item_data)
+
+        # The precisions of times and coordinates have different units, so they are kept apart
+        columns = list(export_claims([item]))[0].columns
+        assert columns["time"] == ["+2019-01-31T00:00:00Z", None]
+        assert columns["time_precision"][0] == 11
+        assert math.isnan(columns["time_precision"][1])
+        assert columns["geo_precision"][1] == 0.1
+        assert math.isnan(columns["geo_precision"][0])
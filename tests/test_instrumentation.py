@@ -0,0 +1,80 @@
+from python_wikibase.utils.instrumentation import (
+    ApiCallEvent,
+    Instrumentation,
+    StatsAggregator,
+    ThreadLocalVar,
+    get_entity_id,
+    get_percentile,
+)
+
+
+class TestInstrumentation:
+    def test_api_call_events(self):
+        events = []
+        instrumentation = Instrumentation([events.append])
+
+        # Calls aren't measured without observers
+        assert Instrumentation().start_call("GET", {"action": "wbgetentities"}) is None
+
+        call = instrumentation.start_call("POST", {"action": "wbcreateclaim", "entity": "Q1"})
+        instrumentation.end_call(call)
+        assert len(events) == 1
+        assert events[0].action == "wbcreateclaim"
+        assert events[0].entity_id == "Q1"
+        assert events[0].error is None
+
+    def test_entity_id(self):
+        assert get_entity_id({"ids": "Q1|Q2"}) == "Q1|Q2"
+        assert get_entity_id({"claim": "Q1$8C67587E-79D5-4E8C-972C-A3C5F7ED06B3"}) == "Q1"
+        assert get_entity_id({"title": "Property:P1"}) == "P1"
+        assert get_entity_id({"action": "query"}) is None
+
+    def test_stats_aggregator(self):
+        stats = StatsAggregator()
+        for latency in [0.1, 0.2, 0.3, 0.4, 0.5]:
+            event = ApiCallEvent("wbgetentities", "Q1", "GET")
+            event.latency = latency
+            event.attempts = 2 if latency == 0.5 else 1
+            event.bytes_in = 100
+            stats(event)
+
+        assert stats.percentiles("wbgetentities", percentiles=[0, 50, 100]) == {
+            0: 0.1,
+            50: 0.3,
+            100: 0.5,
+        }
+        summary = stats.summary()["wbgetentities"]
+        assert summary["calls"] == 5
+        assert summary["retries"] == 1
+        assert summary["total_bytes_in"] == 500
+        assert stats.percentiles("wbsetlabel") == {50: None, 90: None, 99: None}
+
+    def test_stats_aggregator_max_samples(self):
+        stats = StatsAggregator(max_samples=10)
+        for latency in range(100):
+            event = ApiCallEvent("wbgetentities", "Q1", "GET")
+            event.latency = latency
+            event.bytes_in = 100
+            stats(event)
+
+        # Only the sample is kept, the totals are exact
+        assert len(stats.samples["wbgetentities"]["latency"]) == 10
+        assert all(0 <= latency < 100 for latency in stats.samples["wbgetentities"]["latency"])
+        summary = stats.summary()["wbgetentities"]
+        assert summary["calls"] == 100
+        assert summary["total_bytes_in"] == 10000
+
+    def test_percentile(self):
+        assert get_percentile([1, 2, 3, 4], 50) == 2.5
+        assert get_percentile([], 50) is None
+
+    def test_thread_local_var(self):
+        var = ThreadLocalVar("var")
+        assert var.get() is None
+        token = var.set(1)
+        token_2 = var.set(2)
+        assert var.get() == 2
+        var.reset(token_2)
+        assert var.get() == 1
+        var.reset(token)
+        assert var.get() is None
@@ -0,0 +1,28 @@
+from python_wikibase.utils.lazy_dict import LazyDict
+
+
+class TestLazyDict:
+    def test_lazy_dict(self):
+        loaded = []
+
+        def load_value(data):
+            loaded.append(data)
+            return data.upper()
+
+        lazy_dict = LazyDict(load_value)
+        lazy_dict.set_raw("a", "value a")
+        lazy_dict.set_raw("b", "value b")
+
+        # Values are only loaded when they are accessed
+        assert len(lazy_dict) == 2
+        assert "a" in lazy_dict
+        assert loaded == []
+        assert lazy_dict["a"] == "VALUE A"
+        assert lazy_dict.get("a") == "VALUE A"
+        assert loaded == ["value a"]
+        assert not lazy_dict.is_loaded("b")
+
+        # All values are loaded when iterating over them
+        assert dict(lazy_dict) == {"a": "VALUE A", "b": "VALUE B"}
+        assert list(lazy_dict.values()) == ["VALUE A", "VALUE B"]
+        assert loaded == ["value a", "value b"]
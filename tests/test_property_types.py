@@ -0,0 +1,25 @@
+from python_wikibase import PyWikibase
+from python_wikibase.data_model.property_types import PropertyTypes, resolve_data_type
+
+
+class TestPropertyTypes:
+    def test_registry(self, tmp_path):
+        path = str(tmp_path / "property-types.json")
+        property_types = PropertyTypes(path)
+        property_types.update({"P1": "string", "P2": "quantity", "P3": "musical-notation"})
+        assert len(property_types) == 3
+        assert property_types.get("P1") == "StringValue"
+        assert property_types.get("P2") == "Quantity"
+        assert property_types.get("P3") == "UnknownValue"
+        assert property_types.get("P4") is None
+
+        # Registry is loaded from the file
+        py_wb = PyWikibase(cache=False, property_types=path)
+        assert "P2" in py_wb.property_types
+        assert py_wb.property_types.get("P2") == "Quantity"
+
+        # Data type of a property stub is set from the registry without making a request
+        prop = py_wb.Property()
+        prop.entity_id = "P2"
+        resolve_data_type(py_wb, prop)
+        assert prop.data_type == "Quantity"
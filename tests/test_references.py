@@ -53,3 +53,35 @@ class TestReference:
         assert reference.value.amount == amount
         assert float(reference.value) == amount
         assert reference.value.marshal() == quantity.marshal()
+
+    # Multiple snaks
+
+    def test_add_snaks(self, py_wb, claim, prop, prop_quantity, string_value):
+        quantity = py_wb.Quantity().create(5)
+        reference = claim.references.add_snaks([(prop, string_value), (prop_quantity, quantity)])
+        assert [snak.property.entity_id for snak in reference.snaks] == [
+            prop.entity_id,
+            prop_quantity.entity_id,
+        ]
+        assert str(reference.value) == string_value.value
+
+        # Updating the value of the first snak keeps the other snaks
+        new_value = py_wb.StringValue().create("Updated source")
+        reference.set_value(new_value)
+        assert str(reference.value) == "Updated source"
+        assert reference.snaks[1].value.amount == 5
+
+    def test_add_references(self, py_wb, item, claim, prop, string_value):
+        other_claim = item.claims.add(prop, py_wb.StringValue().create("Other value"))
+
+        # Qualifiers added by another client after fetching the claims are kept
+        item_fetched = py_wb.Item().get(entity_id=item.entity_id)
+        item_fetched.claims.get_by_id(claim.claim_id).qualifiers.add(prop, string_value)
+
+        references = py_wb.add_references([claim, other_claim], [(prop, string_value)])
+        assert len(references) == 2
+        assert claim.references.to_list()[-1] is references[0]
+        assert other_claim.references.to_list()[-1] is references[1]
+        assert str(references[1].value) == string_value.value
+        claim_fetched = py_wb.Item().get(entity_id=item.entity_id).claims.get_by_id(claim.claim_id)
+        assert len(claim_fetched.qualifiers) == 1
@@ -0,0 +1,86 @@
+import pytest
+import requests
+from wikibase_api import ApiError
+
+from python_wikibase.utils.retry import RetryPolicy, retry_requests
+
+
+class TestRetry:
+    def test_transient_errors_are_retried(self):
+        policy = RetryPolicy(max_retries={"timeout": 2}, backoff=0.01)
+        attempts = []
+
+        def request(params):
+            attempts.append(params)
+            if len(attempts) < 3:
+                raise requests.Timeout()
+            return {"success": 1}
+
+        assert policy.run(request, {"action": "wbgetentities"}) == {"success": 1}
+        assert len(attempts) == 3
+        assert policy.stats() == {"requests": 1, "retries": {"timeout": 2}, "failures": 0}
+
+        # Error classes without retries and other errors are raised immediately
+        def failing_request(params):
+            attempts.append(params)
+            raise requests.ConnectionError()
+
+        with pytest.raises(requests.ConnectionError):
+            policy.run(failing_request, {})
+        assert len(attempts) == 4
+
+        def invalid_request(params):
+            attempts.append(params)
+            raise ApiError('{"code": "no-such-entity"}')
+
+        with pytest.raises(ApiError):
+            policy.run(invalid_request, {})
+        assert len(attempts) == 5
+
+    def test_writes_are_checked_before_retrying(self):
+        policy = RetryPolicy(backoff=0.01)
+        attempts = []
+
+        def request(params):
+            attempts.append(params)
+            raise requests.Timeout()
+
+        # Writes which aren't idempotent aren't retried without check
+        with pytest.raises(requests.Timeout):
+            policy.run(request, {}, idempotent=False)
+        assert len(attempts) == 1
+
+        # The response of the processed request is used instead of retrying it
+        r = policy.run(request, {}, idempotent=False, find_written=lambda: {"claim": {}})
+        assert r == {"claim": {}}
+        assert len(attempts) == 2
+
+        # If the lookup fails, the request's error is raised and the request isn't retried
+        def find_written():
+            raise ApiError('{"code": "no-such-entity"}')
+
+        with pytest.raises(requests.Timeout):
+            policy.run(request, {}, idempotent=False, find_written=find_written)
+        assert len(attempts) == 3
+
+    def test_created_claims_are_retried_once(self):
+        policy = RetryPolicy(backoff=0.01)
+        attempts = []
+
+        class Api:
+            def get(self, params):
+                return {}
+
+            def post(self, body):
+                attempts.append(body)
+                raise requests.Timeout()
+
+        api = type("Wikibase", (), {"api": Api()})()
+        retry_requests(api, policy)
+
+        # "wbcreateclaim" requests are only retried by the caller, which checks for the claim
+        body = {"action": "wbcreateclaim"}
+        r = policy.run(api.api.post, body, idempotent=False, find_written=lambda: {"claim": {}})
+        assert r == {"claim": {}}
+        assert len(attempts) == 1
+        assert policy.stats() == {"requests": 1, "retries": {"timeout": 1}, "failures": 0}
@@ -0,0 +1,43 @@
+import pytest
+from wikibase_api import ApiError
+
+from python_wikibase.utils.scheduler import EditScheduler
+
+
+class TestScheduler:
+    def test_throttled_edits_are_retried(self):
+        scheduler = EditScheduler(edits_per_minute=6000, maxlag=5, max_retries=2, backoff=0.01)
+        bodies = []
+
+        def post(body):
+            bodies.append(body)
+            if len(bodies) == 1:
+                raise ApiError('{"code": "maxlag", "info": "Waiting for a database server"}')
+            return {"success": 1}
+
+        assert scheduler.run(post, {"action": "wbsetlabel"}) == {"success": 1}
+        assert bodies == [{"action": "wbsetlabel", "maxlag": 5}] * 2
+        stats = scheduler.stats()
+        assert stats["edits"] == 2
+        assert stats["retries"] == 1
+        assert stats["queue_depth"] == 0
+
+    def test_other_errors_are_raised(self):
+        scheduler = EditScheduler(max_retries=2, backoff=0.01)
+        bodies = []
+
+        def post(body):
+            bodies.append(body)
+            raise ApiError('{"code": "no-such-entity"}')
+
+        with pytest.raises(ApiError):
+            scheduler.run(post, {})
+        assert len(bodies) == 1
+
+        def post_throttled(body):
+            bodies.append(body)
+            raise ApiError('{"code": "ratelimited"}')
+
+        with pytest.raises(ApiError):
+            scheduler.run(post_throttled, {})
+        assert len(bodies) == 4